@@ -0,0 +1,99 @@
+"""
+Conversor (para el PC) de una secuencia de BMP de 64x64 al formato de
+animación .anm que reproduce HUB75.play().
+
+Uso:
+    python animconv.py salida.anm frame1.bmp frame2.bmp[:ms] ... [--ms 100] [--color red]
+
+Un píxel se enciende si no es negro. La duración de cada frame es la de --ms,
+salvo que se indique detrás del nombre (frame2.bmp:250).
+
+El archivo tiene una cabecera "<2sBBHH" (b"HA", versión 1, color de 1 bit por
+canal, número de frames, reservado) y por cada frame un registro "<HQ"
+(duración en ms y máscara de filas cambiadas, bit 63 = fila 0) seguido de 8
+bytes big-endian por fila cambiada con el XOR respecto al frame anterior (el
+primero respecto a un frame apagado). Un frame igual al anterior ocupa 10 bytes.
+"""
+import struct
+
+from bmp2raw import read_bmp
+
+ANIM_MAGIC = b"HA"
+ANIM_VERSION = 1
+ROWS = 64
+COLS = 64
+
+COLORS = {"red": 0b001, "green": 0b010, "yellow": 0b011, "blue": 0b100,
+          "magenta": 0b101, "cyan": 0b110, "white": 0b111}
+
+
+def read_frame(path):
+    """Lee un BMP de 64x64 y devuelve sus 64 filas empaquetadas (bit 63 = columna 0)."""
+    width, height, pixels = read_bmp(path)
+    if width != COLS or height != ROWS:
+        raise ValueError(f"{path}: el frame debe ser de 64x64 (es de {width}x{height}).")
+    frame = []
+    for row in range(ROWS):
+        word = 0
+        for pixel in pixels[row * COLS:(row + 1) * COLS]:
+            word = (word << 1) | (pixel != 0)
+        frame.append(word)
+    return frame
+
+
+def encode(frames, durations, color=0b001):
+    """
+    Codifica frames empaquetados (64 palabras, como los de hub75.pack_hex) con
+    sus duraciones en ms. Devuelve los bytes del archivo .anm.
+    """
+    if len(frames) != len(durations):
+        raise ValueError("Tiene que haber una duración por frame.")
+    out = bytearray(struct.pack("<2sBBHH", ANIM_MAGIC, ANIM_VERSION, color, len(frames), 0))
+    previous = [0] * ROWS
+    for frame, duration in zip(frames, durations):
+        changed = 0
+        rows = bytearray()
+        for row in range(ROWS):
+            delta = previous[row] ^ frame[row]
+            if delta:
+                changed |= 1 << (63 - row)
+                rows.extend(struct.pack(">Q", delta))
+        out.extend(struct.pack("<HQ", duration, changed))
+        out.extend(rows)
+        previous = list(frame)
+    return bytes(out)
+
+
+def convert(anm_path, frame_specs, ms=100, color=0b001):
+    """
+    Convierte una lista de BMP ("ruta" o "ruta:ms") en un archivo .anm.
+    Devuelve (tamaño del archivo, tamaño sin comprimir).
+    """
+    frames = []
+    durations = []
+    for spec in frame_specs:
+        path, _, duration = spec.partition(":")
+        frames.append(read_frame(path))
+        durations.append(int(duration) if duration else ms)
+    data = encode(frames, durations, color)
+    with open(anm_path, "wb") as anm_file:
+        anm_file.write(data)
+    return len(data), len(frames) * ROWS * 8
+
+
+def main():
+    import argparse  # Solo en el PC: encode() también funciona en MicroPython
+
+    parser = argparse.ArgumentParser(description="Convierte BMP de 64x64 en una animación .anm.")
+    parser.add_argument("anm", help="Archivo de animación de salida")
+    parser.add_argument("frames", nargs="+", help="BMP de cada frame, opcionalmente con :ms")
+    parser.add_argument("--ms", type=int, default=100, help="Duración por defecto de cada frame (ms)")
+    parser.add_argument("--color", default="red", choices=sorted(COLORS), help="Color de los píxeles encendidos")
+    args = parser.parse_args()
+
+    size, raw = convert(args.anm, args.frames, args.ms, COLORS[args.color])
+    print(f"{args.anm}: {len(args.frames)} frames, {size} bytes ({raw} sin comprimir)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,652 @@
+"""
+Banco de pruebas de rendimiento de los dos displays.
+
+ST7789 (displays.st7789): operaciones por segundo de cada primitiva a
+varios tamaños, fill_screen, el volcado del framebuffer y las imágenes
+(show_bmp y blit_raw), con los bytes SPI y las llamadas a SPI y a Pin por
+operación.
+
+HUB75 (enfin.py, matrix64x64micropython.py, intentoDEpatronBINARIO.py,
+pruebaRGB.py, lunes.py): frames por segundo, periodo medio de fila y su
+jitter, y llamadas a Pin por frame. Cada variante se ejecuta tal cual; su
+bucle infinito se corta tras unos frames contando las esperas sleep_us de fin
+de fila (solo las filas que el motor de hub75 no salta). En esa medida el
+RefreshTimer de los scripts se quita, para medir lo que permite el
+desplazamiento de filas y no los fps pedidos. Después cada variante se mide
+otra vez con su RefreshTimer: fps conseguidos frente a los pedidos, jitter del
+periodo de frame y tiempo de desplazamiento, según el propio timer.
+
+Arranque: tiempo y heap de importar cada módulo y hasta el primer píxel o el
+primer frame. Sirve para comparar los .py con los .mpy de build.py o con el
+firmware congelado con manifest.py.
+
+En el dispositivo:
+    import benchmark
+    benchmark.run()                      # ESP32: ST7789; RP2040: HUB75
+En el PC (con el emulador del repositorio):
+    python benchmark.py [--only st7789|hub75|boot] [--json res.json] [--compare base.json]
+
+En el PC los tiempos son de la CPU del PC: sirven para comparar versiones entre
+sí, no con el dispositivo. Los bytes y las llamadas son los mismos en ambos.
+"""
+import gc
+import sys
+
+try:
+    from time import perf_counter as _perf_counter  # PC
+
+    def _now_us():
+        return int(_perf_counter() * 1_000_000)
+
+    def _ticks_diff(end, start):
+        return end - start
+
+    _ON_PC = True
+except ImportError:  # MicroPython: ticks_us da la vuelta, así que se resta con ticks_diff
+    from time import ticks_diff as _ticks_diff, ticks_us as _now_us
+
+    _ON_PC = False
+
+try:
+    import _thread
+except ImportError:
+    _thread = None
+
+# Variantes de refresco HUB75: script, variable con su frame y si el refresco
+# corre en otro hilo. El motor de hub75 salta las filas apagadas, así que las
+# filas por frame se calculan con el frame
+HUB75_VARIANTS = (
+    ("enfin.py", "frame", False),
+    ("matrix64x64micropython.py", "frame", False),
+    ("intentoDEpatronBINARIO.py", "pattern", False),
+    ("pruebaRGB.py", "FULL", False),
+    ("lunes.py", "bitmap", True),
+)
+
+MIN_TIME_US = 200_000  # Tiempo mínimo de medida por caso
+MAX_REPEATS = 2000
+HUB75_FRAMES = 10
+HUB75_TIMER_WARMUP = 10  # Frames hasta que el RefreshTimer estima el desplazamiento
+
+_BMP_PATH = "_bench.bmp"
+_RAW_PATH = "_bench.raw"
+_RLE_PATH = "_bench_rle.raw"
+
+
+class _Done(Exception):
+    """Corta el bucle de refresco de una variante HUB75."""
+
+
+# -- Contadores de llamadas ---------------------------------------------------
+
+class _PinProxy:
+    """Envuelve un Pin y cuenta cada llamada."""
+
+    def __init__(self, pin, counts):
+        self._pin = pin
+        self._counts = counts
+
+    def value(self, *args):
+        self._counts["pin_calls"] += 1
+        return self._pin.value(*args)
+
+    def __call__(self, *args):
+        self._counts["pin_calls"] += 1
+        return self._pin(*args)
+
+    def on(self):
+        self._counts["pin_calls"] += 1
+        self._pin.on()
+
+    def off(self):
+        self._counts["pin_calls"] += 1
+        self._pin.off()
+
+
+class _SPIProxy:
+    """Envuelve un SPI y cuenta llamadas y bytes."""
+
+    def __init__(self, spi, counts):
+        self._spi = spi
+        self._counts = counts
+
+    def write(self, buf):
+        self._counts["spi_calls"] += 1
+        self._counts["spi_bytes"] += len(buf)
+        self._spi.write(buf)
+
+
+class _MachineProxy:
+    """Sustituto del módulo machine cuyos Pin cuentan las llamadas."""
+
+    def __init__(self, machine, counts):
+        self._machine = machine
+        real_pin = machine.Pin
+
+        class CountingPin(_PinProxy):
+            def __init__(self, *args, **kwargs):
+                _PinProxy.__init__(self, real_pin(*args, **kwargs), counts)
+
+        for name in ("IN", "OUT", "OPEN_DRAIN", "PULL_UP", "PULL_DOWN"):
+            if hasattr(real_pin, name):
+                setattr(CountingPin, name, getattr(real_pin, name))
+        self.Pin = CountingPin
+
+    def __getattr__(self, name):
+        return getattr(self._machine, name)
+
+
+class _TimeProbe:
+    """
+    Sustituto de time/utime: anota el instante de cada sleep_us del hilo de
+    refresco y, tras el número de filas pedido, corta con _Done todas las esperas.
+    Con counts anota también las llamadas a Pin acumuladas al final de cada fila.
+    """
+
+    def __init__(self, time_module, rows, other_thread, counts=None):
+        self._time = time_module
+        self._rows = rows
+        self._counts = counts
+        self.pin_marks = []
+        self._main = _thread.get_ident() if (other_thread and _thread) else None
+        self.stamps = []
+        self.stopped = False
+        self.timer = None  # RefreshTimer que cortó la medida con timer
+        self._slept_us = 0  # Esperas del hilo de refresco (ver ticks_us)
+
+    def _refresh_thread(self):
+        if self._main is None:
+            return True
+        return _thread.get_ident() != self._main
+
+    def sleep_us(self, us):
+        if self.stopped:
+            raise _Done()
+        if self._refresh_thread():
+            self.stamps.append(_now_us())
+            if self._counts is not None:
+                self.pin_marks.append(self._counts["pin_calls"])
+            if len(self.stamps) > self._rows:
+                self.stopped = True
+                raise _Done()
+            self._slept_us += us
+        self._time.sleep_us(us)
+
+    def ticks_us(self):
+        """
+        Reloj del RefreshTimer. En el PC las esperas del emulador no tardan de
+        verdad, así que es el tiempo real de CPU más lo esperado por el hilo de
+        refresco; en el dispositivo, ticks_us sin más.
+        """
+        if _ON_PC:
+            return _now_us() + self._slept_us
+        return self._time.ticks_us()
+
+    def ticks_diff(self, end, start):
+        return _ticks_diff(end, start)
+
+    def sleep_ms(self, ms):
+        if self.stopped:
+            raise _Done()
+        self._time.sleep_ms(ms)
+
+    def sleep(self, seconds):
+        if self.stopped:
+            raise _Done()
+        self._time.sleep(seconds)
+
+    def __getattr__(self, name):
+        return getattr(self._time, name)
+
+
+def _new_counts():
+    return {"spi_bytes": 0, "spi_calls": 0, "pin_calls": 0}
+
+
+# -- ST7789 -------------------------------------------------------------------
+
+def _write_test_bmp(path, width=64, height=64):
+    """Crea un BMP de 24 bits con franjas lisas (buenas para RLE) y un degradado."""
+    import struct
+    row_size = (width * 3 + 3) & ~3
+    with open(path, "wb") as bmp:
+        bmp.write(b"BM" + struct.pack("<IHHI", 54 + row_size * height, 0, 0, 54))
+        bmp.write(struct.pack("<IiiHHIIiiII", 40, width, height, 1, 24, 0, row_size * height,
+                              2835, 2835, 0, 0))
+        row = bytearray(row_size)
+        for y in range(height):
+            for x in range(width):
+                if x < width // 2:
+                    b, g, r = (y // 8) * 32, 255 - (y // 8) * 32, 128
+                else:
+                    b, g, r = x * 4, y * 4, (x + y) * 2
+                row[x * 3] = b & 0xFF
+                row[x * 3 + 1] = g & 0xFF
+                row[x * 3 + 2] = r & 0xFF
+            bmp.write(row)
+
+
+def _st7789_cases(lcd):
+    """Lista de (nombre, función) con cada primitiva a varios tamaños."""
+    width = lcd.display.width
+    height = lcd.display.height
+    small = min(width, height)
+    cx, cy = width // 2, height // 2
+    red, green, blue, white = 0xF800, 0x07E0, 0x001F, 0xFFFF
+    cases = [
+        ("fill_screen", lambda: lcd.fill_screen(0x0000)),
+        ("draw_pixel", lambda: lcd.draw_pixel(cx, cy, white)),
+    ]
+    for length in (10, small // 2, small - 1):
+        cases.append(("draw_line horizontal %d" % length, lambda n=length: lcd.draw_line(0, cy, n, cy, red)))
+        cases.append(("draw_line diagonal %d" % length, lambda n=length: lcd.draw_line(0, 0, n, n, green)))
+        cases.append(("draw_line steep %d" % length, lambda n=length: lcd.draw_line(0, 0, n // 4, n, blue)))
+    for size in (10, small // 2, small - 1):
+        cases.append(("draw_rectangle %d" % size, lambda n=size: lcd.draw_rectangle(0, 0, n, n, red)))
+        cases.append(("draw_rectangle filled %d" % size,
+                      lambda n=size: lcd.draw_rectangle(0, 0, n, n, red, filled=True)))
+    for radius in (5, small // 4, small // 2 - 1):
+        cases.append(("draw_circle r%d" % radius, lambda r=radius: lcd.draw_circle(cx, cy, r, green)))
+        cases.append(("draw_circle filled r%d" % radius,
+                      lambda r=radius: lcd.draw_circle(cx, cy, r, green, filled=True)))
+    for size in (20, small - 1):
+        star = ((size // 2, 0), (size * 2 // 3, size // 3), (size, size // 3), (size * 3 // 4, size * 2 // 3),
+                (size * 5 // 6, size), (size // 2, size * 4 // 5), (size // 6, size),
+                (size // 4, size * 2 // 3), (0, size // 3), (size // 3, size // 3))
+        cases.append(("draw_polygon %d" % size, lambda v=star: lcd.draw_polygon(blue, False, *v)))
+        cases.append(("draw_polygon filled %d" % size, lambda v=star: lcd.draw_polygon(blue, True, *v)))
+        cases.append(("draw_polygon antialias %d" % size,
+                      lambda v=star: lcd.draw_polygon(blue, True, *v, antialias=True)))
+    cases.append(("text 1 char", lambda: lcd.text(0, 0, "A", white, 0)))
+    cases.append(("text 16 chars", lambda: lcd.text(0, 0, "ABABABABABABABAB", white, 0)))
+    cases.append(("show_bmp 64x64 24bpp", lambda: lcd.show_bmp(_BMP_PATH, 0, 0)))
+    cases.append(("show_bmp 64x64 mirror", lambda: lcd.show_bmp(_BMP_PATH, 0, 0, mirror=True)))
+    cases.append(("blit_raw 64x64", lambda: lcd.blit_raw(_RAW_PATH, 0, 0)))
+    cases.append(("blit_raw 64x64 rle", lambda: lcd.blit_raw(_RLE_PATH, 0, 0)))
+
+    def flush_full():
+        lcd._mark_dirty(0, 0, width - 1, height - 1)
+        lcd.flush()
+
+    cases.append(("flush framebuffer full", flush_full))
+    return cases
+
+
+def _measure(func):
+    """Repite func durante al menos MIN_TIME_US y devuelve (repeticiones, µs totales)."""
+    func()  # Calentamiento (cachés, buffers del pool)
+    gc.collect()
+    repeats = 0
+    start = _now_us()
+    elapsed = 0
+    while elapsed < MIN_TIME_US and repeats < MAX_REPEATS:
+        func()
+        repeats += 1
+        elapsed = _ticks_diff(_now_us(), start)
+    return repeats, elapsed
+
+
+def bench_st7789():
+    """Mide las primitivas del ST7789. Devuelve una lista de resultados."""
+    import bmp2raw
+    from displays.st7789 import ST7789
+
+    lcd = ST7789()
+    lcd.init()
+    _write_test_bmp(_BMP_PATH)
+    bmp2raw.convert(_BMP_PATH, _RAW_PATH)
+    bmp2raw.convert(_BMP_PATH, _RLE_PATH, rle=True)
+
+    results = []
+    real = (lcd.spi, lcd.cs, lcd.dc)
+    try:
+        for name, func in _st7789_cases(lcd):
+            framebuffer = name.startswith("flush")
+            if framebuffer:
+                lcd.enable_framebuffer()
+
+            # Pasada de conteo: una operación con SPI y pines envueltos
+            counts = _new_counts()
+            lcd.spi = _SPIProxy(real[0], counts)
+            lcd.cs = _PinProxy(real[1], counts)
+            lcd.dc = _PinProxy(real[2], counts)
+            try:
+                func()
+            finally:
+                lcd.spi, lcd.cs, lcd.dc = real
+
+            repeats, elapsed = _measure(func)
+            if framebuffer:
+                lcd.disable_framebuffer()
+            result = {
+                "name": "st7789 " + name,
+                "ops_per_s": repeats * 1_000_000 / elapsed if elapsed else 0,
+                "us_per_op": elapsed / repeats,
+            }
+            result.update(counts)
+            results.append(result)
+            _print_result(result)
+    finally:
+        import os
+        for path in (_BMP_PATH, _RAW_PATH, _RLE_PATH):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    return results
+
+
+# -- HUB75 --------------------------------------------------------------------
+
+def _quiet(*args, **kwargs):
+    """Sustituto de print para que los mensajes de los scripts no se mezclen con los resultados."""
+
+
+def _no_timer(*args, **kwargs):
+    """Sustituto de hub75.RefreshTimer: el motor usa entonces on_time_us."""
+    return None
+
+
+def _run_variant(path, rows, other_thread, counts=None, timer_frames=None):
+    """
+    Ejecuta una variante hasta `rows` filas y devuelve la sonda con los instantes
+    de cada una. Con counts, los Pin que cree el script cuentan sus llamadas.
+    Con timer_frames el script conserva su RefreshTimer y se corta cuando el
+    timer lleva ese número de frames tras HUB75_TIMER_WARMUP de calentamiento;
+    queda en probe.timer (`rows` es entonces solo un tope por si el script no
+    crea ninguno).
+    """
+    import time as time_module
+    try:
+        import utime as utime_module
+    except ImportError:
+        utime_module = time_module
+
+    from displays import hub75  # Antes de sustituir utime, para que guarde el real
+
+    probe = _TimeProbe(utime_module, rows, other_thread, counts)
+    saved_timer = hub75.RefreshTimer
+    if timer_frames is None:
+        # Sin RefreshTimer: un solo sleep_us por fila y on_time_us fijo
+        hub75.RefreshTimer = _no_timer
+    else:
+        def counted_timer(*args, **kwargs):
+            timer = saved_timer(*args, **kwargs)
+            end = timer.end
+            warmup = [HUB75_TIMER_WARMUP]
+
+            def counted_end():
+                end()
+                if warmup[0]:
+                    warmup[0] -= 1
+                    if not warmup[0]:
+                        timer.reset_stats()  # Medir ya con el desplazamiento estimado
+                elif timer.frames >= timer_frames:
+                    probe.timer = timer
+                    probe.stopped = True
+                    raise _Done()
+
+            timer.end = counted_end
+            return timer
+
+        hub75.RefreshTimer = counted_timer
+    saved = {name: sys.modules.get(name) for name in ("time", "utime", "machine")}
+    sys.modules["time"] = probe
+    sys.modules["utime"] = probe
+    if counts is not None:
+        sys.modules["machine"] = _MachineProxy(saved["machine"], counts)
+    saved_hub75_time = hub75.utime
+    hub75.utime = probe
+    try:
+        with open(path) as source:
+            code = source.read()
+        try:
+            exec(code, {"__name__": "__main__", "print": _quiet})
+        except _Done:
+            pass
+        # Con refresco en otro hilo, esperar a que llegue a la última fila
+        while not probe.stopped:
+            utime_module.sleep_ms(1)
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+        hub75.utime = saved_hub75_time
+        hub75.RefreshTimer = saved_timer
+    return probe
+
+
+def _engine_rows(path, frame_name):
+    """Filas que muestra por frame el motor de hub75 con el frame del script."""
+    from displays import hub75
+
+    module = __import__(path[:-3])
+    engine = hub75.ScanEngine(backend=hub75.SimBackend(record=False))
+    engine.load(getattr(module, frame_name))
+    engine.refresh()
+    return engine.shifted + engine.reused
+
+
+def bench_hub75(variants=HUB75_VARIANTS, frames=HUB75_FRAMES):
+    """Mide las variantes de refresco HUB75. Devuelve una lista de resultados."""
+    from displays import hub75
+
+    results = []
+    for path, frame_name, other_thread in variants:
+        rows = _engine_rows(path, frame_name)
+        # Pasada de conteo: las llamadas a Pin entre el final de la primera fila y
+        # el de la misma fila en el frame siguiente (sin la configuración inicial)
+        counts = _new_counts()
+        marks = _run_variant(path, rows, other_thread, counts).pin_marks
+        counts["pin_calls"] = marks[-1] - marks[0]
+        gc.collect()
+
+        stamps = _run_variant(path, rows * frames, other_thread).stamps
+        periods = [_ticks_diff(stamps[i + 1], stamps[i]) for i in range(len(stamps) - 1)]
+        mean = sum(periods) / len(periods)
+        variance = sum((p - mean) ** 2 for p in periods) / len(periods)
+        result = {
+            "name": "hub75 " + path,
+            "fps": 1_000_000 / (mean * rows) if mean else 0,
+            "row_us": mean,
+            "jitter_us": variance ** 0.5,
+            "row_spread_us": max(periods) - min(periods),
+        }
+        result.update(counts)
+        results.append(result)
+        _print_result(result)
+
+        # Con el RefreshTimer del script: lo que consigue frente a lo pedido. Hay
+        # como mucho dos esperas (encendida y apagada) por pareja de filas y plano
+        limit = (HUB75_TIMER_WARMUP + frames + 2) * 4 * hub75.ROWS
+        timer = _run_variant(path, limit, other_thread, timer_frames=frames).timer
+        if timer is not None:
+            report = timer.report()
+            result = {
+                "name": "hub75 %s timer" % path,
+                "fps": report["fps"],
+                "target_fps": timer.fps,
+                "jitter_us": report["jitter_us"],
+                "overhead_us": report["overhead_us"],
+                "limited": report["limited"],
+            }
+            results.append(result)
+            _print_result(result)
+    return results
+
+
+# -- Arranque -----------------------------------------------------------------
+
+# Módulos cuyo arranque se mide, por display: importarlos desde cero (compilar
+# el .py o cargar el .mpy y ejecutar su cuerpo) y el heap que dejan ocupado
+BOOT_MODULES_ST7789 = ("displays.st7789",)
+BOOT_MODULES_HUB75 = ("displays.hub75", "enfin", "matrix64x64micropython")
+
+
+def _heap_used():
+    """Bytes de heap ocupados tras recoger la basura (en el PC, según tracemalloc)."""
+    gc.collect()
+    if hasattr(gc, "mem_alloc"):
+        return gc.mem_alloc()
+    import tracemalloc
+    return tracemalloc.get_traced_memory()[0]
+
+
+def _boot_step(name, func):
+    """Ejecuta func una vez y devuelve el resultado con su tiempo y el heap que deja ocupado."""
+    before = _heap_used()
+    start = _now_us()
+    func()
+    elapsed = _ticks_diff(_now_us(), start)
+    result = {"name": "boot " + name, "ms": elapsed / 1000, "heap": _heap_used() - before}
+    _print_result(result)
+    return result
+
+
+def _import_fresh(name):
+    """Importa un módulo como en un arranque en frío (aunque ya estuviera importado)."""
+    sys.modules.pop(name, None)
+    __import__(name)
+
+
+def _first_pixel():
+    from displays.st7789 import ST7789
+    lcd = ST7789()
+    lcd.init()
+    lcd.draw_pixel(0, 0, 0xFFFF)
+
+
+def _first_frame():
+    from displays import hub75
+    panel = hub75.HUB75()
+    panel.init()
+    panel.load(hub75.pack_hex(()))
+    panel.refresh()
+
+
+def bench_boot(st7789=True, hub75=True):
+    """
+    Mide el arranque: importación de cada módulo y tiempo hasta el primer píxel
+    (ST7789) o el primer frame (HUB75). Ejecutar en un arranque limpio y repetir
+    con los .mpy de build.py para comparar.
+    """
+    tracing = not hasattr(gc, "mem_alloc")
+    if tracing:
+        import tracemalloc
+        tracemalloc.start()
+    results = []
+    try:
+        if st7789:
+            for name in BOOT_MODULES_ST7789:
+                results.append(_boot_step("import " + name, lambda: _import_fresh(name)))
+            sys.modules.pop("displays.st7789", None)
+            results.append(_boot_step("st7789 first pixel", _first_pixel))
+        if hub75:
+            for name in BOOT_MODULES_HUB75:
+                results.append(_boot_step("import " + name, lambda: _import_fresh(name)))
+            sys.modules.pop("displays.hub75", None)
+            results.append(_boot_step("hub75 first frame", _first_frame))
+    finally:
+        if tracing:
+            tracemalloc.stop()
+    return results
+
+
+# -- Informe ------------------------------------------------------------------
+
+def _print_result(result):
+    if "ms" in result:
+        print("%-42s %9.2f ms  heap %8d B" % (result["name"], result["ms"], result["heap"]))
+    elif "target_fps" in result:
+        print("%-42s %8.1f fps  de %5.1f  jitter %7.1f µs  desplazamiento %8.1f µs/frame%s" % (
+            result["name"], result["fps"], result["target_fps"], result["jitter_us"],
+            result["overhead_us"], "  (limitado)" if result["limited"] else ""))
+    elif "fps" in result:
+        print("%-42s %8.1f fps  fila %8.1f µs  jitter %7.1f µs (rango %7.1f)  pin %6d/frame" % (
+            result["name"], result["fps"], result["row_us"], result["jitter_us"],
+            result["row_spread_us"], result["pin_calls"]))
+    else:
+        print("%-42s %9.1f op/s %10.1f µs/op  %7d B  spi %4d  pin %5d" % (
+            result["name"], result["ops_per_s"], result["us_per_op"], result["spi_bytes"],
+            result["spi_calls"], result["pin_calls"]))
+
+
+def compare(results, baseline):
+    """
+    Imprime la relación de velocidad de cada caso respecto a una ejecución
+    anterior (mayor que 1 = más rápido) y, en el arranque, la diferencia de heap.
+    """
+    base = {result["name"]: result for result in baseline}
+    for result in results:
+        old = base.get(result["name"])
+        if old is None:
+            continue
+        if "ms" in result:
+            if result["ms"]:
+                print("%-42s x%.2f  heap %+d B" % (result["name"], old["ms"] / result["ms"],
+                                                  result["heap"] - old["heap"]))
+            continue
+        key = "fps" if "fps" in result else "ops_per_s"
+        if old[key]:
+            print("%-42s x%.2f" % (result["name"], result[key] / old[key]))
+
+
+def run(st7789=None, hub75=None, boot=True, speed=True, json_path=None):
+    """
+    Ejecuta el banco de pruebas. Por defecto mide el ST7789 en el ESP32, el
+    HUB75 en el RP2040 y los dos en el PC. El arranque (boot) se mide primero,
+    antes de que las pruebas de velocidad (speed) importen los drivers.
+    """
+    if st7789 is None:
+        st7789 = sys.platform != "rp2"
+    if hub75 is None:
+        hub75 = sys.platform not in ("esp32",)
+    results = []
+    if boot:
+        results += bench_boot(st7789, hub75)
+    if speed and st7789:
+        results += bench_st7789()
+    if speed and hub75:
+        results += bench_hub75()
+    if json_path:
+        import json
+        with open(json_path, "w") as out:
+            json.dump(results, out)
+    return results
+
+
+def main():
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Banco de pruebas de los displays (con el emulador).")
+    parser.add_argument("--only", choices=("st7789", "hub75", "boot"),
+                        help="Medir solo un display, o solo el arranque de los dos")
+    parser.add_argument("--json", help="Guardar los resultados en este archivo")
+    parser.add_argument("--compare", help="Comparar con resultados guardados antes con --json")
+    args = parser.parse_args()
+
+    # Sin caché de bytecode, cada importación compila el fuente como en el dispositivo
+    import tempfile
+    sys.dont_write_bytecode = True
+    sys.pycache_prefix = tempfile.mkdtemp()
+
+    import emulator
+    emulator.install()
+    # Los hilos de refresco que terminan con _Done no deben llenar la salida de trazas
+    default_hook = sys.unraisablehook
+    sys.unraisablehook = lambda unraisable: (None if isinstance(unraisable.exc_value, _Done)
+                                             else default_hook(unraisable))
+
+    only = args.only
+    results = run(st7789=only != "hub75", hub75=only != "st7789", speed=only != "boot",
+                  json_path=args.json)
+    if args.compare:
+        with open(args.compare) as base:
+            compare(results, json.load(base))
+
+
+if __name__ == "__main__":
+    main()
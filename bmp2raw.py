@@ -0,0 +1,123 @@
+"""
+Conversor (para el PC) de BMP al formato crudo RGB565 que muestra blit_raw().
+
+Uso:
+    python bmp2raw.py entrada.bmp salida.raw [--rle] [--mirror]
+
+El archivo generado tiene una cabecera de 8 bytes "<2sHHBB" (b"R5", ancho,
+alto, formato 0 = RGB565 con el byte alto primero, flags con bit 0 = RLE)
+seguida de los píxeles por filas, de arriba abajo, listos para enviar al
+display. Con --rle los píxeles se guardan en paquetes: un byte n < 128 va
+seguido de n + 1 píxeles literales; n >= 128 va seguido de un píxel que se
+repite n - 126 veces.
+"""
+import struct
+
+RAW_MAGIC = b"R5"
+RAW_FORMAT_RGB565 = 0
+RAW_FLAG_RLE = 0x01
+
+
+def read_bmp(path, mirror=False):
+    """
+    Lee un BMP sin comprimir de 16 (RGB565), 24 o 32 bits.
+    Devuelve (ancho, alto, píxeles) con los píxeles como enteros RGB565 por filas.
+    """
+    with open(path, "rb") as bmp_file:
+        data = bmp_file.read()
+
+    if data[0:2] != b"BM":
+        raise ValueError("El archivo no es un BMP.")
+    pixel_data_offset = struct.unpack_from("<I", data, 10)[0]
+    width, height, _, bits_per_pixel, compression = struct.unpack_from("<iiHHI", data, 18)
+    if bits_per_pixel not in (16, 24, 32) or compression not in (0, 3):
+        raise ValueError("Solo se admiten BMP sin comprimir de 16, 24 o 32 bits.")
+    if bits_per_pixel == 16 and (compression != 3 or
+                                 struct.unpack_from("<III", data, 54) != (0xF800, 0x07E0, 0x001F)):
+        raise ValueError("Los BMP de 16 bits deben ser RGB565 (BI_BITFIELDS).")
+
+    top_down = height < 0
+    height = abs(height)
+    bytes_per_pixel = bits_per_pixel // 8
+    row_size = (width * bytes_per_pixel + 3) & ~3
+
+    pixels = []
+    for y in range(height):
+        file_row = y if top_down else height - 1 - y
+        start = pixel_data_offset + file_row * row_size
+        row = []
+        for x in range(width):
+            i = start + x * bytes_per_pixel
+            if bytes_per_pixel == 2:
+                row.append(data[i] | (data[i + 1] << 8))
+            else:
+                b, g, r = data[i], data[i + 1], data[i + 2]
+                row.append((((r * 31 + 127) // 255) << 11)
+                           | (((g * 63 + 127) // 255) << 5)
+                           | ((b * 31 + 127) // 255))
+        if mirror:
+            row.reverse()
+        pixels.extend(row)
+    return width, height, pixels
+
+
+def encode_rle(pixels):
+    """Codifica una lista de píxeles RGB565 en paquetes RLE (ver cabecera del módulo)."""
+    out = bytearray()
+    literals = []
+
+    def flush_literals():
+        while literals:
+            chunk = literals[:128]
+            del literals[:128]
+            out.append(len(chunk) - 1)
+            for pixel in chunk:
+                out.extend(struct.pack(">H", pixel))
+
+    i = 0
+    while i < len(pixels):
+        run = 1
+        while i + run < len(pixels) and run < 129 and pixels[i + run] == pixels[i]:
+            run += 1
+        if run >= 2:
+            flush_literals()
+            out.append(run + 126)
+            out.extend(struct.pack(">H", pixels[i]))
+        else:
+            literals.append(pixels[i])
+        i += run
+    flush_literals()
+    return bytes(out)
+
+
+def convert(bmp_path, raw_path, rle=False, mirror=False):
+    """Convierte un BMP al formato crudo. Devuelve el tamaño del archivo generado."""
+    width, height, pixels = read_bmp(bmp_path, mirror)
+    if rle:
+        body = encode_rle(pixels)
+    else:
+        body = struct.pack(">%dH" % len(pixels), *pixels)
+    header = struct.pack("<2sHHBB", RAW_MAGIC, width, height, RAW_FORMAT_RGB565,
+                         RAW_FLAG_RLE if rle else 0)
+    with open(raw_path, "wb") as raw_file:
+        raw_file.write(header)
+        raw_file.write(body)
+    return len(header) + len(body)
+
+
+def main():
+    import argparse  # Solo en el PC: el resto del módulo también funciona en MicroPython
+
+    parser = argparse.ArgumentParser(description="Convierte un BMP al formato crudo RGB565 de blit_raw().")
+    parser.add_argument("bmp", help="BMP de entrada (16, 24 o 32 bits)")
+    parser.add_argument("raw", help="Archivo crudo de salida")
+    parser.add_argument("--rle", action="store_true", help="Comprimir con RLE")
+    parser.add_argument("--mirror", action="store_true", help="Reflejar horizontalmente")
+    args = parser.parse_args()
+
+    size = convert(args.bmp, args.raw, args.rle, args.mirror)
+    print(f"{args.raw}: {size} bytes")
+
+
+if __name__ == "__main__":
+    main()
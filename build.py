@@ -0,0 +1,96 @@
+"""
+Compila (en el PC) los drivers a bytecode .mpy con mpy-cross, para que el
+dispositivo no tenga que compilar el fuente en cada arranque.
+
+Uso:
+    python build.py esp32s3 [--out build] [--mpy-cross ruta] [-O 2]
+    python build.py rp2
+
+El resultado queda en build/<placa>/ con la misma estructura que el
+repositorio; se copia a la raíz del sistema de archivos del dispositivo, por
+ejemplo con: mpremote cp -r build/esp32s3/displays :
+La versión de mpy-cross tiene que corresponder a la del firmware.
+
+Los .mpy se cargan en el heap al importarlos. Para que el bytecode y las
+constantes (fuente 8x8, tablas de color, frames) se queden en la flash, hay que
+congelarlos en el firmware con manifest.py.
+
+benchmark.bench_boot() mide la importación y el tiempo hasta el primer píxel:
+ejecútalo con los .py y después con los .mpy y compara con --compare (en el PC)
+o comparando las dos salidas.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+
+# Arquitectura del código nativo de cada placa (la necesitan las funciones viper)
+TARGETS = {
+    "esp32s3": "xtensawin",
+    "rp2": "armv6m",
+}
+
+# Módulos de biblioteca que se precompilan. Los scripts de demo se ejecutan
+# como main y se dejan como fuente.
+MODULES = (
+    "displays/__init__.py",
+    "displays/fonts.py",
+    "displays/st7789.py",
+    "displays/hub75.py",
+    "bmp2raw.py",
+    "benchmark.py",
+)
+
+
+def find_mpy_cross(path=None):
+    """Devuelve la ruta de mpy-cross (la indicada o la del PATH)."""
+    path = path or shutil.which("mpy-cross")
+    if path is None:
+        raise SystemExit("No se encuentra mpy-cross: instálalo (pip install mpy-cross) o indica --mpy-cross.")
+    return path
+
+
+def build(target, out_dir="build", mpy_cross=None, opt=None):
+    """
+    Compila MODULES para una placa en out_dir/<placa>/.
+    :return: Lista de (módulo, bytes del .py, bytes del .mpy).
+    """
+    if target not in TARGETS:
+        raise ValueError("Placa desconocida: %s" % target)
+    mpy_cross = find_mpy_cross(mpy_cross)
+    root = os.path.dirname(os.path.abspath(__file__))
+    sizes = []
+    for module in MODULES:
+        source = os.path.join(root, module)
+        output = os.path.join(out_dir, target, module[:-3] + ".mpy")
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        command = [mpy_cross, "-march=" + TARGETS[target], "-s", module, "-o", output]
+        if opt is not None:
+            command.append("-O%d" % opt)
+        subprocess.run(command + [source], check=True)
+        sizes.append((module, os.path.getsize(source), os.path.getsize(output)))
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompila los drivers a .mpy con mpy-cross.")
+    parser.add_argument("target", choices=sorted(TARGETS), help="Placa de destino")
+    parser.add_argument("--out", default="build", help="Directorio de salida (por defecto build)")
+    parser.add_argument("--mpy-cross", help="Ruta de mpy-cross (por defecto, el del PATH)")
+    parser.add_argument("-O", dest="opt", type=int, choices=range(4),
+                        help="Nivel de optimización de mpy-cross (3 quita los assert y los números de línea)")
+    args = parser.parse_args()
+
+    version = subprocess.run([find_mpy_cross(args.mpy_cross), "--version"],
+                             capture_output=True, text=True).stdout.strip()
+    print(version)
+    total_py = total_mpy = 0
+    for module, py_size, mpy_size in build(args.target, args.out, args.mpy_cross, args.opt):
+        print("%-24s %7d B -> %7d B" % (module, py_size, mpy_size))
+        total_py += py_size
+        total_mpy += mpy_size
+    print("%-24s %7d B -> %7d B" % ("total", total_py, total_mpy))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""
+Drivers de los displays del repositorio, importables como biblioteca.
+
+    from displays.st7789 import ST7789     # LCD de la ESP32-S3-GEEK
+    from displays.hub75 import HUB75       # Matriz LED HUB75 de 64x64 (RP2040)
+
+Importar un driver no toca el hardware: los pines, el SPI y la frecuencia de
+la CPU se configuran al llamar a init(). Este paquete no importa ninguno de
+los dos por su cuenta, así que una aplicación solo carga el que usa.
+"""
@@ -0,0 +1,70 @@
+"""
+Fuentes compartidas por los drivers: la fuente de 8x8 integrada y el lector
+de fuentes empaquetadas (.fnt, generadas en el PC con fontconv.py).
+
+No dependen de ningún display, así que el LCD ST7789 y la matriz HUB75
+escriben texto con las mismas fuentes.
+"""
+import struct
+
+# Fuente de 8x8: un byte por fila, de arriba abajo, con el bit más
+# significativo a la izquierda. Son constantes de bytes para que al importar no
+# se creen listas (y para que en un módulo congelado queden en la flash).
+font_8x8 = {
+    'A': b"\x18\x24\x42\x42\x7e\x42\x42\x00",  # ...##... ..#..#.. .#....#. .#....#. .######. .#....#. .#....#. ........
+    'B': b"\x7c\x42\x42\x7c\x42\x42\x7c\x00",  # .#####.. .#....#. .#....#. .#####.. .#....#. .#....#. .#####.. ........
+    # Añade más caracteres según sea necesario
+}
+EMPTY_GLYPH = bytes(8)  # Filas de los caracteres que no están en la fuente
+
+# Fuentes empaquetadas (generadas en el PC con fontconv.py):
+#   cabecera "<2sBBHH": b"FN", versión, alto en píxeles, primer carácter y
+#   número de caracteres; después un índice de 4 bytes por carácter "<HBx"
+#   (desplazamiento del bitmap y ancho, 0 = sin glifo) y los bitmaps, con
+#   (ancho + 7) // 8 bytes por fila y el bit más significativo a la izquierda.
+FONT_MAGIC = b"FN"
+
+
+class Font:
+    """Fuente proporcional en formato empaquetado, leída glifo a glifo del archivo."""
+
+    def __init__(self, path, preload=False):
+        """
+        :param path: Ruta del archivo .fnt.
+        :param preload: Si es True, todos los bitmaps se cargan en RAM de una vez.
+        """
+        self._file = open(path, "rb")
+        magic, _, self.height, self.first, self.count = struct.unpack("<2sBBHH", self._file.read(8))
+        if magic != FONT_MAGIC:
+            raise ValueError("El archivo no es una fuente empaquetada.")
+        self._index = self._file.read(self.count * 4)
+        self._data_start = 8 + self.count * 4
+        self._data = self._file.read() if preload else None
+
+    def glyph(self, char):
+        """Devuelve (ancho, bitmap) de un carácter, o None si no está en la fuente."""
+        code = ord(char) - self.first
+        if code < 0 or code >= self.count:
+            return None
+        i = code * 4
+        width = self._index[i + 2]
+        if not width:
+            return None
+        offset = self._index[i] | (self._index[i + 1] << 8)
+        size = ((width + 7) >> 3) * self.height
+        if self._data is not None:
+            return width, memoryview(self._data)[offset:offset + size]
+        self._file.seek(self._data_start + offset)
+        return width, self._file.read(size)
+
+    def text_width(self, string, scale=1):
+        """Ancho en píxeles que ocupa una cadena."""
+        width = 0
+        for char in string:
+            glyph = self.glyph(char) or self.glyph("?")
+            if glyph is not None:
+                width += glyph[0]
+        return width * scale
+
+    def close(self):
+        self._file.close()
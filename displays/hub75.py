@@ -0,0 +1,1509 @@
+"""
+Motor de refresco para matrices LED HUB75 de 64x64 (multiplexado 1/32).
+
+Los frames se guardan empaquetados: una palabra de 64 bits por fila en un
+array('Q'), donde el bit 63 es la columna 0. Antes de refrescar, load()
+precalcula para cada pareja de filas (fila y fila + 32) una secuencia de 64
+bytes con el estado de los pines de color, de modo que el bucle de refresco no
+indexa ni recalcula nada por columna.
+
+Para color con varios bits por canal se usa modulación por código binario
+(BCM): el frame RGB se descompone en planos de bits y cada plano se muestra con
+un tiempo de OE proporcional a su peso (1, 2, 4, ...).
+
+La salida física está separada en backends intercambiables: PinBackend
+(Pin.value por columna), PioBackend (PIO del RP2040, una llamada por fila) y
+SimBackend (simulado, registra la forma de onda para probar y medir en un PC).
+La clase HUB75 reúne pines, dirección de fila, backend y motor en un driver
+que no toca el hardware hasta llamar a init().
+
+FrameBuffer permite dibujar (píxeles, líneas, rectángulos, copias y texto) en
+planos de bits con colores RGB565, igual que en el driver ST7789.
+
+Varios paneles encadenados y en mosaico se manejan como un único lienzo con
+PanelLayout, que calcula al configurarse las tablas entre el lienzo y el orden
+de desplazamiento.
+
+Los tiempos de cada fila son fijos (on_time_us) o los calcula un RefreshTimer
+para unos fps y un brillo dados, midiendo lo que tarda el desplazamiento.
+
+Las animaciones se guardan en archivos .anm (ver animconv.py) con cada frame
+codificado como XOR de las filas que cambian respecto al anterior; Animation
+los lee de uno en uno y AnimationPlayer los pasa al motor entre refrescos.
+"""
+import struct
+from array import array
+
+from .fonts import EMPTY_GLYPH, font_8x8
+
+try:
+    import utime
+except ImportError:  # CPython: solo para usar SimBackend en un PC
+    import time as utime
+
+ROWS = 64
+COLS = 64
+SCAN_ROWS = ROWS // 2  # Filas que se seleccionan por frame (1/32)
+
+# Colores de 1 bit por canal: bit 0 rojo, bit 1 verde, bit 2 azul
+RED = 0b001
+GREEN = 0b010
+BLUE = 0b100
+WHITE = 0b111
+
+# Orden de los bits en cada byte de estado de pines
+COLOR_PINS = ("R1", "G1", "B1", "R2", "G2", "B2")
+
+# Líneas de dirección de fila, del bit menos significativo al más significativo
+ADDRESS_PINS = ("A", "B", "C", "D", "E")
+
+# Animaciones .anm: cabecera "<2sBBHH" (b"HA", versión, color, número de
+# frames, reservado) y, por cada frame, "<HQ" (duración en ms y máscara de
+# filas cambiadas, bit 63 = fila 0) seguido de 8 bytes big-endian por fila
+# cambiada con el XOR respecto al frame anterior. El primero se codifica
+# respecto a un frame apagado.
+ANIM_MAGIC = b"HA"
+ANIM_VERSION = 1
+ANIM_HEADER = "<2sBBHH"
+ANIM_HEADER_SIZE = 8
+ANIM_FRAME = "<HQ"
+ANIM_FRAME_SIZE = 10
+
+# Registros SIO del RP2040 para poner a 1 / a 0 varios GPIO de una vez
+_RP2_GPIO_OUT_SET = 0xD0000014
+_RP2_GPIO_OUT_CLR = 0xD0000018
+
+
+def pack_hex(hex_data):
+    """
+    Convierte una lista de valores hexadecimales (int o cadena '0x...') en un
+    frame empaquetado de 64 palabras. Las filas que falten quedan apagadas.
+    """
+    frame = array("Q", [0] * ROWS)
+    for row, hex_value in enumerate(hex_data):
+        if isinstance(hex_value, str) and hex_value.startswith("0x"):
+            frame[row] = int(hex_value, 16)
+        elif isinstance(hex_value, int):
+            frame[row] = hex_value
+        else:
+            raise ValueError(f"Valor inválido en fila {row}: {hex_value}")
+    return frame
+
+
+def pack_binary(binary_data):
+    """Convierte una lista de 64x64 = 4096 bits (0/1) en un frame empaquetado."""
+    if len(binary_data) != ROWS * COLS:
+        raise ValueError("El formato binario debe contener exactamente 64x64 = 4096 elementos.")
+
+    frame = array("Q", [0] * ROWS)
+    i = 0
+    for row in range(ROWS):
+        word = 0
+        for _ in range(COLS):
+            word = (word << 1) | (binary_data[i] & 1)
+            i += 1
+        frame[row] = word
+    return frame
+
+
+def pack_bytes(data):
+    """
+    Convierte un frame guardado como bytes (8 bytes por fila, big-endian, el bit
+    más significativo es la columna 0) en un frame empaquetado. Guardado así, un
+    frame es una sola constante: no hay que analizar una lista al importar y, en
+    un módulo congelado en el firmware, los datos se quedan en la flash.
+    """
+    if len(data) != ROWS * 8:
+        raise ValueError("El frame debe tener 64 filas de 8 bytes = 512 bytes.")
+    frame = array("Q", [0] * ROWS)
+    for row in range(ROWS):
+        frame[row] = int.from_bytes(data[row * 8:row * 8 + 8], "big")
+    return frame
+
+
+def frame_bytes(frame):
+    """Devuelve los 512 bytes de un frame empaquetado, en el formato de pack_bytes."""
+    data = bytearray(ROWS * 8)
+    for row in range(ROWS):
+        data[row * 8:row * 8 + 8] = frame[row].to_bytes(8, "big")
+    return bytes(data)
+
+
+def row_pair_states(upper, lower, color=RED):
+    """
+    Devuelve los 64 bytes de estado de pines (ver COLOR_PINS) para una pareja de
+    filas empaquetadas, en el orden en que se desplazan (columna 0 primero).
+    """
+    states = bytearray(COLS)
+    upper_code = color & 0b111
+    lower_code = upper_code << 3
+    for col in range(COLS):
+        bit = 63 - col
+        s = 0
+        if (upper >> bit) & 1:
+            s |= upper_code
+        if (lower >> bit) & 1:
+            s |= lower_code
+        states[col] = s
+    return bytes(states)
+
+
+def rgb_bitplanes(pixels, depth=4):
+    """
+    Descompone un frame RGB888 (64x64 píxeles, 3 bytes por píxel, por filas) en
+    planos de bits usando los `depth` bits más significativos de cada canal.
+    Devuelve una lista de planos, del menos al más significativo; cada plano
+    contiene las 32 secuencias de estado de pines de las parejas de filas.
+    """
+    if depth < 1 or depth > 8:
+        raise ValueError("La profundidad debe estar entre 1 y 8 bits por canal")
+    if len(pixels) != ROWS * COLS * 3:
+        raise ValueError("El frame RGB debe tener 64x64x3 = 12288 bytes.")
+
+    first_bit = 8 - depth
+    line = COLS * 3
+    planes = [[] for _ in range(depth)]
+    states = [bytearray(COLS) for _ in range(depth)]
+    for row in range(SCAN_ROWS):
+        i = row * line
+        j = (row + SCAN_ROWS) * line
+        for col in range(COLS):
+            r1 = pixels[i]
+            g1 = pixels[i + 1]
+            b1 = pixels[i + 2]
+            r2 = pixels[j]
+            g2 = pixels[j + 1]
+            b2 = pixels[j + 2]
+            for plane in range(depth):
+                bit = first_bit + plane
+                states[plane][col] = (((r1 >> bit) & 1)
+                                      | ((g1 >> bit) & 1) << 1
+                                      | ((b1 >> bit) & 1) << 2
+                                      | ((r2 >> bit) & 1) << 3
+                                      | ((g2 >> bit) & 1) << 4
+                                      | ((b2 >> bit) & 1) << 5)
+            i += 3
+            j += 3
+        for plane in range(depth):
+            planes[plane].append(bytes(states[plane]))
+    return planes
+
+
+class PanelLayout:
+    """
+    Varios paneles de 64x64 encadenados (la salida de uno va a la entrada del
+    siguiente) y colocados en mosaico, vistos como un único lienzo de
+    panels_x * 64 por panels_y * 64 píxeles.
+
+    Los paneles se numeran en el orden de la cadena, empezando por el que va
+    conectado a la placa, y por defecto recorren el mosaico por filas de
+    izquierda a derecha y de arriba abajo. Con serpentine las filas impares del
+    mosaico van de derecha a izquierda y con los paneles girados 180°, que es
+    como se cablean para acortar los cables. `rotation` gira todos los paneles
+    (0, 90, 180 o 270 grados en sentido horario) y `positions` permite dar a
+    mano (columna, fila, giro) de cada panel de la cadena.
+
+    La correspondencia entre el lienzo y el orden de desplazamiento se calcula
+    una vez, al crear el objeto: para cada fila multiplexada y cada panel se
+    guarda el tramo de 64 píxeles del lienzo que le toca (origen y paso). Al
+    cargar un frame solo se recorren esas tablas; en el refresco no se calcula
+    nada por píxel y su coste por píxel no crece con el número de paneles.
+    """
+
+    def __init__(self, panels_x=1, panels_y=1, serpentine=False, rotation=0, positions=None):
+        if positions is None:
+            positions = []
+            for py in range(panels_y):
+                reverse = serpentine and py % 2 == 1
+                for i in range(panels_x):
+                    px = panels_x - 1 - i if reverse else i
+                    positions.append((px, py, (rotation + (180 if reverse else 0)) % 360))
+        for px, py, turn in positions:
+            if turn not in (0, 90, 180, 270):
+                raise ValueError("El giro de un panel debe ser 0, 90, 180 o 270 grados")
+            if not (0 <= px < panels_x and 0 <= py < panels_y):
+                raise ValueError("Panel fuera del mosaico: (%d, %d)" % (px, py))
+        self.positions = positions
+        self.panels = len(positions)
+        self.width = panels_x * COLS
+        self.height = panels_y * ROWS
+        self.shift_cols = self.panels * COLS  # Columnas que se desplazan por fila
+
+        # Tabla de tramos: para cada fila multiplexada, por orden de desplazamiento
+        # (el primer dato desplazado acaba en el último panel de la cadena), los
+        # tramos de las filas de arriba y de abajo como (x, y, dx, dy)
+        self.segments = []
+        for row in range(SCAN_ROWS):
+            segments = []
+            for px, py, turn in reversed(positions):
+                segments.append((self._segment(px, py, turn, row),
+                                 self._segment(px, py, turn, row + SCAN_ROWS)))
+            self.segments.append(segments)
+
+    @staticmethod
+    def _segment(px, py, turn, row):
+        """Tramo del lienzo que ocupa la fila `row` de un panel: (x, y, dx, dy) de la columna 0."""
+        x = px * COLS
+        y = py * ROWS
+        if turn == 0:
+            return x, y + row, 1, 0
+        if turn == 180:
+            return x + COLS - 1, y + ROWS - 1 - row, -1, 0
+        if turn == 90:
+            return x + ROWS - 1 - row, y, 0, 1
+        return x + row, y + COLS - 1, 0, -1  # 270
+
+    def _word(self, plane, segment):
+        """Los 64 bits de un tramo de un plano, con la columna 0 del panel en el bit 63."""
+        x, y, dx, dy = segment
+        width = self.width
+        if dy == 0:
+            if dx == 1:
+                return (plane[y] >> (width - COLS - x)) & 0xFFFFFFFFFFFFFFFF
+            word = (plane[y] >> (width - 1 - x)) & 0xFFFFFFFFFFFFFFFF
+            # Tramo invertido: dar la vuelta a los 64 bits
+            reverse = 0
+            for _ in range(COLS):
+                reverse = (reverse << 1) | (word & 1)
+                word >>= 1
+            return reverse
+        shift = width - 1 - x
+        word = 0
+        for _ in range(COLS):
+            word = (word << 1) | ((plane[y] >> shift) & 1)
+            y += dy
+        return word
+
+    def row_states(self, red, green=None, blue=None):
+        """
+        Devuelve las 32 secuencias de estado de pines (ver COLOR_PINS) del lienzo,
+        de shift_cols bytes cada una.
+        :param red: Plano de bits del rojo: `height` enteros de `width` bits, con el
+                    bit más significativo en la columna 0 (como pack_hex, pero del
+                    ancho del lienzo); None si el canal está apagado.
+        :param green: Plano del verde, o None.
+        :param blue: Plano del azul, o None.
+        """
+        planes = [(plane, channel) for channel, plane in enumerate((red, green, blue)) if plane is not None]
+        rows = []
+        for segments in self.segments:
+            states = bytearray(self.shift_cols)
+            offset = 0
+            for upper, lower in segments:
+                words = []
+                for plane, channel in planes:
+                    word = self._word(plane, upper)
+                    if word:
+                        words.append((word, channel))
+                    word = self._word(plane, lower)
+                    if word:
+                        words.append((word, channel + 3))
+                for word, bit in words:
+                    col = offset + COLS - 1
+                    while word:
+                        if word & 1:
+                            states[col] |= 1 << bit
+                        word >>= 1
+                        col -= 1
+                offset += COLS
+            rows.append(bytes(states))
+        return rows
+
+
+class FrameBuffer:
+    """
+    Framebuffer RGB de la matriz (o del lienzo de un PanelLayout) guardado como
+    planos de bits: por cada canal y cada bit de color, `height` enteros de
+    `width` bits con el bit más significativo en la columna 0, el formato que
+    recibe PanelLayout.row_states. Un panel de 64x64 con 4 bits por canal son
+    12 planos de 64 enteros.
+
+    Los colores son RGB565, como en el driver ST7789, y draw_pixel, draw_line,
+    draw_rectangle, fill_screen, text y draw_text se llaman y se usan igual que
+    allí, así que el mismo código de interfaz dibuja en los dos displays. Las
+    primitivas pintan filas enteras con una máscara (OR / AND de enteros) en
+    lugar de píxel a píxel.
+
+        fb = panel.framebuffer(depth=4)
+        fb.fill_rect(0, 0, 64, 8, 0x001F)
+        fb.text(4, 0, "AB", 0xFFFF, 0x001F)
+        panel.load_framebuffer(fb)
+    """
+
+    def __init__(self, width=COLS, height=ROWS, depth=1):
+        """
+        :param width: Ancho en píxeles (64, o el del lienzo de un PanelLayout).
+        :param height: Alto en píxeles.
+        :param depth: Bits por canal, de 1 a 5; con más de uno el panel usa BCM.
+        """
+        if depth < 1 or depth > 5:
+            raise ValueError("La profundidad debe estar entre 1 y 5 bits por canal")
+        self.width = width
+        self.height = height
+        self.depth = depth
+        self._full = (1 << width) - 1
+        # planes[canal][bit]: canal 0 rojo, 1 verde, 2 azul; bit 0 el menos significativo
+        self.planes = [[[0] * height for _ in range(depth)] for _ in range(3)]
+        self._targets_cache = {}  # RGB565 -> [(filas del plano, bit del color)]
+
+    def _targets(self, color):
+        """Para cada plano, (sus filas, 1 si el color tiene ese bit encendido)."""
+        targets = self._targets_cache.get(color)
+        if targets is None:
+            depth = self.depth
+            levels = (((color >> 11) & 0x1F) >> (5 - depth),
+                      ((color >> 5) & 0x3F) >> (6 - depth),
+                      (color & 0x1F) >> (5 - depth))
+            targets = []
+            for channel in range(3):
+                for bit in range(depth):
+                    targets.append((self.planes[channel][bit], (levels[channel] >> bit) & 1))
+            if len(self._targets_cache) >= 16:
+                self._targets_cache.clear()
+            self._targets_cache[color] = targets
+        return targets
+
+    def _mask(self, x, w):
+        """Máscara de las columnas x..x+w-1, recortada al ancho."""
+        x0 = max(x, 0)
+        x1 = min(x + w, self.width)
+        if x1 <= x0:
+            return 0
+        return ((1 << (x1 - x0)) - 1) << (self.width - x1)
+
+    def _paint(self, lines, color):
+        """Pinta con `color` los bits de cada (fila, máscara) de `lines`."""
+        full = self._full
+        for rows, on in self._targets(color):
+            if on:
+                for y, mask in lines:
+                    rows[y] |= mask
+            else:
+                for y, mask in lines:
+                    rows[y] &= full ^ mask
+
+    def fill_screen(self, color):
+        """Llena todo el framebuffer con un color."""
+        full = self._full
+        for rows, on in self._targets(color):
+            value = full if on else 0
+            for y in range(self.height):
+                rows[y] = value
+
+    def set_pixel(self, x, y, color):
+        """Pinta un píxel; fuera del framebuffer no hace nada."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self._paint(((y, 1 << (self.width - 1 - x)),), color)
+
+    draw_pixel = set_pixel  # Nombre del driver ST7789
+
+    def get_pixel(self, x, y):
+        """Devuelve el color RGB565 de un píxel (con la precisión de depth)."""
+        shift = self.width - 1 - x
+        levels = []
+        for channel in self.planes:
+            level = 0
+            for bit, rows in enumerate(channel):
+                level |= ((rows[y] >> shift) & 1) << bit
+            levels.append(level)
+        depth = self.depth
+        return (levels[0] << (16 - depth)) | (levels[1] << (11 - depth)) | (levels[2] << (5 - depth))
+
+    def fill_rect(self, x, y, w, h, color):
+        """Rectángulo relleno de w x h píxeles con la esquina superior izquierda en (x, y)."""
+        mask = self._mask(x, w)
+        if mask:
+            self._paint([(row, mask) for row in range(max(y, 0), min(y + h, self.height))], color)
+
+    def hline(self, x, y, w, color):
+        """Línea horizontal de w píxeles desde (x, y)."""
+        self.fill_rect(x, y, w, 1, color)
+
+    def vline(self, x, y, h, color):
+        """Línea vertical de h píxeles desde (x, y)."""
+        self.fill_rect(x, y, 1, h, color)
+
+    def draw_rectangle(self, x0, y0, x1, y1, color, filled=False):
+        """Rectángulo entre dos esquinas (incluidas), como en el driver ST7789."""
+        if x0 > x1:
+            x0, x1 = x1, x0
+        if y0 > y1:
+            y0, y1 = y1, y0
+        w = x1 - x0 + 1
+        h = y1 - y0 + 1
+        if filled:
+            self.fill_rect(x0, y0, w, h, color)
+            return
+        self.hline(x0, y0, w, color)
+        self.hline(x0, y1, w, color)
+        self.vline(x0, y0, h, color)
+        self.vline(x1, y0, h, color)
+
+    def draw_line(self, x0, y0, x1, y1, color):
+        """Línea con Bresenham; los píxeles seguidos de una misma fila se pintan como un tramo."""
+        if y0 == y1:
+            self.hline(min(x0, x1), y0, abs(x1 - x0) + 1, color)
+            return
+        if x0 == x1:
+            self.vline(x0, min(y0, y1), abs(y1 - y0) + 1, color)
+            return
+        dx = abs(x1 - x0)
+        dy = -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx + dy
+        x = start = x0
+        y = y0
+        while x != x1 or y != y1:
+            e2 = 2 * err
+            nx = x
+            ny = y
+            if e2 >= dy:
+                err += dy
+                nx += sx
+            if e2 <= dx:
+                err += dx
+                ny += sy
+            if ny != y:
+                self.hline(min(start, x), y, abs(x - start) + 1, color)
+                start = nx
+            x = nx
+            y = ny
+        self.hline(min(start, x), y, abs(x - start) + 1, color)
+
+    def blit(self, src, x, y, key=None):
+        """
+        Copia otro FrameBuffer (de la misma profundidad) con su esquina en (x, y).
+        :param key: Color RGB565 de src que se trata como transparente, o None.
+        """
+        if src.depth != self.depth:
+            raise ValueError("Los dos framebuffers deben tener la misma profundidad")
+        box = self._mask(x, src.width)
+        if not box:
+            return
+        full = self._full
+        shift = self.width - x - src.width
+        key_targets = src._targets(key) if key is not None else None
+        for sy in range(max(-y, 0), min(src.height, self.height - y)):
+            ty = y + sy
+            mask = box
+            if key_targets is not None:
+                # Máscara de los píxeles de src cuyo color no es el transparente
+                opaque = 0
+                for rows, on in key_targets:
+                    opaque |= rows[sy] ^ (src._full if on else 0)
+                mask &= opaque << shift if shift >= 0 else opaque >> -shift
+                if not mask:
+                    continue
+            keep = full ^ mask
+            for channel, src_channel in zip(self.planes, src.planes):
+                for rows, src_rows in zip(channel, src_channel):
+                    bits = src_rows[sy]
+                    bits = bits << shift if shift >= 0 else bits >> -shift
+                    rows[ty] = (rows[ty] & keep) | (bits & mask)
+
+    def _stamp(self, bitmap, width, x, y, color, bg_color=None):
+        """
+        Pinta un bitmap de 1 bit (un entero de `width` bits por fila, el más
+        significativo a la izquierda): los unos con color y, si bg_color no es
+        None, los ceros con bg_color.
+        """
+        box = self._mask(x, width)
+        if not box:
+            return
+        shift = self.width - x - width
+        lines = []
+        for i, bits in enumerate(bitmap):
+            row = y + i
+            if 0 <= row < self.height:
+                lines.append((row, (bits << shift if shift >= 0 else bits >> -shift) & box))
+        self._paint(lines, color)
+        if bg_color is not None:
+            self._paint([(row, box ^ mask) for row, mask in lines], bg_color)
+
+    def text(self, x, y, text, color, bg_color=None):
+        """Texto con la fuente de 8x8 integrada, como en el driver ST7789 (bg_color None: fondo transparente)."""
+        for char in text:
+            self._stamp(font_8x8.get(char, EMPTY_GLYPH), 8, x, y, color, bg_color)
+            x += 8
+
+    def draw_text(self, x, y, string, color, font, scale=1, bg_color=None):
+        """
+        Texto con una fuente empaquetada (ver fonts.Font), ampliada `scale` veces.
+        :return: Coordenada x siguiente al texto.
+        """
+        height = font.height
+        for char in string:
+            glyph = font.glyph(char) or font.glyph("?")
+            if glyph is None:
+                continue
+            width, bitmap = glyph
+            row_bytes = (width + 7) >> 3
+            pad = row_bytes * 8 - width
+            rows = []
+            for r in range(height):
+                bits = int.from_bytes(bitmap[r * row_bytes:(r + 1) * row_bytes], "big") >> pad
+                if scale > 1:
+                    # Repetir cada columna `scale` veces
+                    wide = 0
+                    for col in range(width - 1, -1, -1):
+                        wide = (wide << scale) | (((1 << scale) - 1) if (bits >> col) & 1 else 0)
+                    bits = wide
+                for _ in range(scale):
+                    rows.append(bits)
+            self._stamp(rows, width * scale, x, y, color, bg_color)
+            x += width * scale
+        return x
+
+
+class RowAddress:
+    """
+    Selección de fila con tablas precalculadas para multiplexado 1/16 o 1/32.
+
+    Con Pin.value() solo se escriben las líneas que cambian respecto a la fila
+    anterior cuando las filas se recorren en orden. En el RP2040, si se indican
+    los números de GPIO, la dirección se escribe de una vez en los registros de
+    salida del puerto (una escritura para poner a 0 y otra para poner a 1).
+    """
+
+    def __init__(self, lines, scan_rows=32, gpios=None):
+        """
+        :param lines: Pines de dirección en orden A, B, C, D[, E].
+        :param scan_rows: Filas multiplexadas (16 o 32).
+        :param gpios: Números de GPIO de las líneas, para la escritura de puerto.
+        """
+        if scan_rows > (1 << len(lines)):
+            raise ValueError("No hay suficientes líneas de dirección para el multiplexado")
+        self.scan_rows = scan_rows
+        self._next = None  # Fila que se espera a continuación
+
+        values = [line.value for line in lines]
+        # Tabla completa: valor de cada línea para cada fila
+        self._full = [tuple((values[bit], (row >> bit) & 1) for bit in range(len(values)))
+                      for row in range(scan_rows)]
+        # Tabla de cambios: solo las líneas que difieren de la fila anterior
+        self._delta = []
+        for row in range(scan_rows):
+            changed = row ^ ((row - 1) % scan_rows)
+            self._delta.append(tuple((values[bit], (row >> bit) & 1)
+                                     for bit in range(len(values)) if changed & (1 << bit)))
+
+        self._mem32 = None
+        if gpios is not None:
+            import sys
+            if sys.platform == "rp2":
+                from machine import mem32
+                self._mem32 = mem32
+                mask = 0
+                for gpio in gpios:
+                    mask |= 1 << gpio
+                self._set = []
+                self._clr = []
+                for row in range(scan_rows):
+                    bits = 0
+                    for bit, gpio in enumerate(gpios):
+                        if (row >> bit) & 1:
+                            bits |= 1 << gpio
+                    self._set.append(bits)
+                    self._clr.append(mask & ~bits)
+
+    def select(self, row):
+        """Pone en las líneas de dirección el número de fila."""
+        mem32 = self._mem32
+        if mem32 is not None:
+            mem32[_RP2_GPIO_OUT_CLR] = self._clr[row]
+            mem32[_RP2_GPIO_OUT_SET] = self._set[row]
+            return
+
+        for write, value in (self._delta[row] if row == self._next else self._full[row]):
+            write(value)
+        self._next = row + 1 if row + 1 < self.scan_rows else 0
+
+
+class PinBackend:
+    """
+    Salida por software: cada columna se escribe con Pin.value() y un pulso de
+    CLK. Funciona en cualquier placa.
+    """
+
+    def __init__(self, pins, address=None):
+        """
+        :param pins: Diccionario de pines con las claves R1, G1, B1, R2, G2, B2,
+                     CLK, LAT, OE, A, B, C, D, E.
+        :param address: RowAddress a usar; por defecto uno 1/32 sobre los pines A-E.
+        """
+        self.pins = pins
+        self._clk = pins["CLK"].value
+        self._lat = pins["LAT"].value
+        self._oe = pins["OE"].value
+        if address is None:
+            address = RowAddress([pins[name] for name in ADDRESS_PINS], SCAN_ROWS)
+        self.select_row = address.select  # select_row(row) de la interfaz de backend
+        self._active = []
+
+    def prepare(self, states):
+        """Convierte una secuencia de estados al formato que consume shift()."""
+        return states
+
+    def configure(self, used):
+        """Prepara los pines de color; `used` es la OR de todos los estados del frame."""
+        # Solo se escriben en el bucle los pines que algún píxel usa
+        self._active = []
+        for bit, name in enumerate(COLOR_PINS):
+            if used & (1 << bit):
+                self._active.append((self.pins[name].value, bit))
+            else:
+                self.pins[name].value(0)
+
+    def blank(self):
+        """Apaga la salida (OE en alto)."""
+        self._oe(1)
+
+    def shift(self, states):
+        """Desplaza las 64 columnas de una pareja de filas en los registros del panel."""
+        clk = self._clk
+        active = self._active
+        if len(active) == 2:
+            # Caso habitual (un solo color): dos pines por columna
+            (p0, b0), (p1, b1) = active
+            for s in states:
+                p0((s >> b0) & 1)
+                p1((s >> b1) & 1)
+                clk(1)
+                clk(0)
+        else:
+            for s in states:
+                for pin, bit in active:
+                    pin((s >> bit) & 1)
+                clk(1)
+                clk(0)
+
+    def latch(self):
+        """Pulso de LAT: pasa los registros de desplazamiento a la salida."""
+        self._lat(1)
+        self._lat(0)
+
+    def show(self, on_time_us):
+        """Enciende la salida durante on_time_us microsegundos."""
+        self._oe(0)
+        utime.sleep_us(on_time_us)
+
+    def idle(self, off_time_us):
+        """Mantiene la salida apagada off_time_us microsegundos."""
+        self._oe(1)
+        utime.sleep_us(off_time_us)
+
+
+class PioBackend(PinBackend):
+    """
+    Salida con una máquina de estados PIO del RP2040: cada fila se entrega con
+    una sola llamada a StateMachine.put() y la PIO genera los datos y el CLK.
+    Al terminar la última columna la PIO deja una palabra en el FIFO de
+    entrada, y shift() la espera antes de volver, así que el latch nunca llega
+    antes del último flanco de CLK.
+    Requiere que R1, G1, B1, R2, G2, B2 estén en GPIO consecutivos y en ese
+    orden (R1 el más bajo), como en WIRING_PIO. LAT, OE y la dirección siguen
+    siendo Pin normales.
+    """
+
+    def __init__(self, pins, wiring, address=None, sm_id=0, freq=30_000_000):
+        """
+        :param pins: Diccionario de pines como en PinBackend.
+        :param wiring: Diccionario señal -> número de GPIO de esos pines (ver WIRING_PIO).
+        :param address: RowAddress a usar, como en PinBackend.
+        :param sm_id: Número de máquina de estados PIO.
+        :param freq: Frecuencia de la máquina de estados (tres ciclos por columna).
+        """
+        # out(pins, 6) escribe seis GPIO seguidos a partir de out_base
+        first = wiring["R1"]
+        if [wiring[name] for name in COLOR_PINS] != list(range(first, first + len(COLOR_PINS))):
+            raise ValueError("PioBackend necesita R1, G1, B1, R2, G2 y B2 en GPIO consecutivos "
+                             "y en ese orden (ver WIRING_PIO).")
+
+        import rp2
+
+        super().__init__(pins, address)
+
+        @rp2.asm_pio(out_init=(rp2.PIO.OUT_LOW,) * 6, sideset_init=rp2.PIO.OUT_LOW,
+                     out_shiftdir=rp2.PIO.SHIFT_RIGHT, autopull=True, pull_thresh=32)
+        def shift_program():
+            out(x, 32).side(0)     # Primera palabra de la fila: columnas - 1
+            label("column")
+            out(pins, 6).side(0)   # Datos de color con CLK en bajo
+            out(null, 26).side(1)  # Flanco de subida de CLK; descarta el resto de la palabra
+            jmp(x_dec, "column").side(1)
+            push(block).side(0)    # Fila desplazada: avisar a la CPU
+
+        self._sm = rp2.StateMachine(sm_id, shift_program, freq=freq,
+                                    out_base=pins["R1"], sideset_base=pins["CLK"])
+        self._sm.active(1)
+
+    def prepare(self, states):
+        # Una palabra del FIFO por columna, precedida del número de columnas - 1
+        words = array("I", bytes(4 * (len(states) + 1)))
+        words[0] = len(states) - 1
+        for col, s in enumerate(states):
+            words[col + 1] = s
+        return words
+
+    def configure(self, used):
+        # La PIO escribe siempre los seis pines de color
+        pass
+
+    def shift(self, states):
+        sm = self._sm
+        sm.put(states)
+        sm.get()  # Esperar a que la PIO haya dado el último flanco de CLK antes del latch
+
+
+class SimBackend:
+    """
+    Backend simulado para pruebas y medidas en un PC: no toca hardware y
+    registra la forma de onda a nivel de protocolo (fila, desplazamiento,
+    latch y tiempo encendido).
+    """
+
+    def __init__(self, record=True):
+        """
+        :param record: Si es False solo se cuentan las operaciones, sin guardar eventos.
+        """
+        self.record = record
+        self.events = []
+        self.handoffs = 0  # Llamadas a shift() (una por fila y plano)
+        self.on_time_us = 0  # Tiempo total con la salida encendida
+        self.off_time_us = 0  # Tiempo total de espera con la salida apagada
+        self._clock_us = 0  # Reloj simulado (ver ticks_us); reset() no lo borra
+        self.row = 0
+        self._shifted = None
+        self._latched = None
+        self._output = {}  # fila -> lista de (estados, microsegundos)
+
+    def prepare(self, states):
+        return states
+
+    def configure(self, used):
+        if self.record:
+            self.events.append(("configure", used))
+
+    def blank(self):
+        if self.record:
+            self.events.append(("oe", 1))
+
+    def select_row(self, row):
+        self.row = row
+        if self.record:
+            self.events.append(("row", row))
+
+    def shift(self, states):
+        self.handoffs += 1
+        self._shifted = states
+        if self.record:
+            self.events.append(("shift", states))
+
+    def latch(self):
+        self._latched = self._shifted
+        if self.record:
+            self.events.append(("lat",))
+
+    def show(self, on_time_us):
+        self.on_time_us += on_time_us
+        self._clock_us += on_time_us
+        if self.record:
+            self.events.append(("oe", 0, on_time_us))
+            self._output.setdefault(self.row, []).append((self._latched, on_time_us))
+
+    def idle(self, off_time_us):
+        self.off_time_us += off_time_us
+        self._clock_us += off_time_us
+        if self.record:
+            self.events.append(("oe", 1, off_time_us))
+
+    def ticks_us(self):
+        """
+        Reloj simulado en µs: el tiempo encendido y de espera acumulado. Sirve
+        de reloj al RefreshTimer, porque en un PC desplazar no cuesta tiempo.
+        """
+        return self._clock_us
+
+    def image(self):
+        """
+        Reconstruye lo que se vio: una lista de 64 filas con 64 tuplas (r, g, b)
+        con el tiempo encendido (µs) de cada canal en cada píxel.
+        """
+        image = [[(0, 0, 0)] * COLS for _ in range(ROWS)]
+        for row, shown in self._output.items():
+            for states, us in shown:
+                if states is None:
+                    continue
+                for col in range(COLS):
+                    s = states[col]
+                    for half, base in ((row, 0), (row + SCAN_ROWS, 3)):
+                        r, g, b = image[half][col]
+                        image[half][col] = (r + ((s >> base) & 1) * us,
+                                            g + ((s >> (base + 1)) & 1) * us,
+                                            b + ((s >> (base + 2)) & 1) * us)
+        return image
+
+    def reset(self):
+        """Borra los eventos y contadores registrados."""
+        self.events = []
+        self.handoffs = 0
+        self.on_time_us = 0
+        self.off_time_us = 0
+        self._output = {}
+
+
+class RefreshTimer:
+    """
+    Control de tiempos para un número de frames por segundo y un brillo fijos.
+
+    Mide con ticks_us lo que tarda de verdad cada frame en desplazar las filas
+    (todo lo que no es tiempo encendido ni espera) y reparte el resto del
+    periodo 1 / fps entre tiempo encendido y apagado. El brillo es la fracción
+    del periodo con OE activo, así que ni los fps ni el brillo dependen de la
+    frecuencia de la CPU ni del backend. Si el desplazamiento no cabe en el
+    periodo con ese brillo, se alarga el periodo (limited pasa a True) en lugar
+    de bajar el brillo.
+    """
+
+    MAX_BRIGHTNESS = 0.9  # Siempre queda algo de tiempo apagado para desplazar filas
+
+    def __init__(self, fps=120, brightness=0.5, smoothing=8, ticks_us=None):
+        """
+        :param fps: Frames por segundo objetivo.
+        :param brightness: Fracción del periodo con la salida encendida (0 a MAX_BRIGHTNESS).
+        :param smoothing: Frames de la media móvil del tiempo de desplazamiento.
+        :param ticks_us: Reloj en µs (creciente, sin desbordamiento) que sustituye
+                         a utime.ticks_us, por ejemplo SimBackend.ticks_us.
+        """
+        if ticks_us is None:
+            self._ticks_us = utime.ticks_us
+            self._ticks_diff = utime.ticks_diff
+        else:
+            self._ticks_us = ticks_us
+            self._ticks_diff = lambda a, b: a - b
+        self.fps = fps
+        self.brightness = brightness
+        self.smoothing = smoothing
+        self.overhead_us = 0  # Media móvil del tiempo de frame que no es encendido ni espera
+        self.on_unit_us = 0  # Tiempo encendido de una fila de peso 1 en el último frame
+        self.limited = False  # True si el último frame no cabía en el periodo objetivo
+        self.reset_stats()
+
+    @property
+    def brightness(self):
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, value):
+        self._brightness = min(max(value, 0), self.MAX_BRIGHTNESS)
+
+    def reset_stats(self):
+        """Borra las estadísticas de fps y jitter."""
+        self.frames = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._last_start = None
+
+    def begin(self, units):
+        """
+        Empieza un frame de `units` unidades: todas las parejas de filas de todos
+        los planos, estén apagadas o no (una fila del plano n cuenta 2 ** n).
+        Devuelve (encendido, apagado) en µs por unidad.
+        """
+        now = self._ticks_us()
+        if self._last_start is not None:
+            # Periodo real entre frames, con media y varianza acumuladas (Welford)
+            period = self._ticks_diff(now, self._last_start)
+            self.frames += 1
+            delta = period - self._mean
+            self._mean += delta / self.frames
+            self._m2 += delta * (period - self._mean)
+        self._last_start = now
+
+        if units == 0:
+            self._planned = 0
+            return 0, 0
+        period = 1_000_000 / self.fps
+        on = period * self._brightness
+        off = period - self.overhead_us - on
+        self.limited = off < 0
+        if self.limited:
+            # Alargar el periodo lo justo para mantener el ciclo de OE pedido
+            on = self.overhead_us * self._brightness / (1 - self._brightness)
+            off = 0
+        on_unit = int(on / units)
+        off_unit = int(off / units)
+        self.on_unit_us = on_unit
+        self._planned = (on_unit + off_unit) * units
+        return on_unit, off_unit
+
+    def end(self):
+        """Termina el frame empezado con begin() y actualiza el tiempo de desplazamiento."""
+        elapsed = self._ticks_diff(self._ticks_us(), self._last_start)
+        overhead = max(elapsed - self._planned, 0)
+        self.overhead_us += (overhead - self.overhead_us) / self.smoothing
+
+    def report(self):
+        """
+        Devuelve un diccionario con los fps conseguidos, el jitter (desviación
+        típica del periodo de frame, µs), el tiempo de desplazamiento por frame,
+        el tiempo encendido por unidad y si el objetivo no se alcanza.
+        """
+        jitter = (self._m2 / self.frames) ** 0.5 if self.frames else 0
+        return {
+            "fps": 1_000_000 / self._mean if self._mean else 0,
+            "jitter_us": jitter,
+            "overhead_us": self.overhead_us,
+            "on_unit_us": self.on_unit_us,
+            "limited": self.limited,
+        }
+
+
+class ScanEngine:
+    """Refresca un frame precalculado a través de un backend de salida HUB75."""
+
+    def __init__(self, pins=None, on_time_us=100, backend=None, skip_rows=True, timer=None):
+        """
+        :param pins: Diccionario de pines (ver PinBackend). Se ignora si se pasa backend.
+        :param on_time_us: Tiempo que cada fila permanece encendida. En modo BCM
+                           es el tiempo del plano menos significativo.
+        :param backend: PinBackend, PioBackend, SimBackend u otro con la misma interfaz.
+        :param skip_rows: Saltar las parejas de filas apagadas y no volver a
+                          desplazar las que repiten el contenido ya latcheado.
+                          Al saltar filas el frame dura menos, así que el brillo
+                          y los fps dependen del contenido; con False cada fila
+                          ocupa siempre su tiempo. Con timer, las filas saltadas
+                          esperan apagadas su tiempo y el brillo no cambia.
+        :param timer: RefreshTimer que fija los tiempos para unos fps y un brillo
+                      dados; sin él cada fila se enciende on_time_us.
+        """
+        self.backend = backend if backend is not None else PinBackend(pins)
+        self.on_time_us = on_time_us
+        self.skip_rows = skip_rows
+        self.timer = timer
+        self.planes = []  # Un plano por bit de color; cada uno con 32 filas preparadas
+        self._used = 0  # OR de los estados cargados (pines de color que se usan)
+        self._prepared = {}  # Estados -> secuencia preparada, una sola por contenido
+        self._blank = None  # Secuencia preparada de una pareja de filas apagada
+        self._empty = b""  # Estados de una pareja de filas apagada (la clave de _blank)
+        self._latched = None  # Secuencia que hay en los registros del panel
+        self._units = 0  # Filas de peso 1 de un frame, apagadas o no (para el RefreshTimer)
+        # Estadísticas del último refresh()
+        self.shifted = 0  # Filas (por plano) desplazadas y latcheadas
+        self.reused = 0  # Filas mostradas con el contenido ya latcheado
+        self.skipped = 0  # Filas apagadas que no se muestran
+
+    def load(self, frame, color=RED):
+        """
+        Precalcula las secuencias de pines de un frame empaquetado de 64 filas
+        (o de 32 en un panel 1/16: una pareja por cada dos filas).
+        """
+        half = len(frame) // 2
+        self._set_planes([[row_pair_states(frame[row], frame[row + half], color)
+                           for row in range(half)]])
+
+    def load_rgb(self, pixels, depth=4):
+        """Carga un frame RGB888 de 64x64 con `depth` bits por canal (BCM)."""
+        self._set_planes(rgb_bitplanes(pixels, depth))
+
+    def load_canvas(self, layout, red, green=None, blue=None):
+        """
+        Carga un lienzo de varios paneles (ver PanelLayout.row_states): un plano
+        de bits por canal, o None para un canal apagado.
+        """
+        self._set_planes([layout.row_states(red, green, blue)])
+
+    def load_framebuffer(self, framebuffer, layout=None):
+        """
+        Carga un FrameBuffer, con un plano BCM por bit de color.
+        :param layout: PanelLayout del lienzo; None para un solo panel de 64x64.
+        """
+        if layout is None:
+            layout = PanelLayout()
+        if framebuffer.width != layout.width or framebuffer.height != layout.height:
+            raise ValueError("El framebuffer no tiene el tamaño del lienzo")
+        planes = []
+        for bit in range(framebuffer.depth):
+            channels = [channel[bit] if any(channel[bit]) else None for channel in framebuffer.planes]
+            planes.append(layout.row_states(*channels))
+        self._set_planes(planes)
+
+    def prepare_frame(self, frame, color=RED):
+        """
+        Prepara un frame empaquetado como load(), pero sin mostrarlo: devuelve
+        el buffer que swap() pone en pantalla. Así un núcleo puede preparar el
+        siguiente frame completo mientras el otro refresca el actual.
+        """
+        half = len(frame) // 2
+        if len(self._prepared) > 4 * half:
+            # Olvidar los contenidos que ya no están en pantalla
+            in_use = set(id(states) for rows in self.planes for states in rows)
+            self._prepared = {key: value for key, value in self._prepared.items() if id(value) in in_use}
+        return self._prepare_planes([[row_pair_states(frame[row], frame[row + half], color)
+                                      for row in range(half)]])
+
+    def swap(self, buffer):
+        """
+        Muestra a partir del siguiente refresh() un buffer de prepare_frame().
+        Solo cambia referencias (y los pines de color si el frame usa alguno
+        nuevo), así que no alarga el frame en el núcleo que refresca.
+        """
+        planes, blank, used = buffer
+        used |= self._used
+        if used != self._used:
+            self._used = used
+            self.backend.configure(used)
+        self.planes = planes
+        self._blank = blank
+        # Todas las filas cuentan, también las que se saltan: el tiempo encendido
+        # por unidad no puede depender de cuántas filas tienen algo encendido
+        self._units = len(planes[0]) * ((1 << len(planes)) - 1) if planes else 0
+
+    def _set_planes(self, planes):
+        self._prepared = {}
+        self._empty = bytes(len(planes[0][0])) if planes and planes[0] else b""
+        buffer = self._prepare_planes(planes)
+        self._used = buffer[2]
+        self.backend.configure(self._used)
+        self.swap(buffer)
+
+    def _prepare_planes(self, planes):
+        # Las filas con el mismo contenido comparten la secuencia preparada: así
+        # refresh() reconoce las filas apagadas o repetidas comparando identidad
+        used = 0
+        for rows in planes:
+            for states in rows:
+                for s in states:
+                    used |= s
+        prepared = [[self._prepare(states) for states in rows] for rows in planes]
+        empty = bytes(len(planes[0][0])) if planes and planes[0] else b""
+        return prepared, self._prepared.get(empty), used
+
+    def _prepare(self, states):
+        prepared = self._prepared.get(states)
+        if prepared is None:
+            prepared = self._prepared[states] = self.backend.prepare(states)
+        return prepared
+
+    def update_rows(self, changed):
+        """
+        Sustituye algunas parejas de filas de un frame cargado con load(), sin
+        recalcular las demás.
+        :param changed: Lista de (pareja, estados) con los estados de row_pair_states().
+        """
+        rows = self.planes[0]
+        used = self._used
+        for pair, states in changed:
+            for s in states:
+                used |= s
+            rows[pair] = self._prepare(states)
+        if used != self._used:
+            # Algún píxel nuevo usa un pin de color que el frame anterior no usaba
+            self._used = used
+            self.backend.configure(used)
+        if len(self._prepared) > 2 * SCAN_ROWS:
+            # En una animación larga, olvidar los contenidos que ya no se usan
+            in_use = set(id(states) for states in rows)
+            self._prepared = {key: value for key, value in self._prepared.items() if id(value) in in_use}
+        self._blank = self._prepared.get(self._empty)
+
+    def refresh(self):
+        """
+        Muestra el frame cargado una vez (todas las filas). Cada plano de bits
+        permanece encendido on_time_us multiplicado por su peso binario.
+
+        Con skip_rows, las filas apagadas no se desplazan ni se muestran, y una
+        fila igual a la que ya está en los registros del panel solo cambia de
+        dirección y se muestra. Las cuentas quedan en shifted, reused y skipped.
+
+        Con timer, los tiempos encendido y apagado de cada fila los calcula el
+        RefreshTimer a partir de lo que tardaron los frames anteriores, y una
+        fila saltada espera apagada lo que habría durado.
+        """
+        backend = self.backend
+        blank = backend.blank
+        select_row = backend.select_row
+        shift = backend.shift
+        latch = backend.latch
+        show = backend.show
+        idle = backend.idle
+        timer = self.timer
+        if timer is None:
+            on_time_us = self.on_time_us
+            off_time_us = 0
+            skip_us = 0
+        else:
+            on_time_us, off_time_us = timer.begin(self._units)
+            skip_us = on_time_us + off_time_us
+        planes = self.planes
+        if not self.skip_rows:
+            for row in range(len(planes[0]) if planes else 0):
+                weight = 0
+                for rows in planes:
+                    blank()  # Apaga la salida mientras se configura la fila
+                    if weight == 0:
+                        select_row(row)
+                    shift(rows[row])
+                    latch()
+                    show(on_time_us << weight)
+                    if off_time_us:
+                        idle(off_time_us << weight)
+                    weight += 1
+            self.shifted = len(planes) * (len(planes[0]) if planes else 0)
+            self.reused = self.skipped = 0
+            self._latched = None
+            if timer is not None:
+                timer.end()
+            return
+
+        empty = self._blank
+        latched = self._latched
+        lit = False  # Si la salida está encendida
+        reused = 0
+        skipped = 0
+        total = 0
+        for row in range(len(planes[0]) if planes else 0):
+            weight = 0
+            selected = False
+            for rows in planes:
+                states = rows[row]
+                total += 1
+                if states is empty:
+                    skipped += 1
+                    if skip_us:
+                        idle(skip_us << weight)  # Mantiene el periodo del frame
+                        lit = False
+                    elif lit:
+                        blank()
+                        lit = False
+                else:
+                    blank()  # Apaga la salida mientras se configura la fila
+                    if not selected:
+                        select_row(row)
+                        selected = True
+                    if states is latched:
+                        reused += 1
+                    else:
+                        shift(states)
+                        latch()
+                        latched = states
+                    show(on_time_us << weight)
+                    lit = True
+                    if off_time_us:
+                        idle(off_time_us << weight)
+                        lit = False
+                weight += 1
+        self._latched = latched
+        self.shifted = total - reused - skipped
+        self.reused = reused
+        self.skipped = skipped
+        if timer is not None:
+            timer.end()
+
+
+class Animation:
+    """
+    Animación .anm leída del archivo frame a frame. En RAM solo están el frame
+    actual (64 palabras) y el registro del siguiente (como mucho 522 bytes), así
+    que la duración de la animación no la limita la memoria.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        magic, version, self.color, self.count, _ = struct.unpack(
+            ANIM_HEADER, self._file.read(ANIM_HEADER_SIZE))
+        if magic != ANIM_MAGIC or version != ANIM_VERSION:
+            raise ValueError("El archivo no es una animación HUB75.")
+        if self.count == 0:
+            raise ValueError("La animación no tiene frames.")
+        self.frame = array("Q", [0] * ROWS)  # Frame actual, empaquetado como en pack_hex
+        self.index = -1  # Índice del frame actual
+        self._record = bytearray(ANIM_FRAME_SIZE + ROWS * 8)
+        self._view = memoryview(self._record)
+
+    def rewind(self):
+        """Vuelve al principio; el siguiente next() devuelve el primer frame."""
+        self._file.seek(ANIM_HEADER_SIZE)
+        frame = self.frame
+        for row in range(ROWS):
+            frame[row] = 0
+        self.index = -1
+
+    def next(self):
+        """
+        Aplica a self.frame el siguiente frame (tras el último vuelve al primero).
+        :return: (duración en ms, máscara de filas cambiadas con el bit 63 = fila 0).
+        """
+        lit = 0
+        if self.index + 1 >= self.count:
+            # Al volver al principio el primer frame se aplica sobre un frame
+            # apagado: las filas encendidas del último también cambian
+            frame = self.frame
+            for row in range(ROWS):
+                if frame[row]:
+                    lit |= 1 << (63 - row)
+            self.rewind()
+        record = self._record
+        view = self._view
+        if self._file.readinto(view[:ANIM_FRAME_SIZE]) != ANIM_FRAME_SIZE:
+            raise ValueError("Animación truncada.")
+        duration, changed = struct.unpack_from(ANIM_FRAME, record)
+        size = ANIM_FRAME_SIZE + bin(changed).count("1") * 8
+        if size > ANIM_FRAME_SIZE and self._file.readinto(view[ANIM_FRAME_SIZE:size]) != size - ANIM_FRAME_SIZE:
+            raise ValueError("Animación truncada.")
+
+        frame = self.frame
+        offset = ANIM_FRAME_SIZE
+        for row in range(ROWS):
+            if (changed >> (63 - row)) & 1:
+                frame[row] ^= struct.unpack_from(">Q", record, offset)[0]
+                offset += 8
+        self.index += 1
+        return duration, changed | lit
+
+    def close(self):
+        self._file.close()
+
+
+class AnimationPlayer:
+    """
+    Reproduce una Animation en un ScanEngine. El cambio de frame se hace entre
+    dos refrescos completos, cuando se cumple la duración del frame medida con
+    ticks_ms. Mientras se muestra un frame se lee el siguiente y se calculan
+    sus parejas de filas cambiadas, unas pocas después de cada refresco, de modo
+    que el cambio solo sustituye las parejas ya preparadas y no alarga ninguna
+    fila.
+    """
+
+    def __init__(self, engine, animation, pairs_per_refresh=4, ticks_ms=None):
+        """
+        :param engine: ScanEngine en el que se muestra.
+        :param animation: Animation a reproducir.
+        :param pairs_per_refresh: Parejas de filas del siguiente frame que se
+                                  preparan después de cada refresco.
+        :param ticks_ms: Reloj en ms (creciente, sin desbordamiento) que sustituye
+                         a utime.ticks_ms, por ejemplo el tiempo encendido de un
+                         SimBackend para reproducir en un PC.
+        """
+        if ticks_ms is None:
+            self._ticks_ms = utime.ticks_ms
+            self._ticks_diff = utime.ticks_diff
+            self._ticks_add = utime.ticks_add
+        else:
+            self._ticks_ms = ticks_ms
+            self._ticks_diff = lambda a, b: a - b
+            self._ticks_add = lambda a, b: a + b
+        self.engine = engine
+        self.animation = animation
+        self.pairs_per_refresh = pairs_per_refresh
+        self.frames = 0  # Frames de la animación mostrados
+        self.late = 0  # Frames que no estaban preparados al cumplirse la duración del anterior
+
+    def play(self, loops=None):
+        """Reproduce la animación `loops` veces, o sin fin si es None."""
+        engine = self.engine
+        animation = self.animation
+        refresh = engine.refresh
+        frame = animation.frame
+        color = animation.color
+        per_refresh = self.pairs_per_refresh
+        ticks_ms = self._ticks_ms
+        ticks_diff = self._ticks_diff
+        ticks_add = self._ticks_add
+        remaining = None if loops is None else loops * animation.count
+
+        animation.rewind()
+        duration, _ = animation.next()
+        engine.load(frame, color)
+        started = ticks_ms()
+        while True:
+            self.frames += 1
+            if remaining is not None:
+                remaining -= 1
+            pending = []
+            if remaining != 0:
+                next_duration, changed = animation.next()
+                # Una pareja cambia si cambia su fila de arriba o la de abajo
+                pairs = (changed >> SCAN_ROWS | changed) & 0xFFFFFFFF
+                pending = [pair for pair in range(SCAN_ROWS) if (pairs >> (SCAN_ROWS - 1 - pair)) & 1]
+            staged = []
+
+            # Refrescar el frame actual (al menos una vez) hasta cumplir su duración
+            while True:
+                refresh()
+                n = per_refresh
+                while pending and n:
+                    pair = pending.pop()
+                    staged.append((pair, row_pair_states(frame[pair], frame[pair + SCAN_ROWS], color)))
+                    n -= 1
+                if ticks_diff(ticks_ms(), started) >= duration:
+                    break
+            if remaining == 0:
+                return
+
+            if pending:
+                self.late += 1
+                for pair in pending:
+                    staged.append((pair, row_pair_states(frame[pair], frame[pair + SCAN_ROWS], color)))
+            engine.update_rows(staged)
+            # El siguiente frame se programa desde el cambio previsto, no desde el
+            # real, para que los retrasos de un refresco no se acumulen
+            started = ticks_add(started, duration)
+            if ticks_diff(ticks_ms(), started) > next_duration:
+                started = ticks_ms()  # Demasiado retraso: volver a sincronizar
+            duration = next_duration
+
+
+# Conexionados conocidos: número de GPIO de cada señal del conector HUB75
+WIRING_RGB = {  # enfin.py, matrix64x64micropython.py
+    "R1": 2, "G1": 3, "B1": 4, "R2": 5, "G2": 8, "B2": 9,
+    "CLK": 11, "LAT": 12, "OE": 13,
+    "A": 10, "B": 16, "C": 18, "D": 20, "E": 22,
+}
+WIRING_GBR = {  # pruebaRGB.py, intentoDEpatronBINARIO.py, lunes.py
+    "R1": 4, "G1": 2, "B1": 3, "R2": 9, "G2": 5, "B2": 8,
+    "CLK": 11, "LAT": 12, "OE": 13,
+    "A": 10, "B": 16, "C": 18, "D": 20, "E": 22,
+}
+WIRING_PIO = {  # Como WIRING_RGB con G2 y B2 en GPIO 6 y 7, para backend="pio"
+    "R1": 2, "G1": 3, "B1": 4, "R2": 5, "G2": 6, "B2": 7,
+    "CLK": 11, "LAT": 12, "OE": 13,
+    "A": 10, "B": 16, "C": 18, "D": 20, "E": 22,
+}
+
+
+class HUB75:
+    """
+    Matriz HUB75 de 64x64 lista para usar. El constructor solo guarda la
+    configuración; init() crea los pines, la dirección de fila, el backend y el
+    ScanEngine (y cambia la frecuencia de la CPU, si se pide).
+
+        panel = HUB75(WIRING_RGB, freq=280_000_000)
+        panel.init()
+        panel.load(pack_hex(hex_data), RED)
+        panel.run()         # o panel.play("/anim.anm") para una animación
+
+    Con layout se manejan varios paneles encadenados como un lienzo de
+    layout.width x layout.height; load() recibe entonces un frame de ese tamaño
+    (layout.height enteros de layout.width bits).
+    """
+
+    def __init__(self, wiring=WIRING_RGB, on_time_us=100, backend="pin", freq=None, skip_rows=True,
+                 fps=None, brightness=0.5, layout=None):
+        """
+        :param wiring: Diccionario señal -> número de GPIO (ver WIRING_RGB).
+        :param on_time_us: Tiempo encendido de cada fila (del plano menos significativo en BCM).
+        :param backend: "pin", "pio" (colores en GPIO consecutivos, ver WIRING_PIO) o un
+                        backend ya creado (por ejemplo SimBackend()).
+        :param freq: Frecuencia de la CPU a fijar en init(), o None para no cambiarla.
+        :param skip_rows: Saltar las filas apagadas y las ya latcheadas (ver ScanEngine).
+        :param fps: Frames por segundo objetivo. Si se indica, on_time_us no se usa y
+                    los tiempos los fija un RefreshTimer con este brillo.
+        :param brightness: Fracción del periodo de frame con la salida encendida.
+        :param layout: PanelLayout con los paneles encadenados, o None para un solo panel.
+        """
+        self.wiring = wiring
+        self.on_time_us = on_time_us
+        self.backend = backend
+        self.freq = freq
+        self.skip_rows = skip_rows
+        self.fps = fps
+        self.brightness = brightness
+        self.layout = layout
+        self.width = layout.width if layout is not None else COLS
+        self.height = layout.height if layout is not None else ROWS
+        self.pins = None
+        self.engine = None
+
+    def init(self):
+        """Configura la CPU y los pines y crea el motor de refresco (solo la primera vez)."""
+        if self.engine is not None:
+            return
+        backend = self.backend
+        if isinstance(backend, str):
+            import machine
+            if self.freq:
+                machine.freq(self.freq)
+            self.pins = {name: machine.Pin(gpio, machine.Pin.OUT) for name, gpio in self.wiring.items()}
+            address = RowAddress([self.pins[name] for name in ADDRESS_PINS], SCAN_ROWS,
+                                 gpios=[self.wiring[name] for name in ADDRESS_PINS])
+            if backend == "pio":
+                backend = PioBackend(self.pins, self.wiring, address)
+            elif backend == "pin":
+                backend = PinBackend(self.pins, address)
+            else:
+                raise ValueError("Backend desconocido: %s" % backend)
+        timer = None
+        if self.fps:
+            # En un PC el SimBackend no tarda nada: el timer mide su reloj simulado
+            ticks_us = backend.ticks_us if isinstance(backend, SimBackend) else None
+            timer = RefreshTimer(self.fps, self.brightness, ticks_us=ticks_us)
+        self.engine = ScanEngine(on_time_us=self.on_time_us, backend=backend, skip_rows=self.skip_rows,
+                                 timer=timer)
+
+    def load(self, frame, color=RED):
+        """Carga un frame empaquetado de 64 filas (ver pack_hex y pack_binary), o del lienzo con layout."""
+        if self.layout is None:
+            self.engine.load(frame, color)
+            return
+        self.engine.load_canvas(self.layout,
+                                frame if color & RED else None,
+                                frame if color & GREEN else None,
+                                frame if color & BLUE else None)
+
+    def load_canvas(self, red, green=None, blue=None):
+        """Carga un plano de bits por canal del tamaño del lienzo (ver PanelLayout.row_states)."""
+        self.engine.load_canvas(self.layout or PanelLayout(), red, green, blue)
+
+    def framebuffer(self, depth=1):
+        """Crea un FrameBuffer del tamaño del panel o del lienzo."""
+        return FrameBuffer(self.width, self.height, depth)
+
+    def load_framebuffer(self, framebuffer):
+        """Carga lo dibujado en un FrameBuffer (con depth > 1, en BCM)."""
+        self.engine.load_framebuffer(framebuffer, self.layout)
+
+    def load_rgb(self, pixels, depth=4):
+        """Carga un frame RGB888 de 64x64 con `depth` bits por canal (BCM)."""
+        self.engine.load_rgb(pixels, depth)
+
+    def refresh(self):
+        """Muestra el frame cargado una vez."""
+        self.engine.refresh()
+
+    def set_brightness(self, brightness):
+        """Cambia el brillo (fracción del periodo encendida); requiere fps."""
+        self.brightness = brightness
+        if self.engine is not None and self.engine.timer is not None:
+            self.engine.timer.brightness = brightness
+
+    def report(self):
+        """fps conseguidos y jitter (ver RefreshTimer.report), o None sin fps."""
+        timer = self.engine.timer
+        return timer.report() if timer is not None else None
+
+    def play(self, animation, loops=None, pairs_per_refresh=4, ticks_ms=None):
+        """
+        Reproduce una animación .anm (ruta o Animation) `loops` veces, o sin fin
+        si es None. Devuelve el AnimationPlayer usado (frames mostrados y tardíos).
+        """
+        opened = isinstance(animation, str)
+        if opened:
+            animation = Animation(animation)
+        player = AnimationPlayer(self.engine, animation, pairs_per_refresh, ticks_ms)
+        try:
+            player.play(loops)
+        finally:
+            if opened:
+                animation.close()
+        return player
+
+    def run(self, frames=None):
+        """Refresca el frame cargado `frames` veces, o sin fin si es None."""
+        refresh = self.engine.refresh
+        if frames is None:
+            while True:
+                refresh()
+        for _ in range(frames):
+            refresh()
@@ -0,0 +1,1360 @@
+"""
+Driver del LCD ST7789 de la ESP32-S3-GEEK (135x240, SPI).
+
+    from displays.st7789 import ST7789
+    lcd = ST7789()          # Solo guarda la configuración
+    lcd.init()              # Crea el SPI y los pines e inicializa el controlador
+    lcd.fill_screen(0x0000)
+    lcd.text(10, 20, "AB", 0xF800, 0x0000)
+
+Importar el módulo no toca el hardware. Display, Font y las conversiones de
+imagen no dependen de machine y se pueden usar también en un PC.
+"""
+import struct
+import time
+
+from .fonts import EMPTY_GLYPH, Font, font_8x8
+
+try:
+    import micropython
+except ImportError:  # Python de escritorio: se usan las versiones en Python puro
+    micropython = None
+
+
+class Display:
+    """
+    Geometría del display: tamaño visible, offsets dentro de la memoria del
+    controlador y valor de MADCTL de cada rotación (con y sin reflejo
+    horizontal), calculados una sola vez al crear el objeto.
+    """
+    MEMORY_WIDTH = 240  # Memoria del ST7789: 240 columnas x 320 filas
+    MEMORY_HEIGHT = 320
+    MADCTL = (0x00, 0x60, 0xC0, 0xA0)  # Rotaciones 0, 90, 180 y 270 grados
+
+    def __init__(self, width=135, height=240, offset_x=52, offset_y=40):
+        table = []
+        for madctl in self.MADCTL:
+            table.append(self._geometry(madctl, width, height, offset_x, offset_y))
+            # Reflejo horizontal: se invierte el eje de memoria que recorre x
+            flip = 0x80 if madctl & 0x20 else 0x40
+            table.append(self._geometry(madctl ^ flip, width, height, offset_x, offset_y))
+        self._table = tuple(table)
+        self.select(0)
+
+    def _geometry(self, madctl, width, height, offset_x, offset_y):
+        """Devuelve (madctl, ancho, alto, offset_x, offset_y) para un valor de MADCTL."""
+        # MX y MY invierten columnas y filas: el offset se cuenta desde el otro extremo
+        col = self.MEMORY_WIDTH - width - offset_x if madctl & 0x40 else offset_x
+        row = self.MEMORY_HEIGHT - height - offset_y if madctl & 0x80 else offset_y
+        if madctl & 0x20:  # MV intercambia filas y columnas
+            return (madctl, height, width, row, col)
+        return (madctl, width, height, col, row)
+
+    def select(self, rotation, mirror=False):
+        """Pasa a la geometría de una rotación (0 a 3), opcionalmente reflejada en horizontal."""
+        if rotation < 0 or rotation > 3:
+            raise ValueError("La rotación debe ser 0, 1, 2 o 3")
+        self.rotation = rotation
+        self.mirror = mirror
+        (self.madctl, self.width, self.height,
+         self.offset_x, self.offset_y) = self._table[rotation * 2 + (1 if mirror else 0)]
+
+    def clip(self, x0, y0, x1, y1):
+        """Recorta un rectángulo al área visible. Devuelve None si queda fuera."""
+        if x0 < 0:
+            x0 = 0
+        if y0 < 0:
+            y0 = 0
+        if x1 >= self.width:
+            x1 = self.width - 1
+        if y1 >= self.height:
+            y1 = self.height - 1
+        if x0 > x1 or y0 > y1:
+            return None
+        return x0, y0, x1, y1
+
+
+# Framebuffer opcional (RGB565): por encima de este número de rectángulos
+# modificados se fusionan en uno solo
+MAX_DIRTY_RECTS = 8
+
+# Pool de líneas de color: una línea del lado mayor del display por cada color
+# usado recientemente. Los tramos se envían como cortes (memoryview) de esas
+# líneas, así que dibujar en régimen estable no reserva memoria.
+SPAN_POOL_SIZE = 4
+SPAN_LINE_PIXELS = Display.MEMORY_HEIGHT
+
+AA_SUBSAMPLES = 4  # Sub-líneas de barrido por fila en el modo suavizado
+
+# Caché de glifos ya rasterizados en RGB565, con expulsión del menos usado (LRU)
+GLYPH_CACHE_SIZE = 32
+
+
+def gc_pressure(func, *args, **kwargs):
+    """
+    Ejecuta func(*args, **kwargs) con el GC desactivado y devuelve los bytes de
+    heap que reservó. Devuelve None si la plataforma no permite medirlo.
+    """
+    import gc
+    if not hasattr(gc, "mem_alloc"):
+        return None
+    gc.collect()
+    gc.disable()
+    try:
+        before = gc.mem_alloc()
+        func(*args, **kwargs)
+        return gc.mem_alloc() - before
+    finally:
+        gc.enable()
+
+
+def _blend565(fg, bg, alpha):
+    """Mezcla dos colores RGB565; alpha va de 0 (solo fondo) a 256 (solo frente)."""
+    inv = 256 - alpha
+    r = (((fg >> 11) & 0x1F) * alpha + ((bg >> 11) & 0x1F) * inv) >> 8
+    g = (((fg >> 5) & 0x3F) * alpha + ((bg >> 5) & 0x3F) * inv) >> 8
+    b = ((fg & 0x1F) * alpha + (bg & 0x1F) * inv) >> 8
+    return (r << 11) | (g << 5) | b
+
+
+def _sort_active(active, key):
+    """Ordena por inserción la lista de aristas activas (casi siempre ya está ordenada)."""
+    for i in range(1, len(active)):
+        edge = active[i]
+        j = i - 1
+        while j >= 0 and active[j][key] > edge[key]:
+            active[j + 1] = active[j]
+            j -= 1
+        active[j + 1] = edge
+
+
+# Tablas de conversión de 8 bits a 5 y 6 bits por canal con redondeo,
+# (v * 31 + 127) // 255 y (v * 63 + 127) // 255, escritas como constantes para
+# no calcularlas en cada arranque
+_TO5 = (
+    b"\x00\x00\x00\x00\x00\x01\x01\x01\x01\x01\x01\x01\x01\x02\x02\x02"
+    b"\x02\x02\x02\x02\x02\x03\x03\x03\x03\x03\x03\x03\x03\x04\x04\x04"
+    b"\x04\x04\x04\x04\x04\x04\x05\x05\x05\x05\x05\x05\x05\x05\x06\x06"
+    b"\x06\x06\x06\x06\x06\x06\x07\x07\x07\x07\x07\x07\x07\x07\x08\x08"
+    b"\x08\x08\x08\x08\x08\x08\x09\x09\x09\x09\x09\x09\x09\x09\x09\x0a"
+    b"\x0a\x0a\x0a\x0a\x0a\x0a\x0a\x0b\x0b\x0b\x0b\x0b\x0b\x0b\x0b\x0c"
+    b"\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0d\x0d\x0d\x0d\x0d\x0d\x0d\x0d\x0d"
+    b"\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f"
+    b"\x10\x10\x10\x10\x10\x10\x10\x10\x11\x11\x11\x11\x11\x11\x11\x11"
+    b"\x12\x12\x12\x12\x12\x12\x12\x12\x12\x13\x13\x13\x13\x13\x13\x13"
+    b"\x13\x14\x14\x14\x14\x14\x14\x14\x14\x15\x15\x15\x15\x15\x15\x15"
+    b"\x15\x16\x16\x16\x16\x16\x16\x16\x16\x16\x17\x17\x17\x17\x17\x17"
+    b"\x17\x17\x18\x18\x18\x18\x18\x18\x18\x18\x19\x19\x19\x19\x19\x19"
+    b"\x19\x19\x1a\x1a\x1a\x1a\x1a\x1a\x1a\x1a\x1b\x1b\x1b\x1b\x1b\x1b"
+    b"\x1b\x1b\x1b\x1c\x1c\x1c\x1c\x1c\x1c\x1c\x1c\x1d\x1d\x1d\x1d\x1d"
+    b"\x1d\x1d\x1d\x1e\x1e\x1e\x1e\x1e\x1e\x1e\x1e\x1f\x1f\x1f\x1f\x1f"
+)
+_TO6 = (
+    b"\x00\x00\x00\x01\x01\x01\x01\x02\x02\x02\x02\x03\x03\x03\x03\x04"
+    b"\x04\x04\x04\x05\x05\x05\x05\x06\x06\x06\x06\x07\x07\x07\x07\x08"
+    b"\x08\x08\x08\x09\x09\x09\x09\x0a\x0a\x0a\x0a\x0b\x0b\x0b\x0b\x0c"
+    b"\x0c\x0c\x0c\x0d\x0d\x0d\x0d\x0e\x0e\x0e\x0e\x0f\x0f\x0f\x0f\x10"
+    b"\x10\x10\x10\x11\x11\x11\x11\x12\x12\x12\x12\x13\x13\x13\x13\x14"
+    b"\x14\x14\x14\x15\x15\x15\x15\x15\x16\x16\x16\x16\x17\x17\x17\x17"
+    b"\x18\x18\x18\x18\x19\x19\x19\x19\x1a\x1a\x1a\x1a\x1b\x1b\x1b\x1b"
+    b"\x1c\x1c\x1c\x1c\x1d\x1d\x1d\x1d\x1e\x1e\x1e\x1e\x1f\x1f\x1f\x1f"
+    b"\x20\x20\x20\x20\x21\x21\x21\x21\x22\x22\x22\x22\x23\x23\x23\x23"
+    b"\x24\x24\x24\x24\x25\x25\x25\x25\x26\x26\x26\x26\x27\x27\x27\x27"
+    b"\x28\x28\x28\x28\x29\x29\x29\x29\x2a\x2a\x2a\x2a\x2a\x2b\x2b\x2b"
+    b"\x2b\x2c\x2c\x2c\x2c\x2d\x2d\x2d\x2d\x2e\x2e\x2e\x2e\x2f\x2f\x2f"
+    b"\x2f\x30\x30\x30\x30\x31\x31\x31\x31\x32\x32\x32\x32\x33\x33\x33"
+    b"\x33\x34\x34\x34\x34\x35\x35\x35\x35\x36\x36\x36\x36\x37\x37\x37"
+    b"\x37\x38\x38\x38\x38\x39\x39\x39\x39\x3a\x3a\x3a\x3a\x3b\x3b\x3b"
+    b"\x3b\x3c\x3c\x3c\x3c\x3d\x3d\x3d\x3d\x3e\x3e\x3e\x3e\x3f\x3f\x3f"
+)
+
+def _convert_rgb888(src, dst, width, step, to5, to6):
+    """Convierte una fila BGR/BGRA de un BMP a RGB565 (byte alto primero)."""
+    i = 0
+    j = 0
+    for _ in range(width):
+        r5 = to5[src[i + 2]]
+        g6 = to6[src[i + 1]]
+        dst[j] = (r5 << 3) | (g6 >> 3)
+        dst[j + 1] = ((g6 & 0x07) << 5) | to5[src[i]]
+        i += step
+        j += 2
+
+def _convert_rgb565(src, dst, width):
+    """Pasa una fila RGB565 de un BMP (byte bajo primero) al orden del display."""
+    i = 0
+    j = 0
+    for _ in range(width):
+        dst[j] = src[i + 1]
+        dst[j + 1] = src[i]
+        i += 2
+        j += 2
+
+if micropython is not None:
+    # Las mismas conversiones compiladas con viper: la fila entera se convierte
+    # en código nativo, sin trabajo del intérprete por píxel.
+    @micropython.viper
+    def _convert_rgb888(src: ptr8, dst: ptr8, width: int, step: int, to5: ptr8, to6: ptr8):
+        i = 0
+        j = 0
+        for _ in range(width):
+            r5 = to5[src[i + 2]]
+            g6 = to6[src[i + 1]]
+            dst[j] = (r5 << 3) | (g6 >> 3)
+            dst[j + 1] = ((g6 & 0x07) << 5) | to5[src[i]]
+            i += step
+            j += 2
+
+    @micropython.viper
+    def _convert_rgb565(src: ptr8, dst: ptr8, width: int):
+        i = 0
+        j = 0
+        for _ in range(width):
+            dst[j] = src[i + 1]
+            dst[j + 1] = src[i]
+            i += 2
+            j += 2
+
+
+# Formato de imagen cruda (generado en el PC con bmp2raw.py):
+#   cabecera de 8 bytes "<2sHHBB": b"R5", ancho, alto, formato (0 = RGB565,
+#   byte alto primero) y flags (bit 0 = RLE), seguida de los píxeles por filas.
+#   Con RLE los datos son paquetes: un byte n < 128 va seguido de n + 1 píxeles
+#   literales; n >= 128 va seguido de un píxel que se repite n - 126 veces.
+RAW_MAGIC = b"R5"
+RAW_FORMAT_RGB565 = 0
+RAW_FLAG_RLE = 0x01
+BLIT_CHUNK = 4096  # Bytes por escritura SPI en blit_raw
+
+def _repeat_pixel(buf, start, size):
+    """Repite el píxel de buf[start:start + 2] hasta llenar `size` bytes, duplicando el bloque ya copiado."""
+    done = 2
+    while done < size:
+        step = min(done, size - done)
+        buf[start + done:start + done + step] = buf[start:start + step]
+        done += step
+
+
+class ST7789:
+    """
+    LCD ST7789 por SPI. El constructor solo guarda la configuración; init()
+    crea el SPI y los pines y envía la secuencia de arranque del controlador.
+    """
+
+    def __init__(self, spi_id=1, sck=12, mosi=11, cs=10, dc=8, rst=9, baudrate=40_000_000,
+                 display=None):
+        """
+        :param spi_id: Número de bus SPI.
+        :param sck, mosi, cs, dc, rst: Números de GPIO de cada señal.
+        :param baudrate: Velocidad del SPI.
+        :param display: Geometría del panel; por defecto la de la ESP32-S3-GEEK
+                        (135x240 visibles a partir de la columna 52 y la fila 40).
+        """
+        self._bus_config = (spi_id, sck, mosi, cs, dc, rst, baudrate)
+        self.display = display if display is not None else Display()
+        self.spi = None
+        self.cs = None
+        self.dc = None
+        self.rst = None
+
+        # Framebuffer opcional (RGB565). Si está activo, las primitivas dibujan
+        # en RAM y flush() envía al display solo los rectángulos modificados.
+        self.framebuffer = None
+        self._fb_view = None
+        self._dirty_rects = []
+        self._spare_rects = []  # Listas de rectángulos ya usadas, para no crear nuevas en cada frame
+
+        self.span_buffer_allocs = 0  # Líneas creadas por el pool (deja de crecer en régimen estable)
+        self._span_pool = []  # Entradas [color, buffer, memoryview por píxeles], la más reciente al final
+
+        self._glyph_cache = {}
+        self._glyph_order = []  # Claves del caché, de la menos a la más recientemente usada
+        self._text_strip = bytearray(0)  # Buffer reutilizable para una línea de texto
+        self._blit_buffer = None  # Buffer reutilizable de blit_raw (se crea en el primer uso)
+
+        # Zona de scroll (inicio, alto) en coordenadas de pantalla
+        self._scroll_area = None
+        self._scroll_offset = 0
+
+        # Buffers preasignados para comandos y parámetros (evitan crear bytearrays por byte)
+        self._cmd_buf = bytearray(1)
+        self._data_buf = bytearray(1)
+        self._window_buf = bytearray(4)
+        self._pixel_buf = bytearray(2)
+        self._scroll_buf = bytearray(6)
+
+    def write_cmd(self, cmd):
+        """Escribir un comando al controlador del display."""
+        self._cmd_buf[0] = cmd
+        self.cs.value(0)
+        self.dc.value(0)
+        self.spi.write(self._cmd_buf)
+        self.cs.value(1)
+
+    def write_data(self, data):
+        """Escribir datos al controlador del display."""
+        self._data_buf[0] = data
+        self.cs.value(0)
+        self.dc.value(1)
+        self.spi.write(self._data_buf)
+        self.cs.value(1)
+
+    def send(self, cmd, params=None):
+        """
+        Envía un comando y sus parámetros en una sola transacción (CS activo todo el tiempo).
+        :param cmd: Byte de comando.
+        :param params: bytes/bytearray con los parámetros, o None si no tiene.
+        """
+        cs = self.cs
+        dc = self.dc
+        spi = self.spi
+        self._cmd_buf[0] = cmd
+        cs.value(0)
+        dc.value(0)
+        spi.write(self._cmd_buf)
+        if params:
+            dc.value(1)
+            spi.write(params)
+        cs.value(1)
+
+    def init(self):
+        """Crea el SPI y los pines (solo la primera vez) e inicializa el display."""
+        if self.spi is None:
+            from machine import Pin, SPI
+            spi_id, sck, mosi, cs, dc, rst, baudrate = self._bus_config
+            self.spi = SPI(spi_id, baudrate=baudrate, polarity=0, phase=0, sck=Pin(sck), mosi=Pin(mosi))
+            self.cs = Pin(cs, Pin.OUT)   # Chip Select
+            self.dc = Pin(dc, Pin.OUT)   # Data/Command
+            self.rst = Pin(rst, Pin.OUT)  # Reset
+
+        self.rst.value(0)
+        time.sleep(0.1)
+        self.rst.value(1)
+        time.sleep(0.1)
+
+        self.send(0x01)  # Software reset
+        time.sleep(0.15)
+
+        self.send(0x11)  # Salir del modo de reposo
+        time.sleep(0.12)
+
+        display = self.display
+        self.send(0x3A, b"\x55")  # Formato de píxel: RGB565
+        self.send(0x36, bytes((display.madctl,)))  # Configuración de memoria: orientación actual
+        self.send(0x21)  # Inversión de color activada
+
+        self.set_active_window(0, 0, display.width - 1, display.height - 1)  # Todo el panel visible
+
+        self.send(0x29)  # Encender display
+
+    def set_active_window(self, x0, y0, x1, y1):
+        """Configura la ventana activa del display."""
+        display = self.display
+        x0 += display.offset_x
+        x1 += display.offset_x
+        y0 += display.offset_y
+        y1 += display.offset_y
+        buf = self._window_buf
+        buf[0] = x0 >> 8
+        buf[1] = x0 & 0xFF
+        buf[2] = x1 >> 8
+        buf[3] = x1 & 0xFF
+        self.send(0x2A, buf)  # Configurar columnas
+
+        buf[0] = y0 >> 8
+        buf[1] = y0 & 0xFF
+        buf[2] = y1 >> 8
+        buf[3] = y1 & 0xFF
+        self.send(0x2B, buf)  # Configurar filas
+
+    def set_rotation(self, rotation):
+        """
+        Configura la orientación del display.
+        :param rotation: 0, 1, 2, o 3 (0: normal, 1: 90°, 2: 180°, 3: 270°)
+        """
+        display = self.display
+        display.select(rotation)
+        self.send(0x36, bytes((display.madctl,)))  # Comando MADCTL
+
+        # El framebuffer conserva su tamaño; solo cambia el ancho de línea
+        if self.framebuffer is not None:
+            self._dirty_rects.clear()
+            self._mark_dirty(0, 0, display.width - 1, display.height - 1)
+
+        # La zona de scroll se definió en coordenadas de la orientación anterior
+        if self._scroll_area is not None:
+            self.reset_scroll()
+
+    # -----------------------------------------------------------------------
+    # Scroll por hardware y modo parcial
+    # -----------------------------------------------------------------------
+    # El controlador desplaza y recorta siempre a lo largo de las filas de su
+    # memoria (320 líneas). Con MV activo esas filas recorren el eje x de la
+    # pantalla en lugar del y, y con MY activo van en orden inverso.
+
+    def _memory_lines(self, first, last):
+        """Convierte un rango de filas (o columnas) de pantalla en el rango de líneas de memoria."""
+        display = self.display
+        offset = display.offset_x if display.madctl & 0x20 else display.offset_y
+        first += offset
+        last += offset
+        lines = Display.MEMORY_HEIGHT
+        if display.madctl & 0x80:
+            first, last = lines - 1 - last, lines - 1 - first
+        if first < 0 or last >= lines or first > last:
+            raise ValueError("El rango queda fuera de la memoria del display")
+        return first, last
+
+    def _send_lines(self, cmd, count, a, b=0, c=0):
+        """Envía `count` valores de 16 bits (a, b, c) como parámetros de un comando."""
+        buf = self._scroll_buf
+        buf[0] = a >> 8
+        buf[1] = a & 0xFF
+        buf[2] = b >> 8
+        buf[3] = b & 0xFF
+        buf[4] = c >> 8
+        buf[5] = c & 0xFF
+        self.send(cmd, memoryview(buf)[:count * 2])
+
+    def set_scroll_area(self, start, size):
+        """
+        Define la zona de scroll: `size` filas a partir de `start` (columnas en las
+        rotaciones 1 y 3, donde el controlador desplaza en horizontal). Lo que queda
+        fuera de la zona permanece fijo.
+        """
+        first, last = self._memory_lines(start, start + size - 1)
+        self._send_lines(0x33, 3, first, size, Display.MEMORY_HEIGHT - 1 - last)  # VSCRDEF
+        self._scroll_area = (start, size)
+        self._scroll_offset = 0
+        self.scroll_to(0)
+
+    def scroll_to(self, offset):
+        """Muestra la zona de scroll desplazada `offset` líneas (0 = sin desplazar)."""
+        if self._scroll_area is None:
+            raise ValueError("Primero hay que llamar a set_scroll_area()")
+        start, size = self._scroll_area
+        self._scroll_offset = offset % size
+        first, _ = self._memory_lines(start, start + size - 1)
+        if self.display.madctl & 0x80:
+            # Orden inverso: la primera línea de memoria es la última de la pantalla
+            address = first + size - 1 - (size - 1 + self._scroll_offset) % size
+        else:
+            address = first + self._scroll_offset
+        self._send_lines(0x37, 1, address)  # VSCSAD
+
+    def scroll(self, lines):
+        """
+        Desplaza la zona de scroll `lines` líneas hacia arriba (o hacia la izquierda).
+        Las líneas que salen reaparecen al final: basta con redibujarlas en
+        scroll_line(size - lines) en adelante.
+        """
+        self.scroll_to(self._scroll_offset + lines)
+
+    def scroll_line(self, row):
+        """
+        Devuelve la coordenada de dibujo de la línea que se ve en la posición `row`
+        de la zona de scroll con el desplazamiento actual.
+        """
+        start, size = self._scroll_area
+        return start + (row + self._scroll_offset) % size
+
+    def reset_scroll(self):
+        """Quita la zona de scroll y vuelve a mostrar la memoria sin desplazar."""
+        self._send_lines(0x33, 3, 0, Display.MEMORY_HEIGHT, 0)
+        self._send_lines(0x37, 1, 0)
+        self._scroll_area = None
+        self._scroll_offset = 0
+
+    def set_partial_area(self, start, size):
+        """
+        Activa el modo parcial: solo se muestran `size` filas a partir de `start`
+        (columnas en las rotaciones 1 y 3); el resto del panel queda apagado.
+        """
+        first, last = self._memory_lines(start, start + size - 1)
+        self._send_lines(0x30, 2, first, last)  # PTLAR
+        self.send(0x12)  # PTLON
+
+    def normal_mode(self):
+        """Sale del modo parcial y vuelve a mostrar todo el panel."""
+        self.send(0x13)  # NORON
+
+    # -----------------------------------------------------------------------
+    # Framebuffer
+    # -----------------------------------------------------------------------
+
+    def enable_framebuffer(self):
+        """
+        Activa el modo framebuffer: las primitivas dibujan en un buffer RGB565 en RAM
+        y no envían nada al display hasta llamar a flush().
+        show_bmp sigue escribiendo directamente en el display.
+        """
+        if self.framebuffer is None:
+            self.framebuffer = bytearray(self.display.width * self.display.height * 2)
+            self._fb_view = memoryview(self.framebuffer)
+        self._dirty_rects.clear()
+
+    def disable_framebuffer(self):
+        """Desactiva el modo framebuffer y libera el buffer (sin enviar lo pendiente)."""
+        self.framebuffer = None
+        self._fb_view = None
+        self._dirty_rects.clear()
+
+    def _mark_dirty(self, x0, y0, x1, y1):
+        """Añade un rectángulo a las regiones sucias, fusionándolo con uno que toque o solape."""
+        dirty_rects = self._dirty_rects
+        for rect in dirty_rects:
+            if x0 <= rect[2] + 1 and x1 >= rect[0] - 1 and y0 <= rect[3] + 1 and y1 >= rect[1] - 1:
+                if x0 < rect[0]:
+                    rect[0] = x0
+                if y0 < rect[1]:
+                    rect[1] = y0
+                if x1 > rect[2]:
+                    rect[2] = x1
+                if y1 > rect[3]:
+                    rect[3] = y1
+                return
+        spare_rects = self._spare_rects
+        if spare_rects:
+            rect = spare_rects.pop()
+            rect[0] = x0
+            rect[1] = y0
+            rect[2] = x1
+            rect[3] = y1
+        else:
+            rect = [x0, y0, x1, y1]
+        dirty_rects.append(rect)
+
+        # Demasiados rectángulos: se reemplazan por su envolvente
+        if len(dirty_rects) > MAX_DIRTY_RECTS:
+            first = dirty_rects[0]
+            for rect in dirty_rects:
+                if rect[0] < first[0]:
+                    first[0] = rect[0]
+                if rect[1] < first[1]:
+                    first[1] = rect[1]
+                if rect[2] > first[2]:
+                    first[2] = rect[2]
+                if rect[3] > first[3]:
+                    first[3] = rect[3]
+            while len(dirty_rects) > 1:
+                spare_rects.append(dirty_rects.pop())
+
+    def flush(self):
+        """Envía al display las regiones modificadas del framebuffer, una ventana por rectángulo."""
+        if self.framebuffer is None:
+            return
+        cs = self.cs
+        dc = self.dc
+        spi = self.spi
+        fb_view = self._fb_view
+        width = self.display.width
+        stride = width * 2
+        for x0, y0, x1, y1 in self._dirty_rects:
+            self.set_active_window(x0, y0, x1, y1)
+            self.write_cmd(0x2C)  # Comando para escribir en memoria
+            cs.value(0)
+            dc.value(1)
+            if x0 == 0 and x1 == width - 1:
+                # Filas completas: son contiguas en memoria, una sola escritura
+                spi.write(fb_view[y0 * stride:(y1 + 1) * stride])
+            else:
+                start = y0 * stride + x0 * 2
+                end = start + (x1 - x0 + 1) * 2
+                for _ in range(y0, y1 + 1):
+                    spi.write(fb_view[start:end])
+                    start += stride
+                    end += stride
+            cs.value(1)
+        while self._dirty_rects:
+            self._spare_rects.append(self._dirty_rects.pop())
+
+    # -----------------------------------------------------------------------
+    # Primitivas
+    # -----------------------------------------------------------------------
+
+    def _color_span(self, color, pixels):
+        """
+        Devuelve un memoryview con `pixels` píxeles (hasta SPAN_LINE_PIXELS) del color
+        dado, sacado del pool de líneas. Solo reserva memoria la primera vez que se
+        pide un largo en una línea del pool.
+        """
+        pool = self._span_pool
+        entry = pool[-1] if pool else None
+        if entry is None or entry[0] != color:
+            entry = None
+            for candidate in pool:
+                if candidate[0] == color:
+                    entry = candidate
+                    break
+            if entry is not None:
+                pool.remove(entry)
+            else:
+                if len(pool) >= SPAN_POOL_SIZE:
+                    entry = pool.pop(0)  # Se reutiliza la línea del color menos usado
+                else:
+                    # Una vista por largo, creada al pedirla: cada tramo tiene la suya y no
+                    # se expulsan, así que una figura con muchos anchos tampoco reserva.
+                    # Siguen valiendo al cambiar el color de la línea.
+                    entry = [0, bytearray(SPAN_LINE_PIXELS * 2), [None] * (SPAN_LINE_PIXELS + 1)]
+                    self.span_buffer_allocs += 1
+                entry[0] = color
+                # Rellenar la línea duplicando el bloque ya copiado
+                buf = entry[1]
+                buf[0] = (color >> 8) & 0xFF
+                buf[1] = color & 0xFF
+                done = 2
+                while done < len(buf):
+                    step = min(done, len(buf) - done)
+                    buf[done:done + step] = buf[:step]
+                    done += step
+            pool.append(entry)
+
+        views = entry[2]
+        view = views[pixels]
+        if view is None:
+            view = views[pixels] = memoryview(entry[1])[:pixels * 2]
+        return view
+
+    def _fill_window(self, x0, y0, x1, y1, color):
+        """
+        Rellena el rectángulo (x0, y0)-(x1, y1) con un color, en el display o en el
+        framebuffer. Lo que queda fuera del área visible se recorta antes de enviar nada.
+        """
+        display = self.display
+        width = display.width
+        if x0 < 0:
+            x0 = 0
+        if y0 < 0:
+            y0 = 0
+        if x1 >= width:
+            x1 = width - 1
+        if y1 >= display.height:
+            y1 = display.height - 1
+        if x0 > x1 or y0 > y1:
+            return
+        line = self._color_span(color, x1 - x0 + 1)
+
+        if self.framebuffer is not None:
+            fb_view = self._fb_view
+            stride = width * 2
+            start = y0 * stride + x0 * 2
+            end = start + len(line)
+            for _ in range(y0, y1 + 1):
+                fb_view[start:end] = line
+                start += stride
+                end += stride
+            self._mark_dirty(x0, y0, x1, y1)
+            return
+
+        self.set_active_window(x0, y0, x1, y1)  # Configurar la ventana activa
+        self.write_cmd(0x2C)  # Comando para escribir en memoria
+        # Enviar líneas al display
+        cs = self.cs
+        dc = self.dc
+        spi = self.spi
+        for _ in range(y0, y1 + 1):
+            cs.value(0)
+            dc.value(1)
+            spi.write(line)
+            cs.value(1)
+
+    def fill_screen(self, color):
+        """Llena toda la pantalla con un color usando un buffer por líneas."""
+        self._fill_window(0, 0, self.display.width - 1, self.display.height - 1, color)
+
+    def draw_pixel(self, x, y, color):
+        """Dibuja un píxel en las coordenadas especificadas."""
+        display = self.display
+        if not (0 <= x < display.width and 0 <= y < display.height):
+            return
+        framebuffer = self.framebuffer
+        if framebuffer is not None:
+            i = (y * display.width + x) * 2
+            framebuffer[i] = (color >> 8) & 0xFF
+            framebuffer[i + 1] = color & 0xFF
+            self._mark_dirty(x, y, x, y)
+            return
+
+        self.set_active_window(x, y, x, y)  # Configurar para un solo píxel
+        pixel_buf = self._pixel_buf
+        pixel_buf[0] = (color >> 8) & 0xFF  # Byte alto del color
+        pixel_buf[1] = color & 0xFF  # Byte bajo del color
+        self.send(0x2C, pixel_buf)
+
+    def draw_line(self, x0, y0, x1, y1, color):
+        """
+        Dibuja una línea entre los puntos (x0, y0) y (x1, y1) con el color especificado.
+        Los píxeles consecutivos en la misma fila (líneas tendidas) o en la misma
+        columna (líneas empinadas) se envían como un solo tramo.
+        """
+        fill_window = self._fill_window
+        dx = abs(x1 - x0)
+        dy = abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx - dy
+        steep = dy > dx
+        run_x, run_y = x0, y0  # Inicio del tramo actual
+
+        while True:
+            if x0 == x1 and y0 == y1:  # Si hemos llegado al final
+                fill_window(min(run_x, x0), min(run_y, y0), max(run_x, x0), max(run_y, y0), color)
+                break
+            next_x, next_y = x0, y0
+            err2 = err * 2
+            if err2 > -dy:
+                err -= dy
+                next_x += sx
+            if err2 < dx:
+                err += dx
+                next_y += sy
+
+            # El tramo termina cuando el siguiente píxel cambia de fila (o de columna)
+            if (next_x != x0) if steep else (next_y != y0):
+                fill_window(min(run_x, x0), min(run_y, y0), max(run_x, x0), max(run_y, y0), color)
+                run_x, run_y = next_x, next_y
+            x0, y0 = next_x, next_y
+
+    def draw_rectangle(self, x0, y0, x1, y1, color, filled=False):
+        """
+        Dibuja un rectángulo entre los puntos (x0, y0) y (x1, y1) con el color especificado.
+        Si 'filled' es True, el rectángulo estará relleno.
+        """
+        x_start = min(x0, x1)
+        x_end = max(x0, x1)
+        y_start = min(y0, y1)
+        y_end = max(y0, y1)
+        if filled:
+            # Optimización para rectángulos rellenos usando ventanas y buffers
+            self._fill_window(x_start, y_start, x_end, y_end, color)
+            return
+
+        # Contorno del rectángulo (no relleno): cuatro tramos, uno por lado
+        self._fill_window(x_start, y_start, x_end, y_start, color)  # Línea superior
+        if y_end > y_start:
+            self._fill_window(x_start, y_end, x_end, y_end, color)  # Línea inferior
+        if y_end - y_start > 1:
+            self._fill_window(x_start, y_start + 1, x_start, y_end - 1, color)  # Línea izquierda
+            if x_end > x_start:
+                self._fill_window(x_end, y_start + 1, x_end, y_end - 1, color)  # Línea derecha
+
+    def draw_circle(self, x0, y0, radius, color, filled=False):
+        """
+        Dibuja un círculo con centro en (x0, y0) y un radio 'radius'.
+        Si 'filled' es True, el círculo estará relleno.
+        """
+        x = radius
+        y = 0
+        err = 0
+
+        if not filled:
+            # Contorno: los pasos consecutivos con la misma x forman tramos
+            # horizontales (arriba y abajo) y verticales (izquierda y derecha)
+            group_x = x
+            group_start = 0
+            while x >= y:
+                last_y = y
+                y += 1
+                err += 1 + 2 * y
+                if 2 * (err - x) + 1 > 0:
+                    x -= 1
+                    err += 1 - 2 * x
+                if x != group_x or x < y:
+                    self._circle_outline_runs(x0, y0, group_x, group_start, last_y, color)
+                    group_x = x
+                    group_start = y
+            return
+
+        fill_window = self._fill_window
+        while x >= y:
+            # Dibuja líneas horizontales para rellenar el círculo
+            fill_window(x0 - x, y0 + y, x0 + x, y0 + y, color)
+            fill_window(x0 - x, y0 - y, x0 + x, y0 - y, color)
+            fill_window(x0 - y, y0 + x, x0 + y, y0 + x, color)
+            fill_window(x0 - y, y0 - x, x0 + y, y0 - x, color)
+
+            y += 1
+            err += 1 + 2 * y
+            if 2 * (err - x) + 1 > 0:
+                x -= 1
+                err += 1 - 2 * x
+
+    def _circle_outline_runs(self, x0, y0, x, y_first, y_last, color):
+        """Dibuja los tramos del contorno para los pasos y_first..y_last con la misma x."""
+        fill_window = self._fill_window
+        if y_first == 0:
+            # Los tramos de ambos lados del eje se unen en uno
+            fill_window(x0 - y_last, y0 - x, x0 + y_last, y0 - x, color)  # Arriba
+            fill_window(x0 - y_last, y0 + x, x0 + y_last, y0 + x, color)  # Abajo
+            fill_window(x0 - x, y0 - y_last, x0 - x, y0 + y_last, color)  # Izquierda
+            fill_window(x0 + x, y0 - y_last, x0 + x, y0 + y_last, color)  # Derecha
+            return
+        fill_window(x0 + y_first, y0 - x, x0 + y_last, y0 - x, color)  # Arriba derecha
+        fill_window(x0 - y_last, y0 - x, x0 - y_first, y0 - x, color)  # Arriba izquierda
+        fill_window(x0 + y_first, y0 + x, x0 + y_last, y0 + x, color)  # Abajo derecha
+        fill_window(x0 - y_last, y0 + x, x0 - y_first, y0 + x, color)  # Abajo izquierda
+        fill_window(x0 + x, y0 + y_first, x0 + x, y0 + y_last, color)  # Derecha abajo
+        fill_window(x0 + x, y0 - y_last, x0 + x, y0 - y_first, color)  # Derecha arriba
+        fill_window(x0 - x, y0 + y_first, x0 - x, y0 + y_last, color)  # Izquierda abajo
+        fill_window(x0 - x, y0 - y_last, x0 - x, y0 - y_first, color)  # Izquierda arriba
+
+    def draw_polygon(self, color, filled=False, *vertices, antialias=False, bg_color=0):
+        """
+        Dibuja un polígono basado en una lista de vértices.
+        :param color: Color en formato RGB565.
+        :param filled: Si es True, rellena el polígono.
+        :param vertices: Vértices del polígono como argumentos ((x1, y1), (x2, y2), ...).
+        :param antialias: Si es True (y filled), los bordes se suavizan según la cobertura.
+        :param bg_color: Fondo con el que se mezclan los bordes suavizados cuando no hay
+                         framebuffer (con framebuffer se mezcla con lo ya dibujado).
+        """
+        if len(vertices) < 3:
+            raise ValueError("Un polígono debe tener al menos 3 vértices.")
+
+        if filled and antialias:
+            self._fill_polygon_aa(vertices, color, bg_color)
+        elif filled:
+            self._fill_polygon(vertices, color)
+        else:
+            # Dibuja el contorno del polígono
+            for i in range(len(vertices)):
+                x1, y1 = vertices[i]
+                x2, y2 = vertices[(i + 1) % len(vertices)]
+                self.draw_line(x1, y1, x2, y2, color)
+
+    def _fill_polygon(self, vertices, color):
+        """
+        Relleno por líneas de barrido con tabla de aristas y lista de aristas activas.
+        La x de cada arista avanza de forma incremental con aritmética entera exacta
+        (parte entera más un resto en unidades de 1/dy), sin divisiones por fila.
+        """
+        # Tabla de aristas: [y_inicio, y_fin, x, resto, paso, paso_resto, dy]
+        edges = []
+        count = len(vertices)
+        for i in range(count):
+            x1, y1 = vertices[i]
+            x2, y2 = vertices[(i + 1) % count]
+            if y1 == y2:
+                continue  # Las aristas horizontales no cortan ninguna línea de barrido
+            if y1 > y2:
+                x1, y1, x2, y2 = x2, y2, x1, y1
+            dx = x2 - x1
+            dy = y2 - y1
+            edges.append([y1, y2, x1, 0, dx // dy, dx % dy, dy])
+        if not edges:
+            return
+        edges.sort(key=lambda edge: edge[0])
+
+        fill_window = self._fill_window
+        active = []
+        next_edge = 0
+        y = edges[0][0]
+        y_max = max(edge[1] for edge in edges)
+        while y < y_max:
+            # Incorporar las aristas que empiezan en esta fila
+            while next_edge < len(edges) and edges[next_edge][0] == y:
+                active.append(edges[next_edge])
+                next_edge += 1
+
+            # Retirar las que ya terminaron
+            i = 0
+            while i < len(active):
+                if active[i][1] <= y:
+                    active.pop(i)
+                else:
+                    i += 1
+            if not active:
+                if next_edge == len(edges):
+                    break
+                y = edges[next_edge][0]  # Saltar el hueco hasta la siguiente arista
+                continue
+
+            _sort_active(active, 2)
+            for i in range(0, len(active) - 1, 2):
+                fill_window(active[i][2], y, active[i + 1][2], y, color)
+
+            # Avanzar la x de cada arista a la siguiente fila
+            for edge in active:
+                edge[2] += edge[4]
+                edge[3] += edge[5]
+                if edge[3] >= edge[6]:
+                    edge[2] += 1
+                    edge[3] -= edge[6]
+            y += 1
+
+    def _fill_polygon_aa(self, vertices, color, bg_color):
+        """
+        Relleno con bordes suavizados: cada fila se barre con AA_SUBSAMPLES sub-líneas
+        y x en punto fijo 16.16; la cobertura parcial de los píxeles de borde se mezcla
+        con el fondo y los píxeles cubiertos del todo se envían como tramos.
+        """
+        sub = AA_SUBSAMPLES
+        full = 256 // sub  # Cobertura de un píxel completo en una sub-línea
+
+        # Tabla de aristas en sub-líneas: [s_inicio, s_fin, x (16.16), paso (16.16)]
+        edges = []
+        count = len(vertices)
+        for i in range(count):
+            x1, y1 = vertices[i]
+            x2, y2 = vertices[(i + 1) % count]
+            if y1 == y2:
+                continue
+            if y1 > y2:
+                x1, y1, x2, y2 = x2, y2, x1, y1
+            step = ((x2 - x1) << 16) // ((y2 - y1) * sub)
+            # x en el centro de la primera sub-línea
+            edges.append([y1 * sub, y2 * sub, (x1 << 16) + step // 2, step])
+        if not edges:
+            return
+        edges.sort(key=lambda edge: edge[0])
+
+        min_x = min(x for x, _ in vertices)
+        max_x = max(x for x, _ in vertices)
+        width = max_x - min_x + 2
+        origin = min_x << 16
+        coverage = [0] * width  # Cobertura de los píxeles de borde de la fila actual
+        runs = [0] * (width + 1)  # Diferencias para los píxeles cubiertos del todo
+
+        active = []
+        next_edge = 0
+        s = edges[0][0]
+        s_max = max(edge[1] for edge in edges)
+        row = s // sub
+        row_min = width
+        row_max = -1
+        while s <= s_max:
+            # Al cambiar de fila se vuelca la cobertura acumulada
+            if s // sub != row or s == s_max:
+                if row_max >= 0:
+                    self._flush_aa_row(min_x, row, row_min, row_max, coverage, runs, color, bg_color)
+                row = s // sub
+                row_min = width
+                row_max = -1
+                if s == s_max:
+                    break
+
+            while next_edge < len(edges) and edges[next_edge][0] == s:
+                active.append(edges[next_edge])
+                next_edge += 1
+            i = 0
+            while i < len(active):
+                if active[i][1] <= s:
+                    active.pop(i)
+                else:
+                    i += 1
+
+            _sort_active(active, 2)
+            for i in range(0, len(active) - 1, 2):
+                # El redondeo del paso puede dejar x un poco a la izquierda de min_x
+                xa = max(0, active[i][2] - origin)
+                xb = max(0, active[i + 1][2] - origin)
+                if xb <= xa:
+                    continue
+                pa = xa >> 16
+                pb = xb >> 16
+                if pa == pb:
+                    coverage[pa] += ((xb - xa) * full) >> 16
+                else:
+                    coverage[pa] += ((0x10000 - (xa & 0xFFFF)) * full) >> 16
+                    runs[pa + 1] += full
+                    runs[pb] -= full
+                    coverage[pb] += ((xb & 0xFFFF) * full) >> 16
+                if pa < row_min:
+                    row_min = pa
+                if pb > row_max:
+                    row_max = pb
+
+            for edge in active:
+                edge[2] += edge[3]
+            s += 1
+
+    def _flush_aa_row(self, min_x, y, first, last, coverage, runs, color, bg_color):
+        """Dibuja una fila suavizada: tramos para la cobertura total y mezcla en los bordes."""
+        display = self.display
+        framebuffer = self.framebuffer
+        level = 0
+        span_start = -1
+        for i in range(first, last + 1):
+            level += runs[i]
+            alpha = level + coverage[i]
+            runs[i] = 0
+            coverage[i] = 0
+            if alpha >= 256:
+                if span_start < 0:
+                    span_start = i
+                continue
+            if span_start >= 0:
+                self._fill_window(min_x + span_start, y, min_x + i - 1, y, color)
+                span_start = -1
+            if alpha > 0:
+                x = min_x + i
+                bg = bg_color
+                if framebuffer is not None:
+                    if not (0 <= x < display.width and 0 <= y < display.height):
+                        continue
+                    j = (y * display.width + x) * 2
+                    bg = (framebuffer[j] << 8) | framebuffer[j + 1]
+                self.draw_pixel(x, y, _blend565(color, bg, alpha))
+        if span_start >= 0:
+            self._fill_window(min_x + span_start, y, min_x + last, y, color)
+        runs[last + 1] = 0
+
+    # -----------------------------------------------------------------------
+    # Texto
+    # -----------------------------------------------------------------------
+
+    def _get_glyph(self, char, color, bg_color):
+        """Devuelve el glifo 8x8 de un carácter en RGB565 (128 bytes), usando el caché."""
+        key = (char, color, bg_color)
+        glyph_cache = self._glyph_cache
+        glyph_order = self._glyph_order
+        glyph = glyph_cache.get(key)
+        if glyph is not None:
+            if glyph_order[-1] != key:
+                glyph_order.remove(key)
+                glyph_order.append(key)
+            return glyph
+
+        # Rasterizar el glifo una sola vez; los caracteres sin fuente quedan en fondo
+        fg_hi, fg_lo = (color >> 8) & 0xFF, color & 0xFF
+        bg_hi, bg_lo = (bg_color >> 8) & 0xFF, bg_color & 0xFF
+        glyph = bytearray(128)
+        i = 0
+        for row in font_8x8.get(char, EMPTY_GLYPH):
+            for col in range(8):
+                if row & (1 << (7 - col)):  # Verifica cada bit
+                    glyph[i] = fg_hi
+                    glyph[i + 1] = fg_lo
+                else:
+                    glyph[i] = bg_hi
+                    glyph[i + 1] = bg_lo
+                i += 2
+
+        if len(glyph_order) >= GLYPH_CACHE_SIZE:
+            del glyph_cache[glyph_order.pop(0)]
+        glyph_cache[key] = glyph
+        glyph_order.append(key)
+        return glyph
+
+    def _write_block(self, x, y, width, height, buf):
+        """Copia un bloque RGB565 (por filas) al display con una sola ventana, o al framebuffer."""
+        display = self.display
+        visible = display.clip(x, y, x + width - 1, y + height - 1)
+        if visible is None:
+            return
+        x0, y0, x1, y1 = visible
+        src = memoryview(buf)
+
+        if self.framebuffer is not None:
+            # Copiar fila a fila la parte visible
+            fb_view = self._fb_view
+            size = (x1 - x0 + 1) * 2
+            src_start = ((y0 - y) * width + (x0 - x)) * 2
+            dst_start = (y0 * display.width + x0) * 2
+            for _ in range(y0, y1 + 1):
+                fb_view[dst_start:dst_start + size] = src[src_start:src_start + size]
+                src_start += width * 2
+                dst_start += display.width * 2
+            self._mark_dirty(x0, y0, x1, y1)
+            return
+
+        self.set_active_window(x0, y0, x1, y1)
+        self.write_cmd(0x2C)  # Comando para escribir en memoria
+        spi = self.spi
+        self.cs.value(0)
+        self.dc.value(1)
+        if x0 == x and x1 == x + width - 1:
+            # Filas completas: la parte visible es contigua en el buffer
+            spi.write(src[(y0 - y) * width * 2:(y1 - y + 1) * width * 2])
+        else:
+            size = (x1 - x0 + 1) * 2
+            start = ((y0 - y) * width + (x0 - x)) * 2
+            for _ in range(y0, y1 + 1):
+                spi.write(src[start:start + size])
+                start += width * 2
+        self.cs.value(1)
+
+    def draw_char(self, x, y, char, color, bg_color):
+        """
+        Dibuja un carácter en el display usando una fuente de 8x8 píxeles. Un
+        carácter que no está en la fuente se dibuja como una celda de fondo, igual
+        que en text().
+        """
+        self._write_block(x, y, 8, 8, self._get_glyph(char, color, bg_color))
+
+    def text(self, x, y, text, color, bg_color):
+        """
+        Dibuja una cadena de texto comenzando en la posición (x, y).
+        Toda la cadena se compone en un buffer de 8 filas y se envía con una sola ventana.
+        """
+        count = len(text)
+        if not count:
+            return
+        line = count * 16  # Bytes por fila de la tira (8 píxeles x 2 bytes por carácter)
+        if len(self._text_strip) < line * 8:
+            self._text_strip = bytearray(line * 8)
+        strip = memoryview(self._text_strip)
+
+        for i, char in enumerate(text):
+            glyph = memoryview(self._get_glyph(char, color, bg_color))
+            dst = i * 16
+            for row in range(0, 128, 16):
+                strip[dst:dst + 16] = glyph[row:row + 16]
+                dst += line
+
+        self._write_block(x, y, count * 8, 8, strip)
+
+    def draw_text(self, x, y, string, color, font, scale=1, bg_color=None):
+        """
+        Dibuja texto con una fuente empaquetada, ampliada `scale` veces.
+        Cada glifo se dibuja como tramos horizontales (filas iguales consecutivas se
+        agrupan en un solo rectángulo), nunca píxel a píxel.
+        :param bg_color: Color de fondo; si es None el fondo no se pinta.
+        :return: Coordenada x siguiente al texto.
+        """
+        fill_window = self._fill_window
+        height = font.height
+        for char in string:
+            glyph = font.glyph(char) or font.glyph("?")
+            if glyph is None:
+                continue
+            width, bitmap = glyph
+            row_bytes = (width + 7) >> 3
+            top_bit = row_bytes * 8 - 1
+            rows = [int.from_bytes(bitmap[r * row_bytes:(r + 1) * row_bytes], "big")
+                    for r in range(height)]
+
+            row = 0
+            while row < height:
+                bits = rows[row]
+                end = row + 1
+                while end < height and rows[end] == bits:
+                    end += 1
+                y0 = y + row * scale
+                y1 = y + end * scale - 1
+
+                col = 0
+                while col < width:
+                    on = (bits >> (top_bit - col)) & 1
+                    run_end = col + 1
+                    while run_end < width and (bits >> (top_bit - run_end)) & 1 == on:
+                        run_end += 1
+                    if on:
+                        fill_window(x + col * scale, y0, x + run_end * scale - 1, y1, color)
+                    elif bg_color is not None:
+                        fill_window(x + col * scale, y0, x + run_end * scale - 1, y1, bg_color)
+                    col = run_end
+                row = end
+            x += width * scale
+        return x
+
+    # -----------------------------------------------------------------------
+    # Imágenes
+    # -----------------------------------------------------------------------
+
+    def show_bmp(self, file_path, x_offset=0, y_offset=0, mirror=False):
+        """
+        Muestra un archivo BMP en el display leyendo y enviando una fila cada vez.
+        Admite BMP sin comprimir de 16 bits (RGB565), 24 bits y 32 bits, guardados
+        de abajo arriba (alto positivo) o de arriba abajo (alto negativo).
+        :param file_path: Ruta del archivo BMP.
+        :param x_offset: Desplazamiento horizontal para dibujar la imagen.
+        :param y_offset: Desplazamiento vertical para dibujar la imagen.
+        :param mirror: Si es True, la imagen se refleja horizontalmente (con los bits
+                       de MADCTL, sin trabajo extra por píxel).
+        La parte que queda fuera del área visible no se envía.
+        """
+        display = self.display
+        with open(file_path, "rb") as bmp_file:
+            # Leer el encabezado BMP (cabecera de archivo + BITMAPINFOHEADER + máscaras)
+            header = bmp_file.read(66)
+            if header[0:2] != b"BM":
+                raise ValueError("El archivo no es un BMP.")
+            pixel_data_offset = struct.unpack_from("<I", header, 10)[0]
+            width, height, _, bits_per_pixel, compression = struct.unpack_from("<iiHHI", header, 18)
+
+            if bits_per_pixel == 16:
+                if compression != 3 or struct.unpack_from("<III", header, 54) != (0xF800, 0x07E0, 0x001F):
+                    raise ValueError("Los BMP de 16 bits deben ser RGB565 (BI_BITFIELDS).")
+            elif bits_per_pixel == 32:
+                if compression == 3:
+                    if struct.unpack_from("<III", header, 54) != (0xFF0000, 0x00FF00, 0x0000FF):
+                        raise ValueError("Los BMP de 32 bits deben ser BGRA/BGRX.")
+                elif compression != 0:
+                    raise ValueError("Solo se admiten BMP sin comprimir.")
+            elif bits_per_pixel != 24 or compression != 0:
+                raise ValueError("Solo se admiten BMP sin comprimir de 16, 24 o 32 bits.")
+
+            top_down = height < 0
+            if top_down:
+                height = -height
+            bytes_per_pixel = bits_per_pixel // 8
+            row_size = (width * bytes_per_pixel + 3) & ~3  # Cada fila ocupa un múltiplo de 4 bytes
+
+            if mirror:
+                # El controlador invierte el eje x: la imagen se envía tal cual en la
+                # posición equivalente del eje reflejado
+                x_offset = display.width - x_offset - width
+                display.select(display.rotation, mirror=True)
+                self.send(0x36, bytes((display.madctl,)))
+            try:
+                visible = display.clip(x_offset, y_offset, x_offset + width - 1, y_offset + height - 1)
+                if visible is None:
+                    return
+                x0, y0, x1, y1 = visible
+
+                # Configurar la ventana activa en el display (solo la parte visible)
+                self.set_active_window(x0, y0, x1, y1)
+                self.write_cmd(0x2C)  # Comando para escribir en memoria
+
+                row_buffer = bytearray(row_size)  # Fila tal como está en el archivo
+                line = bytearray(width * 2)  # Fila convertida a RGB565
+                visible_line = memoryview(line)[(x0 - x_offset) * 2:(x1 - x_offset + 1) * 2]
+
+                cs = self.cs
+                dc = self.dc
+                spi = self.spi
+                if top_down:
+                    bmp_file.seek(pixel_data_offset + (y0 - y_offset) * row_size)
+                for y in range(y0 - y_offset, y1 - y_offset + 1):
+                    if not top_down:
+                        # La primera fila del archivo es la de abajo
+                        bmp_file.seek(pixel_data_offset + (height - 1 - y) * row_size)
+                    bmp_file.readinto(row_buffer)
+
+                    if bytes_per_pixel == 2:
+                        _convert_rgb565(row_buffer, line, width)
+                    else:
+                        _convert_rgb888(row_buffer, line, width, bytes_per_pixel, _TO5, _TO6)
+
+                    cs.value(0)
+                    dc.value(1)
+                    spi.write(visible_line)
+                    cs.value(1)
+            finally:
+                if mirror:
+                    display.select(display.rotation)
+                    self.send(0x36, bytes((display.madctl,)))
+
+    def _write_data_block(self, buf):
+        """Envía un bloque de datos de píxel (tras RAMWR) en una transacción."""
+        self.cs.value(0)
+        self.dc.value(1)
+        self.spi.write(buf)
+        self.cs.value(1)
+
+    def blit_raw(self, file_path, x=0, y=0):
+        """
+        Muestra una imagen en formato crudo RGB565 sin decodificar nada en el dispositivo:
+        el archivo se lee con readinto en un buffer reutilizable y se envía por bloques.
+        La parte que queda fuera del área visible no se envía.
+        :param file_path: Ruta del archivo .raw.
+        :param x: Posición horizontal de la esquina superior izquierda.
+        :param y: Posición vertical de la esquina superior izquierda.
+        """
+        if self._blit_buffer is None:
+            self._blit_buffer = bytearray(BLIT_CHUNK)
+        buf = memoryview(self._blit_buffer)
+        write = self._write_data_block
+
+        with open(file_path, "rb") as raw_file:
+            magic, width, height, pixel_format, flags = struct.unpack("<2sHHBB", raw_file.read(8))
+            if magic != RAW_MAGIC or pixel_format != RAW_FORMAT_RGB565:
+                raise ValueError("El archivo no es una imagen RGB565 cruda.")
+
+            visible = self.display.clip(x, y, x + width - 1, y + height - 1)
+            if visible is None:
+                return
+            x0, y0, x1, y1 = visible
+            clipped = x0 != x or y0 != y or x1 != x + width - 1 or y1 != y + height - 1
+
+            self.set_active_window(x0, y0, x1, y1)
+            self.write_cmd(0x2C)  # Comando para escribir en memoria
+
+            if clipped:
+                self._blit_raw_clipped(raw_file, buf, flags, x, y, width, x0, y0, x1, y1)
+                return
+
+            if not flags & RAW_FLAG_RLE:
+                # Sin compresión: lectura secuencial directa al SPI
+                remaining = width * height * 2
+                while remaining > 0:
+                    n = raw_file.readinto(buf[:min(BLIT_CHUNK, remaining)])
+                    if not n:
+                        break
+                    write(buf[:n])
+                    remaining -= n
+                return
+
+            # Con RLE: se decodifica paquete a paquete en el buffer y se envía al llenarse
+            packet = bytearray(1)
+            remaining = width * height
+            pos = 0
+            while remaining > 0:
+                raw_file.readinto(packet)
+                n = packet[0]
+                if n < 128:
+                    count = n + 1
+                    size = count * 2
+                    if pos + size > BLIT_CHUNK:
+                        write(buf[:pos])
+                        pos = 0
+                    raw_file.readinto(buf[pos:pos + size])
+                else:
+                    count = n - 126
+                    size = count * 2
+                    if pos + size > BLIT_CHUNK:
+                        write(buf[:pos])
+                        pos = 0
+                    raw_file.readinto(buf[pos:pos + 2])
+                    _repeat_pixel(buf, pos, size)
+                pos += size
+                remaining -= count
+            if pos:
+                write(buf[:pos])
+
+    def _blit_raw_clipped(self, raw_file, buf, flags, x, y, width, x0, y0, x1, y1):
+        """Envía solo las columnas x0..x1 de las filas y0..y1 de una imagen cruda (ventana ya configurada)."""
+        write = self._write_data_block
+        row_bytes = width * 2
+        first = (x0 - x) * 2
+        last = (x1 - x + 1) * 2
+
+        if not flags & RAW_FLAG_RLE:
+            # Sin compresión: cada tramo visible se lee directamente de su posición
+            size = last - first
+            for row in range(y0 - y, y1 - y + 1):
+                raw_file.seek(8 + row * row_bytes + first)
+                raw_file.readinto(buf[:size])
+                write(buf[:size])
+            return
+
+        # Con RLE hay que decodificar fila a fila hasta la última visible
+        line = buf if row_bytes <= BLIT_CHUNK else memoryview(bytearray(row_bytes))
+        packet = bytearray(1)
+        pixel = bytearray(2)
+        row = 0
+        col = 0  # Bytes ya decodificados de la fila actual
+        while row <= y1 - y:
+            raw_file.readinto(packet)
+            n = packet[0]
+            literal = n < 128
+            count = n + 1 if literal else n - 126
+            if not literal:
+                raw_file.readinto(pixel)
+            while count and row <= y1 - y:
+                take = min(count, (row_bytes - col) >> 1)
+                size = take * 2
+                if literal:
+                    raw_file.readinto(line[col:col + size])
+                else:
+                    line[col] = pixel[0]
+                    line[col + 1] = pixel[1]
+                    _repeat_pixel(line, col, size)
+                col += size
+                count -= take
+                if col == row_bytes:
+                    if row >= y0 - y:
+                        write(line[first:last])
+                    row += 1
+                    col = 0
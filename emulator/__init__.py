@@ -0,0 +1,67 @@
+"""
+Emulador para el PC de los módulos machine y utime de MicroPython.
+
+Permite ejecutar los scripts del repositorio en Linux (por ejemplo en CI) y
+medir lo que envían al hardware:
+
+    import emulator
+    emulator.install(max_frames=10)       # machine/utime falsos y reloj virtual
+    lcd = emulator.ST7789Model()           # memoria del ST7789 de la ESP32-S3-GEEK
+    matrix = emulator.HUB75Model("rgb")    # panel HUB75 de enfin.py
+    ...
+    emulator.bus.total.snapshot()          # bytes SPI, cambios de CS, escrituras de pin
+
+O desde la línea de comandos:
+
+    python -m emulator enfin.py --frames 10 --ppm matriz.ppm
+
+Las esperas (sleep, sleep_ms, sleep_us) no duermen: avanzan un reloj virtual.
+Los hilos de _thread comparten ese reloj, así que con dos núcleos (lunes.py)
+las esperas de uno alargan los frames del otro. El PIO del RP2040
+(displays.hub75.PioBackend) no se emula.
+"""
+import sys
+import time as _time
+
+from . import machine, utime
+from .bus import Bus, Counters, Stop, bus
+from .matrix import WIRINGS, HUB75Model
+from .st7789 import ST7789Model
+
+# Funciones de utime que MicroPython también ofrece en el módulo time
+_TIME_FUNCTIONS = ("sleep", "sleep_ms", "sleep_us", "ticks_ms", "ticks_us", "ticks_cpu",
+                   "ticks_diff", "ticks_add")
+_saved_time = {}
+
+
+def install(max_frames=None, max_time_ms=None):
+    """
+    Registra machine y utime falsos en sys.modules, añade al módulo time las
+    funciones de MicroPython (con reloj virtual) y reinicia el bus.
+    :param max_frames: Lanza Stop al terminar este número de frames.
+    :param max_time_ms: Lanza Stop al llegar a este tiempo virtual.
+    :return: El bus del emulador.
+    """
+    bus.reset()
+    bus.max_frames = max_frames
+    bus.max_time_us = None if max_time_ms is None else max_time_ms * 1000
+    sys.modules["machine"] = machine
+    sys.modules["utime"] = utime
+    for name in _TIME_FUNCTIONS:
+        if name not in _saved_time:
+            _saved_time[name] = getattr(_time, name, None)
+        setattr(_time, name, getattr(utime, name))
+    return bus
+
+
+def uninstall():
+    """Deshace install(): quita los módulos falsos y restaura el módulo time."""
+    for name in ("machine", "utime"):
+        if sys.modules.get(name) in (machine, utime):
+            del sys.modules[name]
+    for name, original in _saved_time.items():
+        if original is None:
+            delattr(_time, name)
+        else:
+            setattr(_time, name, original)
+    _saved_time.clear()
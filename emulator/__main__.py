@@ -0,0 +1,85 @@
+"""
+Ejecuta un script del repositorio con el hardware emulado e informa del tráfico.
+
+Uso:
+    python -m emulator enfin.py --frames 10 --ppm matriz.ppm
+    python -m emulator esp32s3GEEK-fixes.py --ppm pantalla.ppm
+
+Los bucles infinitos de refresco se cortan con --frames o --time-ms.
+"""
+import argparse
+import os
+import runpy
+import sys
+
+import emulator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ejecuta un script con machine/utime emulados.")
+    parser.add_argument("script", help="Script de MicroPython a ejecutar")
+    parser.add_argument("--frames", type=int, default=None,
+                        help="Parar tras este número de frames HUB75")
+    parser.add_argument("--time-ms", type=float, default=None,
+                        help="Parar al llegar a este tiempo virtual (por defecto 10 s si no hay --frames)")
+    parser.add_argument("--display", choices=("st7789", "hub75"),
+                        help="Display conectado (por defecto HUB75 si el script usa displays.hub75)")
+    parser.add_argument("--wiring", default="rgb", choices=sorted(emulator.WIRINGS),
+                        help="Conexionado del panel HUB75 (rgb: enfin.py; gbr: pruebaRGB.py, lunes.py)")
+    parser.add_argument("--scan-rows", type=int, default=32, help="Filas multiplexadas del panel HUB75")
+    parser.add_argument("--ppm", help="Guardar la imagen final (ST7789 o HUB75) en este archivo PPM")
+    args = parser.parse_args()
+
+    time_ms = args.time_ms
+    if time_ms is None and args.frames is None:
+        time_ms = 10_000
+    display = args.display
+    if display is None:
+        with open(args.script, encoding="utf-8") as source:
+            display = "hub75" if "hub75" in source.read() else "st7789"
+
+    bus = emulator.install(max_frames=args.frames, max_time_ms=time_ms)
+    # Los dos displays comparten números de GPIO (CS del ST7789 = línea A del
+    # HUB75), así que solo se conecta el modelo del que usa el script
+    if display == "st7789":
+        model = emulator.ST7789Model()
+    else:
+        model = emulator.HUB75Model(args.wiring, scan_rows=args.scan_rows)
+
+    # Los hilos de _thread que terminan con Stop no deben llenar la salida de trazas
+    default_hook = sys.unraisablehook
+
+    def quiet_hook(unraisable):
+        if not isinstance(unraisable.exc_value, emulator.Stop):
+            default_hook(unraisable)
+
+    sys.unraisablehook = quiet_hook
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.script)))
+
+    stopped = "fin del script"
+    try:
+        runpy.run_path(args.script, run_name="__main__")
+    except emulator.Stop as stop:
+        stopped = str(stop)
+    except Exception as error:  # El informe se muestra igualmente
+        stopped = "%s: %s" % (type(error).__name__, error)
+
+    print("Parada: %s" % stopped)
+    print("Tiempo virtual: %.3f ms" % (bus.now_us / 1000))
+    for name, value in bus.total.snapshot().items():
+        print("%-12s %d" % (name, value))
+    if display == "st7789":
+        print("ST7789: %d píxeles escritos, comandos %s" % (
+            model.pixels_written, ", ".join("0x%02X x%d" % item for item in sorted(model.commands.items()))))
+    elif model.frames:
+        times = bus.frame_times_us
+        frame_us = (times[-1] - times[0]) / (len(times) - 1) if len(times) > 1 else times[0]
+        print("HUB75: %d frames, %.1f µs por frame" % (model.frames, frame_us))
+
+    if args.ppm:
+        model.write_ppm(args.ppm)
+        print("Imagen guardada en %s" % args.ppm)
+
+
+if __name__ == "__main__":
+    main()
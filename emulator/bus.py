@@ -0,0 +1,131 @@
+"""
+Estado compartido del emulador: reloj virtual, nivel de cada pin y contadores.
+
+Los Pin y SPI falsos informan aquí de cada escritura; los modelos de display
+(ST7789Model, HUB75Model) se suscriben para interpretar lo que se envía.
+"""
+
+
+class Stop(Exception):
+    """Se lanza cuando se alcanza el límite de frames o de tiempo virtual."""
+
+
+class Counters:
+    """Contadores de tráfico: bytes y escrituras SPI, cambios de CS, escrituras de pin y tiempo dormido."""
+
+    FIELDS = ("spi_bytes", "spi_writes", "cs_toggles", "pin_writes", "sleep_us")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.spi_bytes = 0
+        self.spi_writes = 0
+        self.cs_toggles = 0
+        self.pin_writes = 0
+        self.sleep_us = 0
+
+    def snapshot(self):
+        """Devuelve los contadores como diccionario."""
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class Bus:
+    """
+    Reloj virtual y registro de todo lo que los scripts escriben en el hardware.
+
+    El tiempo solo avanza con sleep/sleep_us (y, si se configura, con cada
+    transferencia SPI según su baudrate y con cada escritura de pin), así que
+    las medidas no dependen de la velocidad del PC.
+    """
+
+    def __init__(self):
+        self.pin_write_us = 0.0  # Coste estimado de una escritura de pin (0 = no cuenta)
+        self.spi_timing = True  # Sumar al reloj la duración de cada transferencia SPI
+        self._pin_listeners = []
+        self._spi_listeners = []
+        self.reset()
+
+    def reset(self):
+        """Vuelve a empezar: reloj a cero, pines a 0, contadores y límites borrados."""
+        self.now_us = 0.0
+        self.cpu_freq = 125_000_000
+        self.pins = {}
+        self.cs_pins = set()
+        self.total = Counters()
+        self.frame = Counters()
+        self.frames = []  # Contadores de cada frame terminado
+        self.frame_times_us = []  # Instante en que terminó cada frame
+        self.max_frames = None
+        self.max_time_us = None
+        self.stopped = None  # Motivo de la parada; desde entonces todo acceso lanza Stop
+        self._pin_listeners.clear()
+        self._spi_listeners.clear()
+
+    def add_pin_listener(self, listener):
+        """Registra listener(pin_id, valor, valor_anterior) para cada escritura de pin."""
+        self._pin_listeners.append(listener)
+
+    def add_spi_listener(self, listener):
+        """Registra listener(spi, datos) para cada escritura SPI."""
+        self._spi_listeners.append(listener)
+
+    def stop(self, reason):
+        """Detiene la emulación: esta y todas las siguientes operaciones lanzan Stop."""
+        self.stopped = reason
+        raise Stop(reason)
+
+    def pin_write(self, pin_id, value):
+        if self.stopped:
+            raise Stop(self.stopped)
+        old = self.pins.get(pin_id, 0)
+        self.pins[pin_id] = value
+        self.total.pin_writes += 1
+        self.frame.pin_writes += 1
+        if pin_id in self.cs_pins and value != old:
+            self.total.cs_toggles += 1
+            self.frame.cs_toggles += 1
+        if self.pin_write_us:
+            self.advance(self.pin_write_us)
+        for listener in self._pin_listeners:
+            listener(pin_id, value, old)
+
+    def spi_write(self, spi, data):
+        if self.stopped:
+            raise Stop(self.stopped)
+        n = len(data)
+        self.total.spi_bytes += n
+        self.total.spi_writes += 1
+        self.frame.spi_bytes += n
+        self.frame.spi_writes += 1
+        for listener in self._spi_listeners:
+            listener(spi, data)
+        if self.spi_timing and spi.baudrate:
+            self.advance(n * 8_000_000 / spi.baudrate)
+
+    def sleep_us(self, us):
+        if self.stopped:
+            raise Stop(self.stopped)
+        if us > 0:
+            self.total.sleep_us += us
+            self.frame.sleep_us += us
+            self.advance(us)
+
+    def advance(self, us):
+        """Avanza el reloj virtual; lanza Stop si se pasa del tiempo máximo."""
+        if self.stopped:
+            raise Stop(self.stopped)
+        self.now_us += us
+        if self.max_time_us is not None and self.now_us >= self.max_time_us:
+            self.stop("Tiempo virtual agotado")
+
+    def end_frame(self):
+        """Cierra el frame actual: guarda sus contadores y lanza Stop si se llegó al máximo."""
+        self.frames.append(self.frame.snapshot())
+        self.frame_times_us.append(self.now_us)
+        self.frame.reset()
+        if self.max_frames is not None and len(self.frames) >= self.max_frames:
+            self.stop("Número de frames alcanzado")
+
+
+bus = Bus()
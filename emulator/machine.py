@@ -0,0 +1,145 @@
+"""
+Módulo machine falso: Pin, SPI, freq y mem32, conectados al bus del emulador.
+"""
+from .bus import bus
+
+# Registros SIO del RP2040 que usa displays.hub75.RowAddress para escribir el puerto
+_SIO_GPIO_OUT = 0xD0000010
+_SIO_GPIO_OUT_SET = 0xD0000014
+_SIO_GPIO_OUT_CLR = 0xD0000018
+_SIO_GPIO_OUT_XOR = 0xD000001C
+
+
+class Pin:
+    """Pin de salida o entrada; el nivel se guarda en el bus, compartido entre objetos del mismo número."""
+
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, id, mode=-1, pull=-1, value=None, **kwargs):
+        self.id = id
+        self.mode = mode
+        if value is not None:
+            self.value(value)
+
+    def init(self, mode=-1, pull=-1, value=None, **kwargs):
+        if mode != -1:
+            self.mode = mode
+        if value is not None:
+            self.value(value)
+
+    def value(self, x=None):
+        if x is None:
+            return bus.pins.get(self.id, 0)
+        bus.pin_write(self.id, 1 if x else 0)
+
+    __call__ = value
+
+    def on(self):
+        bus.pin_write(self.id, 1)
+
+    def off(self):
+        bus.pin_write(self.id, 0)
+
+    high = on
+    low = off
+
+    def irq(self, handler=None, trigger=0, **kwargs):
+        return None
+
+    def __repr__(self):
+        return "Pin(%s)" % (self.id,)
+
+
+class SPI:
+    """Bus SPI: cada escritura se cuenta y se pasa a los modelos de display."""
+
+    MSB = 0
+    LSB = 1
+
+    def __init__(self, id=0, baudrate=1_000_000, polarity=0, phase=0, bits=8, firstbit=MSB,
+                 sck=None, mosi=None, miso=None):
+        self.id = id
+        self.baudrate = baudrate
+        self.polarity = polarity
+        self.phase = phase
+
+    def init(self, baudrate=None, polarity=None, phase=None, **kwargs):
+        if baudrate is not None:
+            self.baudrate = baudrate
+        if polarity is not None:
+            self.polarity = polarity
+        if phase is not None:
+            self.phase = phase
+
+    def deinit(self):
+        pass
+
+    def write(self, buf):
+        bus.spi_write(self, bytes(buf))
+
+    def read(self, nbytes, write=0x00):
+        bus.spi_write(self, bytes((write,)) * nbytes)
+        return bytes(nbytes)
+
+    def readinto(self, buf, write=0x00):
+        bus.spi_write(self, bytes((write,)) * len(buf))
+        for i in range(len(buf)):
+            buf[i] = 0
+
+    def write_readinto(self, write_buf, read_buf):
+        bus.spi_write(self, bytes(write_buf))
+        for i in range(len(read_buf)):
+            read_buf[i] = 0
+
+
+def freq(hz=None):
+    """Frecuencia de la CPU: solo se guarda (no cambia la velocidad del emulador)."""
+    if hz is None:
+        return bus.cpu_freq
+    bus.cpu_freq = hz
+
+
+class _Mem32:
+    """Acceso a memoria de 32 bits; solo se emulan los registros de salida SIO del RP2040."""
+
+    def __getitem__(self, address):
+        if address in (_SIO_GPIO_OUT, _SIO_GPIO_OUT_SET, _SIO_GPIO_OUT_CLR, _SIO_GPIO_OUT_XOR):
+            value = 0
+            for pin_id, level in bus.pins.items():
+                if isinstance(pin_id, int) and level and 0 <= pin_id < 32:
+                    value |= 1 << pin_id
+            return value
+        return 0
+
+    def __setitem__(self, address, value):
+        if address == _SIO_GPIO_OUT:
+            current = self[address]
+            changed = current ^ value
+        elif address == _SIO_GPIO_OUT_SET:
+            changed = value & ~self[address]
+        elif address == _SIO_GPIO_OUT_CLR:
+            changed = value & self[address]
+        elif address == _SIO_GPIO_OUT_XOR:
+            changed = value
+        else:
+            return
+        for gpio in range(32):
+            if changed & (1 << gpio):
+                bus.pin_write(gpio, bus.pins.get(gpio, 0) ^ 1)
+
+
+mem32 = _Mem32()
+
+
+def idle():
+    pass
+
+
+def unique_id():
+    return b"\x00\x00\x00\x00\x00\x00\x00\x00"
@@ -0,0 +1,196 @@
+"""
+Modelo de un panel LED HUB75: reconstruye la imagen a partir de las formas de
+onda de color, CLK, LAT, OE y dirección que escriben los scripts.
+"""
+from .bus import bus
+
+_CONTROL = {"CLK": 11, "LAT": 12, "OE": 13, "A": 10, "B": 16, "C": 18, "D": 20, "E": 22}
+
+# Conexionados de los scripts del repositorio (número de GPIO de cada señal)
+WIRINGS = {
+    # enfin.py, matrix64x64micropython.py
+    "rgb": dict(_CONTROL, R1=2, G1=3, B1=4, R2=5, G2=8, B2=9),
+    # pruebaRGB.py, intentoDEpatronBINARIO.py, lunes.py
+    "gbr": dict(_CONTROL, G1=2, B1=3, R1=4, G2=5, B2=8, R2=9),
+}
+
+_COLOR_SIGNALS = ("R1", "G1", "B1", "R2", "G2", "B2")
+_ADDRESS_SIGNALS = ("A", "B", "C", "D", "E")
+ROW_PERIODS_KEPT = 4096  # Periodos entre latches que se guardan para medir el jitter
+
+
+class HUB75Model:
+    """
+    Panel HUB75 conectado al bus del emulador.
+
+    Cada flanco de subida de CLK desplaza los seis bits de color; el flanco de
+    subida de LAT pasa el registro de desplazamiento a la salida, en la fila que
+    indican las líneas de dirección. Mientras OE está a 0 la fila latcheada se
+    ve, y el tiempo virtual que pasa se suma como tiempo de encendido de cada
+    LED. Un frame termina cuando empieza a verse una fila con una dirección
+    menor que la anterior, o la misma fila después de volver a escribir su
+    dirección (refresco con una sola pareja encendida); así también se cuentan
+    los frames de un refresco que salta las filas apagadas o que no vuelve a
+    latchear una fila repetida. Los planos BCM de una fila se muestran sin
+    volver a seleccionarla, así que no cierran el frame.
+    """
+
+    def __init__(self, wiring="rgb", cols=64, scan_rows=32):
+        """
+        :param wiring: Nombre de WIRINGS o diccionario señal -> GPIO.
+        :param cols: Columnas del panel.
+        :param scan_rows: Filas multiplexadas (el panel tiene el doble).
+        """
+        self.wiring = WIRINGS[wiring] if isinstance(wiring, str) else wiring
+        self.cols = cols
+        self.scan_rows = scan_rows
+        self.frames = 0
+        self.row_periods_us = []  # Tiempo entre latches consecutivos
+        self.last_frame = None  # Tiempos de encendido del último frame completo
+        self._roles = {}
+        for name, gpio in self.wiring.items():
+            self._roles[gpio] = name
+        self._color_gpios = [self.wiring[name] for name in _COLOR_SIGNALS]
+        self._address_gpios = [self.wiring[name] for name in _ADDRESS_SIGNALS if name in self.wiring]
+        self._shift = []
+        self._latched = [0] * cols
+        self._latched_row = 0
+        self._last_shown_row = None
+        self._selected = False  # Se escribió la dirección desde la última fila mostrada
+        self._last_latch_us = None
+        # Instante desde el que la fila latcheada está encendida (OE activo a 0)
+        self._shown_since = None if bus.pins.get(self.wiring["OE"], 0) else bus.now_us
+        self._on_time = self._blank_image()
+        bus.add_pin_listener(self._on_pin)
+
+    def _blank_image(self):
+        return [[[0, 0, 0] for _ in range(self.cols)] for _ in range(self.scan_rows * 2)]
+
+    def _address(self):
+        pins = bus.pins
+        row = 0
+        for bit, gpio in enumerate(self._address_gpios):
+            if pins.get(gpio, 0):
+                row |= 1 << bit
+        return row % self.scan_rows
+
+    def _on_pin(self, pin_id, value, old):
+        role = self._roles.get(pin_id)
+        if role in _ADDRESS_SIGNALS:
+            # También cuenta si se vuelve a escribir el mismo valor
+            self._selected = True
+        if role is None or value == old:
+            return
+        if role == "CLK":
+            if value:
+                pins = bus.pins
+                bits = 0
+                for bit, gpio in enumerate(self._color_gpios):
+                    if pins.get(gpio, 0):
+                        bits |= 1 << bit
+                shift = self._shift
+                shift.append(bits)
+                if len(shift) > self.cols:
+                    del shift[0]
+        elif role == "LAT":
+            if value:
+                self._latch()
+        elif role == "OE":
+            if value:
+                if self._shown_since is not None:
+                    self._accumulate()
+                self._shown_since = None
+            else:
+                self._shown_since = bus.now_us
+                self._row_shown(self._latched_row)
+        elif role in _ADDRESS_SIGNALS:
+            # La fila iluminada cambia con la dirección aunque no haya latch
+            if self._shown_since is not None:
+                self._accumulate()
+                self._shown_since = bus.now_us
+            self._latched_row = self._address()
+
+    def _latch(self):
+        if self._shown_since is not None:
+            self._accumulate()
+            self._shown_since = bus.now_us
+        shift = self._shift
+        # El primer valor desplazado es la columna 0
+        self._latched = shift + [0] * (self.cols - len(shift))
+        self._shift = []
+        row = self._address()
+        self._latched_row = row
+
+        now = bus.now_us
+        if self._last_latch_us is not None:
+            periods = self.row_periods_us
+            periods.append(now - self._last_latch_us)
+            if len(periods) > ROW_PERIODS_KEPT:
+                del periods[0]
+        self._last_latch_us = now
+        if self._shown_since is not None:
+            self._row_shown(row)
+
+    def _row_shown(self, row):
+        """
+        Una fila empieza a verse; si su dirección es menor que la anterior, o
+        es la misma y se ha vuelto a seleccionar, empieza otro frame.
+        """
+        previous = self._last_shown_row
+        selected = self._selected
+        self._last_shown_row = row
+        self._selected = False
+        if previous is not None and (row < previous or (row == previous and selected)):
+            self.last_frame = self._on_time
+            self._on_time = self._blank_image()
+            self.frames += 1
+            bus.end_frame()
+
+    def _accumulate(self):
+        elapsed = bus.now_us - self._shown_since
+        if elapsed <= 0:
+            return
+        upper = self._on_time[self._latched_row]
+        lower = self._on_time[self._latched_row + self.scan_rows]
+        for col, bits in enumerate(self._latched):
+            if bits:
+                if bits & 0x01:
+                    upper[col][0] += elapsed
+                if bits & 0x02:
+                    upper[col][1] += elapsed
+                if bits & 0x04:
+                    upper[col][2] += elapsed
+                if bits & 0x08:
+                    lower[col][0] += elapsed
+                if bits & 0x10:
+                    lower[col][1] += elapsed
+                if bits & 0x20:
+                    lower[col][2] += elapsed
+
+    def image(self):
+        """
+        Devuelve el último frame completo (o el que está en curso si aún no hay
+        ninguno) como filas de (r, g, b) con el tiempo de encendido en µs.
+        """
+        frame = self.last_frame if self.last_frame is not None else self._on_time
+        return [[tuple(led) for led in row] for row in frame]
+
+    def lit(self):
+        """Devuelve el último frame como filas de (r, g, b) booleanos: si cada LED se encendió."""
+        return [[(r > 0, g > 0, b > 0) for r, g, b in row] for row in self.image()]
+
+    def write_ppm(self, path, scale=4):
+        """Guarda el último frame como imagen PPM, con el brillo proporcional al tiempo de encendido."""
+        image = self.image()
+        peak = max(max(max(led) for led in row) for row in image) or 1
+        height = len(image) * scale
+        width = self.cols * scale
+        data = bytearray()
+        for row in image:
+            line = bytearray()
+            for led in row:
+                line += bytes(min(255, int(value * 255 / peak)) for value in led) * scale
+            data += bytes(line) * scale
+        with open(path, "wb") as ppm:
+            ppm.write(b"P6 %d %d 255\n" % (width, height))
+            ppm.write(data)
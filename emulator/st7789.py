@@ -0,0 +1,212 @@
+"""
+Modelo del controlador ST7789: interpreta los comandos que llegan por SPI y
+mantiene una copia de su memoria de imagen (240x320, RGB565).
+"""
+from .bus import bus
+
+MEMORY_WIDTH = 240
+MEMORY_HEIGHT = 320
+
+# Parámetros que espera cada comando interpretado
+_PARAM_BYTES = {
+    0x2A: 4,  # CASET
+    0x2B: 4,  # RASET
+    0x30: 4,  # PTLAR
+    0x33: 6,  # VSCRDEF
+    0x36: 1,  # MADCTL
+    0x37: 2,  # VSCSAD
+    0x3A: 1,  # COLMOD
+}
+
+
+class ST7789Model:
+    """
+    Controlador ST7789 conectado al bus del emulador.
+
+    Solo atiende las escrituras SPI con CS a 0; DC a 0 indica comando y DC a 1
+    parámetros o píxeles. RAMWR escribe en la ventana de CASET/RASET con el
+    recorrido que fija MADCTL (MV intercambia filas y columnas, MX y MY las
+    invierten), igual que el chip.
+    """
+
+    def __init__(self, cs=10, dc=8, panel=(135, 240, 52, 40)):
+        """
+        :param cs: Número del pin Chip Select.
+        :param dc: Número del pin Data/Command.
+        :param panel: (ancho, alto, columna, fila) de la parte visible de la memoria.
+        """
+        self.cs = cs
+        self.dc = dc
+        self.panel = panel
+        self.memory = [[0] * MEMORY_WIDTH for _ in range(MEMORY_HEIGHT)]
+        self.commands = {}  # Veces que se recibió cada comando
+        self.pixels_written = 0
+        self.madctl = 0
+        self.columns = (0, MEMORY_WIDTH - 1)
+        self.rows = (0, MEMORY_HEIGHT - 1)
+        self.scroll_area = (0, MEMORY_HEIGHT, 0)  # VSCRDEF: fijas arriba, scroll, fijas abajo
+        self.scroll_start = 0  # VSCSAD
+        self.partial_area = None  # PTLAR con el modo parcial activo
+        self._partial_lines = (0, MEMORY_HEIGHT - 1)
+        self.display_on = False
+        self.sleeping = True
+        self.inverted = False
+        self._command = None
+        self._params = bytearray()
+        self._high = None  # Byte alto de un píxel a medias
+        bus.cs_pins.add(cs)
+        bus.add_spi_listener(self._on_spi)
+
+    # -- Recepción ---------------------------------------------------------
+
+    def _on_spi(self, spi, data):
+        pins = bus.pins
+        if pins.get(self.cs, 0):
+            return
+        if not pins.get(self.dc, 0):
+            for command in data:
+                self._start(command)
+        elif self._command == 0x2C:
+            self._pixels(data)
+        elif self._command is not None:
+            self._params += data
+            if len(self._params) >= _PARAM_BYTES.get(self._command, 1 << 30):
+                self._apply(self._command, self._params)
+                self._command = None
+
+    def _start(self, command):
+        self.commands[command] = self.commands.get(command, 0) + 1
+        self._command = command
+        self._params = bytearray()
+        if command == 0x2C:  # RAMWR: el puntero vuelve al inicio de la ventana
+            self._x = self.columns[0]
+            self._y = self.rows[0]
+            self._high = None
+        elif command == 0x01:  # SWRESET
+            self.madctl = 0
+            self.scroll_area = (0, MEMORY_HEIGHT, 0)
+            self.scroll_start = 0
+            self.partial_area = None
+            self.display_on = False
+            self.sleeping = True
+        elif command == 0x11:  # SLPOUT
+            self.sleeping = False
+        elif command == 0x10:  # SLPIN
+            self.sleeping = True
+        elif command == 0x12:  # PTLON
+            self.partial_area = self._partial_lines
+        elif command == 0x13:  # NORON
+            self.partial_area = None
+        elif command == 0x20:  # INVOFF
+            self.inverted = False
+        elif command == 0x21:  # INVON
+            self.inverted = True
+        elif command == 0x28:  # DISPOFF
+            self.display_on = False
+        elif command == 0x29:  # DISPON
+            self.display_on = True
+
+    def _apply(self, command, p):
+        if command == 0x2A:
+            self.columns = ((p[0] << 8) | p[1], (p[2] << 8) | p[3])
+        elif command == 0x2B:
+            self.rows = ((p[0] << 8) | p[1], (p[2] << 8) | p[3])
+        elif command == 0x36:
+            self.madctl = p[0]
+        elif command == 0x33:
+            self.scroll_area = ((p[0] << 8) | p[1], (p[2] << 8) | p[3], (p[4] << 8) | p[5])
+        elif command == 0x37:
+            self.scroll_start = (p[0] << 8) | p[1]
+        elif command == 0x30:
+            self._partial_lines = ((p[0] << 8) | p[1], (p[2] << 8) | p[3])
+            if self.partial_area is not None:
+                self.partial_area = self._partial_lines
+
+    def _pixels(self, data):
+        i = 0
+        if self._high is not None:
+            if not data:
+                return
+            self._store((self._high << 8) | data[0])
+            self._high = None
+            i = 1
+        n = len(data)
+        while i + 1 < n:
+            self._store((data[i] << 8) | data[i + 1])
+            i += 2
+        if i < n:
+            self._high = data[i]
+
+    def _store(self, color):
+        x = self._x
+        y = self._y
+        madctl = self.madctl
+        if madctl & 0x20:
+            column, row = y, x
+        else:
+            column, row = x, y
+        if madctl & 0x40:
+            column = MEMORY_WIDTH - 1 - column
+        if madctl & 0x80:
+            row = MEMORY_HEIGHT - 1 - row
+        if 0 <= column < MEMORY_WIDTH and 0 <= row < MEMORY_HEIGHT:
+            self.memory[row][column] = color
+        self.pixels_written += 1
+
+        # Avanzar dentro de la ventana; al final vuelve al principio
+        x += 1
+        if x > self.columns[1]:
+            x = self.columns[0]
+            y += 1
+            if y > self.rows[1]:
+                y = self.rows[0]
+        self._x = x
+        self._y = y
+
+    # -- Lo que se ve ------------------------------------------------------
+
+    def _shown_line(self, line):
+        """Línea de memoria que se muestra en la línea física `line`, según el scroll."""
+        top, size, _ = self.scroll_area
+        if size and top <= line < top + size:
+            return top + (line - top + self.scroll_start - top) % size
+        return line
+
+    def screen(self):
+        """
+        Devuelve la parte visible del panel, en la orientación nativa, como lista de
+        filas de colores RGB565, aplicando el scroll y el modo parcial.
+        Las líneas apagadas (display apagado o fuera del área parcial) valen None.
+        """
+        width, height, column, row = self.panel
+        rows = []
+        for y in range(height):
+            line = row + y
+            if not self.display_on or (self.partial_area is not None and
+                                       not self.partial_area[0] <= line <= self.partial_area[1]):
+                rows.append([None] * width)
+                continue
+            source = self.memory[self._shown_line(line)]
+            rows.append(source[column:column + width])
+        return rows
+
+    def write_ppm(self, path):
+        """
+        Guarda lo que se ve en el panel como imagen PPM (para revisarla en el PC).
+        Los colores son los de la memoria; INVON no se aplica porque los paneles IPS
+        que lo necesitan ya muestran así el color correcto.
+        """
+        rows = self.screen()
+        width, height = self.panel[0], self.panel[1]
+        data = bytearray()
+        for line in rows:
+            for color in line:
+                if color is None:
+                    data += b"\x00\x00\x00"
+                    continue
+                data.append(((color >> 11) & 0x1F) * 255 // 31)
+                data.append(((color >> 5) & 0x3F) * 255 // 63)
+                data.append((color & 0x1F) * 255 // 31)
+        with open(path, "wb") as ppm:
+            ppm.write(b"P6 %d %d 255\n" % (width, height))
+            ppm.write(data)
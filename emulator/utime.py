@@ -0,0 +1,47 @@
+"""
+Módulo utime falso: las esperas avanzan el reloj virtual del bus en lugar de dormir.
+"""
+import time as _time
+
+from .bus import bus
+
+_yield = _time.sleep  # El original: install() sustituye time.sleep por la versión virtual
+
+
+def sleep(seconds):
+    bus.sleep_us(seconds * 1_000_000)
+    _yield(0)  # Cede el GIL a los demás hilos (_thread)
+
+
+def sleep_ms(ms):
+    bus.sleep_us(ms * 1000)
+    _yield(0)
+
+
+def sleep_us(us):
+    bus.sleep_us(us)
+    _yield(0)
+
+
+def ticks_us():
+    return int(bus.now_us)
+
+
+def ticks_ms():
+    return int(bus.now_us // 1000)
+
+
+def ticks_cpu():
+    return int(bus.now_us * bus.cpu_freq // 1_000_000)
+
+
+def ticks_diff(ticks1, ticks2):
+    return ticks1 - ticks2
+
+
+def ticks_add(ticks, delta):
+    return ticks + delta
+
+
+def time():
+    return int(bus.now_us // 1_000_000)
@@ -1,105 +1,172 @@
-import machine
-import utime
+from displays import hub75
 
-# Overclock a 280 MHz
-machine.freq(280_000_000)
+# Frames de 64x64 guardados como constantes de bytes: 8 bytes por fila
+# (big-endian, el bit más significativo es la columna 0). Importar el script no
+# analiza ninguna lista; se generan en el PC con
+# hub75.frame_bytes(hub75.pack_hex(datos)) o hub75.frame_bytes(hub75.pack_binary(bits)).
 
-# Configuración de pines
-pins = {
-    "R1": machine.Pin(2, machine.Pin.OUT),
-    "G1": machine.Pin(3, machine.Pin.OUT),
-    "B1": machine.Pin(4, machine.Pin.OUT),
-    "R2": machine.Pin(5, machine.Pin.OUT),
-    "G2": machine.Pin(8, machine.Pin.OUT),
-    "B2": machine.Pin(9, machine.Pin.OUT),
-    "CLK": machine.Pin(11, machine.Pin.OUT),
-    "LAT": machine.Pin(12, machine.Pin.OUT),
-    "OE": machine.Pin(13, machine.Pin.OUT),
-    "A": machine.Pin(10, machine.Pin.OUT),
-    "B": machine.Pin(16, machine.Pin.OUT),
-    "C": machine.Pin(18, machine.Pin.OUT),
-    "D": machine.Pin(20, machine.Pin.OUT),
-    "E": machine.Pin(22, machine.Pin.OUT),
-}
+# Frame de los datos hexadecimales
+FRAME_HEX = (
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x33\x3f\x30\x60\x7c\x00\x00\x00"
+    b"\x33\x3f\x30\x60\xfe\x00\x00\x00"
+    b"\x33\x20\x30\x60\xee\x00\x00\x00"
+    b"\x33\x20\x30\x60\xc6\x00\x00\x00"
+    b"\x3f\x38\x30\x60\xc6\x00\x00\x00"
+    b"\x3f\x38\x30\x60\xc6\x00\x1c\x00"
+    b"\x33\x20\x30\x60\xc6\x00\x40\x00"
+    b"\x33\x20\x30\x60\xee\x00\x40\x00"
+    b"\x33\x3f\x3e\x7c\xfe\x00\x20\x00"
+    b"\x33\x3f\x3e\x7c\x7c\x00\x0e\x00"
+    b"\x00\x00\x00\x00\x00\x00\x04\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x80\x00\x21\xf0\xff\x83\x00\x00"
+    b"\x80\x00\x23\xf8\xff\xc3\x00\x00"
+    b"\x80\x00\x67\x1c\xc7\xe3\x00\x00"
+    b"\xc0\x00\x66\x0c\xc1\xe3\x00\x00"
+    b"\xc0\x40\x66\x0c\xc0\xe3\x00\x00"
+    b"\xe0\x40\xe6\x0c\xc0\xe3\x00\x00"
+    b"\xe0\x40\xe6\x0c\xc1\xc3\x00\x00"
+    b"\x70\xe1\xc6\x0c\xc3\x83\x00\x00"
+    b"\x79\xf1\xc6\x0c\xc7\x03\x00\x00"
+    b"\x79\xb3\x86\x0c\xfc\x03\x00\x00"
+    b"\x3d\xb3\x86\x0c\xde\x03\x02\x00"
+    b"\x3d\xb7\x86\x0c\xcf\x03\x02\x00"
+    b"\x3f\x1f\x86\x0c\xc7\x83\x02\x00"
+    b"\x1f\x1f\x07\x1c\xc3\xc3\x02\x00"
+    b"\x0f\x1e\x03\xf8\xc1\xe3\xfa\x00"
+    b"\x06\x0c\x01\xf0\xc0\xf3\xfa\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x77\x00\x00\x00\x00"
+    b"\x00\xee\x00\x88\x80\x00\x00\x00"
+    b"\x01\xff\x01\x08\x40\x00\x00\x00"
+    b"\x01\xff\x01\x00\x40\x00\x00\x00"
+    b"\x00\xfe\x01\x00\x40\x00\x00\x00"
+    b"\x00\x7c\x00\x80\x80\x00\x0c\x60"
+    b"\x00\x38\x00\x41\x00\x00\x1e\xf0"
+    b"\x00\x10\x00\x22\x00\x00\x3f\xf8"
+    b"\x00\x00\x00\x14\x00\x00\x3f\xf8"
+    b"\x00\x00\x00\x08\x00\x00\x1f\xf0"
+    b"\x00\x00\x00\x00\x00\x00\x0f\xe0"
+    b"\x00\x00\x00\x00\x00\x00\x07\xc0"
+    b"\x00\x00\x00\x00\x00\x00\x03\x80"
+    b"\x00\x00\x00\x00\x00\x00\x01\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+)
 
-def refresh_display(buffer):
-    for row in range(32):
-        clear_output()
-        select_row(row)
-        illuminate_row(row, buffer)
-        pins["LAT"].value(1)
-        pins["LAT"].value(0)
-        pins["OE"].value(0)
-        utime.sleep_us(100)
-
-# Apaga los LEDs
-def clear_output():
-    pins["OE"].value(1)  # Apaga todas las filas
-
-# Selecciona la fila específica
-def select_row(row):
-    binary = "{:05b}".format(row)
-    pins["A"].value(int(binary[4]))
-    pins["B"].value(int(binary[3]))
-    pins["C"].value(int(binary[2]))
-    pins["D"].value(int(binary[1]))
-    pins["E"].value(int(binary[0]))
-
-# Enciende los LEDs según el buffer
-def illuminate_row(row, buffer):
-    for col in range(64):
-        pins["R1"].value(buffer[row][col])       # R1 (Arriba)
-        pins["R2"].value(buffer[row + 32][col]) # R2 (Abajo)
-        pins["CLK"].value(1)
-        pins["CLK"].value(0)
-
-# Conversión de formato hexadecimal a matriz de 64x64
-def hex_to_buffer(hex_data):
-    buffer = [[0 for _ in range(64)] for _ in range(64)]
-    for row, hex_value in enumerate(hex_data):
-        try:
-            if isinstance(hex_value, str) and hex_value.startswith("0x"):
-                int_value = int(hex_value, 16)
-            elif isinstance(hex_value, int):
-                int_value = hex_value
-            else:
-                raise ValueError(f"Valor inválido en fila {row}: {hex_value}")
-
-            binary_string = f"{int_value:064b}"
-            for col, bit in enumerate(binary_string):
-                buffer[row][col] = int(bit)
-        except Exception as e:
-            print(f"Error al procesar la fila {row}: {e}")
-            raise
-    return buffer
-
-# Conversión de formato binario a matriz de 64x64
-def binary_to_buffer(binary_data):
-    if len(binary_data) != 64 * 64:
-        raise ValueError("El formato binario debe contener exactamente 64x64 = 4096 elementos.")
-    
-    buffer = []
-    for i in range(64):
-        buffer.append(binary_data[i * 64:(i + 1) * 64])
-    return buffer
+# Frame de los datos binarios (64x64 bits)
+FRAME_BIN = (
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x33\x3f\x30\x60\x7c\x00\x00\x00"
+    b"\x33\x3f\x30\x60\xfe\x00\x00\x00"
+    b"\x33\x20\x30\x60\xee\x00\x00\x00"
+    b"\x33\x20\x30\x60\xc6\x00\x00\x00"
+    b"\x3f\x38\x30\x60\xc6\x00\x00\x00"
+    b"\x3f\x38\x30\x60\xc6\x00\x1b\x00"
+    b"\x33\x20\x30\x60\xc6\x00\x3f\x80"
+    b"\x33\x20\x30\x60\xee\x00\x3f\x80"
+    b"\x33\x3f\x3e\x7c\xfe\x00\x1f\x00"
+    b"\x33\x3f\x3e\x7c\x7c\x00\x0e\x00"
+    b"\x00\x00\x00\x00\x00\x00\x04\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x80\x00\x21\xf0\xff\x83\x01\xe0"
+    b"\x80\x00\x23\xf8\xff\xc3\x01\xf0"
+    b"\x80\x00\x67\x1c\xc7\xe3\x01\xf8"
+    b"\xc0\x00\x66\x0c\xc1\xe3\x01\x9c"
+    b"\xc0\x40\x66\x0c\xc0\xe3\x01\x8e"
+    b"\xe0\x40\xe6\x0c\xc0\xe3\x01\x86"
+    b"\xe0\x40\xe6\x0c\xc1\xc3\x01\x86"
+    b"\x70\xe1\xc6\x0c\xc3\x83\x01\x86"
+    b"\x79\xf1\xc6\x0c\xc7\x03\x01\x86"
+    b"\x79\xb3\x86\x0c\xfc\x03\x01\x86"
+    b"\x3d\xb3\x86\x0c\xde\x03\x01\x86"
+    b"\x3d\xb7\x86\x0c\xcf\x03\x01\x8e"
+    b"\x3f\x1f\x86\x0c\xc7\x83\x01\x9c"
+    b"\x1f\x1f\x07\x1c\xc3\xc3\x01\xf8"
+    b"\x0f\x1e\x03\xf8\xc1\xe3\xf9\xf0"
+    b"\x06\x0c\x01\xf0\xc0\xf3\xf9\xe0"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x77\x00\x00\x00\x00"
+    b"\x00\xee\x00\x88\x80\x00\x00\x00"
+    b"\x01\xff\x01\x08\x40\x00\x00\x00"
+    b"\x01\xff\x01\x00\x40\x00\x00\x00"
+    b"\x00\xfe\x01\x00\x40\x00\x00\x00"
+    b"\x00\x7c\x00\x80\x80\x00\x0c\x60"
+    b"\x00\x38\x00\x41\x00\x00\x1e\xf0"
+    b"\x00\x10\x00\x22\x00\x00\x3f\xf8"
+    b"\x00\x00\x00\x14\x00\x00\x3f\xf8"
+    b"\x00\x00\x00\x08\x00\x00\x1f\xf0"
+    b"\x00\x00\x00\x00\x00\x00\x0f\xe0"
+    b"\x00\x00\x00\x00\x00\x00\x07\xc0"
+    b"\x00\x00\x00\x00\x00\x00\x03\x80"
+    b"\x00\x00\x00\x00\x00\x00\x01\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00"
+)
 
 # Selección del formato de datos
-FORMAT_OPTION = "HEX"  # Cambiar a "HEX" si quieres usar datos hexadecimales
+FORMAT_OPTION = "HEX"  # Cambiar a "BIN" para usar el frame de los datos binarios
 
 if FORMAT_OPTION == "HEX":
-    hex_data = [
-0x0000000000000000, 0x333f30607c000000, 0x333f3060fe000000, 0x33203060ee000000, 0x33203060c6000000, 0x3f383060c6000000, 0x3f383060c6001c00, 0x33203060c6004000, 0x33203060ee004000, 0x333f3e7cfe002000, 0x333f3e7c7c000e00, 0x0000000000000400, 0x0000000000000000, 0x0000000000000000, 0x0000000000000000, 0x0000000000000000, 0x0000000000000000, 0x0000000000000000, 0x0000000000000000, 0x0000000000000000, 0x0000000000000000, 0x0000000000000000, 0x0000000000000000, 0x800021f0ff830000, 0x800023f8ffc30000, 0x8000671cc7e30000, 0xc000660cc1e30000, 0xc040660cc0e30000, 0xe040e60cc0e30000, 0xe040e60cc1c30000, 0x70e1c60cc3830000, 0x79f1c60cc7030000, 0x79b3860cfc030000, 0x3db3860cde030200, 0x3db7860ccf030200, 0x3f1f860cc7830200, 0x1f1f071cc3c30200, 0x0f1e03f8c1e3fa00, 0x060c01f0c0f3fa00, 0x0000000000000000, 0x0000000000000000, 0x0000000000000000, 0x0000000000000000, 0x0000000000000000, 0x0000000000000000, 0x0000000000000000, 0x0000000000000000, 0x0000007700000000, 0x00ee008880000000, 0x01ff010840000000, 0x01ff010040000000, 0x00fe010040000000, 0x007c008080000c60, 0x0038004100001ef0, 0x0010002200003ff8, 0x0000001400003ff8, 0x0000000800001ff0, 0x0000000000000fe0, 0x00000000000007c0, 0x0000000000000380, 0x0000000000000100, 0x0000000000000000, 0x0000000000000000, 0x0000000000000000    ]
-    buffer = hex_to_buffer(hex_data)
-
+    frame = hub75.pack_bytes(FRAME_HEX)
 elif FORMAT_OPTION == "BIN":
-    binary_data = [
-        0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,1,1,0,0,1,1,0,0,1,1,1,1,1,1,0,0,1,1,0,0,0,0,0,1,1,0,0,0,0,0,0,1,1,1,1,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,1,1,0,0,1,1,0,0,1,1,1,1,1,1,0,0,1,1,0,0,0,0,0,1,1,0,0,0,0,0,1,1,1,1,1,1,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,1,1,0,0,1,1,0,0,1,0,0,0,0,0,0,0,1,1,0,0,0,0,0,1,1,0,0,0,0,0,1,1,1,0,1,1,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,1,1,0,0,1,1,0,0,1,0,0,0,0,0,0,0,1,1,0,0,0,0,0,1,1,0,0,0,0,0,1,1,0,0,0,1,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,1,1,1,1,1,1,0,0,1,1,1,0,0,0,0,0,1,1,0,0,0,0,0,1,1,0,0,0,0,0,1,1,0,0,0,1,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,1,1,1,1,1,1,0,0,1,1,1,0,0,0,0,0,1,1,0,0,0,0,0,1,1,0,0,0,0,0,1,1,0,0,0,1,1,0,0,0,0,0,0,0,0,0,0,0,0,1,1,0,1,1,0,0,0,0,0,0,0,0, 0,0,1,1,0,0,1,1,0,0,1,0,0,0,0,0,0,0,1,1,0,0,0,0,0,1,1,0,0,0,0,0,1,1,0,0,0,1,1,0,0,0,0,0,0,0,0,0,0,0,1,1,1,1,1,1,1,0,0,0,0,0,0,0, 0,0,1,1,0,0,1,1,0,0,1,0,0,0,0,0,0,0,1,1,0,0,0,0,0,1,1,0,0,0,0,0,1,1,1,0,1,1,1,0,0,0,0,0,0,0,0,0,0,0,1,1,1,1,1,1,1,0,0,0,0,0,0,0, 0,0,1,1,0,0,1,1,0,0,1,1,1,1,1,1,0,0,1,1,1,1,1,0,0,1,1,1,1,1,0,0,1,1,1,1,1,1,1,0,0,0,0,0,0,0,0,0,0,0,0,1,1,1,1,1,0,0,0,0,0,0,0,0, 0,0,1,1,0,0,1,1,0,0,1,1,1,1,1,1,0,0,1,1,1,1,1,0,0,1,1,1,1,1,0,0,0,1,1,1,1,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,1,1,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,0,0,0,0,1,1,1,1,1,0,0,0,0,1,1,1,1,1,1,1,1,1,0,0,0,0,0,1,1,0,0,0,0,0,0,0,1,1,1,1,0,0,0,0,0, 1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,0,0,0,1,1,1,1,1,1,1,0,0,0,1,1,1,1,1,1,1,1,1,1,0,0,0,0,1,1,0,0,0,0,0,0,0,1,1,1,1,1,0,0,0,0, 1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,1,0,0,1,1,1,0,0,0,1,1,1,0,0,1,1,0,0,0,1,1,1,1,1,1,0,0,0,1,1,0,0,0,0,0,0,0,1,1,1,1,1,1,0,0,0, 1,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,1,0,0,1,1,0,0,0,0,0,1,1,0,0,1,1,0,0,0,0,0,1,1,1,1,0,0,0,1,1,0,0,0,0,0,0,0,1,1,0,0,1,1,1,0,0, 1,1,0,0,0,0,0,0,0,1,0,0,0,0,0,0,0,1,1,0,0,1,1,0,0,0,0,0,1,1,0,0,1,1,0,0,0,0,0,0,1,1,1,0,0,0,1,1,0,0,0,0,0,0,0,1,1,0,0,0,1,1,1,0, 1,1,1,0,0,0,0,0,0,1,0,0,0,0,0,0,1,1,1,0,0,1,1,0,0,0,0,0,1,1,0,0,1,1,0,0,0,0,0,0,1,1,1,0,0,0,1,1,0,0,0,0,0,0,0,1,1,0,0,0,0,1,1,0, 1,1,1,0,0,0,0,0,0,1,0,0,0,0,0,0,1,1,1,0,0,1,1,0,0,0,0,0,1,1,0,0,1,1,0,0,0,0,0,1,1,1,0,0,0,0,1,1,0,0,0,0,0,0,0,1,1,0,0,0,0,1,1,0, 0,1,1,1,0,0,0,0,1,1,1,0,0,0,0,1,1,1,0,0,0,1,1,0,0,0,0,0,1,1,0,0,1,1,0,0,0,0,1,1,1,0,0,0,0,0,1,1,0,0,0,0,0,0,0,1,1,0,0,0,0,1,1,0, 0,1,1,1,1,0,0,1,1,1,1,1,0,0,0,1,1,1,0,0,0,1,1,0,0,0,0,0,1,1,0,0,1,1,0,0,0,1,1,1,0,0,0,0,0,0,1,1,0,0,0,0,0,0,0,1,1,0,0,0,0,1,1,0, 0,1,1,1,1,0,0,1,1,0,1,1,0,0,1,1,1,0,0,0,0,1,1,0,0,0,0,0,1,1,0,0,1,1,1,1,1,1,0,0,0,0,0,0,0,0,1,1,0,0,0,0,0,0,0,1,1,0,0,0,0,1,1,0, 0,0,1,1,1,1,0,1,1,0,1,1,0,0,1,1,1,0,0,0,0,1,1,0,0,0,0,0,1,1,0,0,1,1,0,1,1,1,1,0,0,0,0,0,0,0,1,1,0,0,0,0,0,0,0,1,1,0,0,0,0,1,1,0, 0,0,1,1,1,1,0,1,1,0,1,1,0,1,1,1,1,0,0,0,0,1,1,0,0,0,0,0,1,1,0,0,1,1,0,0,1,1,1,1,0,0,0,0,0,0,1,1,0,0,0,0,0,0,0,1,1,0,0,0,1,1,1,0, 0,0,1,1,1,1,1,1,0,0,0,1,1,1,1,1,1,0,0,0,0,1,1,0,0,0,0,0,1,1,0,0,1,1,0,0,0,1,1,1,1,0,0,0,0,0,1,1,0,0,0,0,0,0,0,1,1,0,0,1,1,1,0,0, 0,0,0,1,1,1,1,1,0,0,0,1,1,1,1,1,0,0,0,0,0,1,1,1,0,0,0,1,1,1,0,0,1,1,0,0,0,0,1,1,1,1,0,0,0,0,1,1,0,0,0,0,0,0,0,1,1,1,1,1,1,0,0,0, 0,0,0,0,1,1,1,1,0,0,0,1,1,1,1,0,0,0,0,0,0,0,1,1,1,1,1,1,1,0,0,0,1,1,0,0,0,0,0,1,1,1,1,0,0,0,1,1,1,1,1,1,1,0,0,1,1,1,1,1,0,0,0,0, 0,0,0,0,0,1,1,0,0,0,0,0,1,1,0,0,0,0,0,0,0,0,0,1,1,1,1,1,0,0,0,0,1,1,0,0,0,0,0,0,1,1,1,1,0,0,1,1,1,1,1,1,1,0,0,1,1,1,1,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,1,1,0,1,1,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,1,1,1,0,1,1,1,0,0,0,0,0,0,0,0,0,1,0,0,0,1,0,0,0,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,1,1,1,1,1,1,1,1,1,0,0,0,0,0,0,0,1,0,0,0,0,1,0,0,0,0,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,1,1,1,1,1,1,1,1,1,0,0,0,0,0,0,0,1,0,0,0,0,0,0,0,0,0,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,1,1,1,1,1,1,1,0,0,0,0,0,0,0,0,1,0,0,0,0,0,0,0,0,0,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,1,1,1,1,1,0,0,0,0,0,0,0,0,0,0,1,0,0,0,0,0,0,0,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,1,0,0,0,1,1,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,1,1,1,0,0,0,0,0,0,0,0,0,0,0,0,1,0,0,0,0,0,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,1,1,1,0,1,1,1,1,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,0,0,0,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,1,1,1,1,1,1,1,1,1,1,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,0,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,1,1,1,1,1,1,1,1,1,1,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,1,1,1,1,1,1,1,1,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,1,1,1,1,1,1,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,1,1,1,1,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,1,1,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0, 0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0
-    buffer = binary_to_buffer(binary_data)
-    
+    frame = hub75.pack_bytes(FRAME_BIN)
 else:
     raise ValueError("Formato no válido. Usa 'HEX' o 'BIN'.")
 
-# Ciclo principal
-while True:
-    refresh_display(buffer)
+
+def main():
+    # Panel con el conexionado RGB y overclock a 280 MHz. Los tiempos de cada
+    # fila los fija el RefreshTimer: 120 fps y 40 % de brillo, igual a 250 que
+    # a 280 MHz; panel.report() da los fps conseguidos y el jitter
+    panel = hub75.HUB75(hub75.WIRING_RGB, freq=280_000_000, fps=120, brightness=0.4)
+    panel.init()
+
+    # Ciclo principal
+    panel.load(frame, hub75.RED)
+    panel.run()
+
+    # Animación convertida en el PC con: python animconv.py anim.anm f1.bmp f2.bmp ...
+    #panel.play("/anim.anm")
+
+
+if __name__ == "__main__":
+    main()
 
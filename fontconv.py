@@ -0,0 +1,127 @@
+"""
+Conversor (para el PC) de fuentes BDF al formato empaquetado que lee Font.
+
+Uso:
+    python fontconv.py fuente.bdf salida.fnt [--first 32] [--last 255]
+
+Por defecto se incluyen ASCII imprimible y Latin-1 (32 a 255). El archivo tiene
+una cabecera "<2sBBHH" (b"FN", versión 1, alto, primer carácter, número de
+caracteres), un índice de 4 bytes por carácter "<HBx" (desplazamiento del
+bitmap y ancho de avance, 0 si la fuente no tiene ese carácter) y los bitmaps,
+con (ancho + 7) // 8 bytes por fila y el bit más significativo a la izquierda.
+"""
+import struct
+
+FONT_MAGIC = b"FN"
+FONT_VERSION = 1
+
+
+def parse_bdf(path):
+    """
+    Lee una fuente BDF. Devuelve (alto, ascenso, glifos), donde glifos es un
+    diccionario código -> (avance, ancho_bbx, alto_bbx, x_off, y_off, filas).
+    """
+    glyphs = {}
+    ascent = descent = None
+    encoding = None
+    with open(path, encoding="latin-1") as bdf:
+        lines = iter(bdf.read().splitlines())
+    for line in lines:
+        fields = line.split()
+        if not fields:
+            continue
+        key = fields[0]
+        if key == "FONT_ASCENT":
+            ascent = int(fields[1])
+        elif key == "FONT_DESCENT":
+            descent = int(fields[1])
+        elif key == "STARTCHAR":
+            encoding = None
+            advance = 0
+            bbx = (0, 0, 0, 0)
+        elif key == "ENCODING":
+            encoding = int(fields[1])
+        elif key == "DWIDTH":
+            advance = int(fields[1])
+        elif key == "BBX":
+            bbx = tuple(int(v) for v in fields[1:5])
+        elif key == "BITMAP":
+            rows = []
+            for row in lines:
+                if row.strip() == "ENDCHAR":
+                    break
+                # Cada fila en hexadecimal, alineada a la izquierda en bytes completos
+                value = int(row, 16)
+                bits = len(row.strip()) * 4
+                rows.append((value, bits))
+            if encoding is not None and encoding >= 0:
+                glyphs[encoding] = (advance,) + bbx + (rows,)
+    if ascent is None or descent is None:
+        raise ValueError("La fuente BDF no define FONT_ASCENT/FONT_DESCENT.")
+    return ascent + descent, ascent, glyphs
+
+
+def render_glyph(glyph, height, ascent):
+    """Coloca un glifo BDF en una celda de alto fijo. Devuelve (ancho, bytes)."""
+    advance, bbx_w, bbx_h, x_off, y_off, rows = glyph
+    width = max(advance, 1)
+    row_bytes = (width + 7) // 8
+    cell = [0] * height
+    top = ascent - (y_off + bbx_h)
+    for i, (value, bits) in enumerate(rows):
+        y = top + i
+        if not 0 <= y < height:
+            continue
+        for col in range(bbx_w):
+            if (value >> (bits - 1 - col)) & 1:
+                x = x_off + col
+                if 0 <= x < width:
+                    cell[y] |= 1 << (row_bytes * 8 - 1 - x)
+    data = b"".join(value.to_bytes(row_bytes, "big") for value in cell)
+    return width, data
+
+
+def convert(bdf_path, fnt_path, first=32, last=255):
+    """Convierte una fuente BDF. Devuelve el número de glifos incluidos."""
+    height, ascent, glyphs = parse_bdf(bdf_path)
+    if height > 255:
+        raise ValueError("La fuente es demasiado alta.")
+
+    index = bytearray()
+    data = bytearray()
+    included = 0
+    for code in range(first, last + 1):
+        if code in glyphs:
+            width, bitmap = render_glyph(glyphs[code], height, ascent)
+            if width > 255 or len(data) > 0xFFFF:
+                raise ValueError("La fuente no cabe en el formato empaquetado.")
+            index += struct.pack("<HBx", len(data), width)
+            data += bitmap
+            included += 1
+        else:
+            index += struct.pack("<HBx", 0, 0)
+
+    header = struct.pack("<2sBBHH", FONT_MAGIC, FONT_VERSION, height, first, last - first + 1)
+    with open(fnt_path, "wb") as fnt:
+        fnt.write(header)
+        fnt.write(index)
+        fnt.write(data)
+    return included
+
+
+def main():
+    import argparse  # Solo en el PC: el resto del módulo también funciona en MicroPython
+
+    parser = argparse.ArgumentParser(description="Convierte una fuente BDF al formato empaquetado de Font.")
+    parser.add_argument("bdf", help="Fuente BDF de entrada")
+    parser.add_argument("fnt", help="Archivo de fuente empaquetada de salida")
+    parser.add_argument("--first", type=int, default=32, help="Primer carácter (por defecto 32)")
+    parser.add_argument("--last", type=int, default=255, help="Último carácter (por defecto 255)")
+    args = parser.parse_args()
+
+    included = convert(args.bdf, args.fnt, args.first, args.last)
+    print(f"{args.fnt}: {included} glifos")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,8 @@
 import time
+from array import array
 from machine import Pin, freq
 import _thread  # Módulo para manejar los dos núcleos
-
-# Overclocking opcional para mejorar el rendimiento
-freq(250_000_000)
-
-# Configuración de pines de color
-R1 = Pin(4, Pin.OUT)
-G1 = Pin(2, Pin.OUT)
-B1 = Pin(3, Pin.OUT)
-R2 = Pin(9, Pin.OUT)
-G2 = Pin(5, Pin.OUT)
-B2 = Pin(8, Pin.OUT)
-
-# Configuración de pines de control
-CLK = Pin(11, Pin.OUT)
-LAT = Pin(12, Pin.OUT)
-OE = Pin(13, Pin.OUT)
-
-# Pines de selección de filas
-A = Pin(10, Pin.OUT)
-B = Pin(16, Pin.OUT)
-C = Pin(18, Pin.OUT)
-D = Pin(20, Pin.OUT)
-E = Pin(22, Pin.OUT)
+from displays import hub75
 
 # Buffer para el patrón (bitmap)
 bitmap = [
@@ -45,52 +24,74 @@ bitmap = [
     0b1111111111111111000000000000000000000000000000001111111111111111,  # Ejemplo: borde inferior
 ] * 2  # Se repite para parte superior e inferior
 
-# Función para seleccionar una fila específica
-def select_row(row):
-    binary_row = row & 0b11111
-    A.value(binary_row & 0b1)
-    B.value((binary_row >> 1) & 0b1)
-    C.value((binary_row >> 2) & 0b1)
-    D.value((binary_row >> 3) & 0b1)
-    E.value((binary_row >> 4) & 0b1)
+MASK_64 = (1 << 64) - 1
+SCAN_ROWS = 16  # Multiplexado 1/16: el bitmap tiene 32 filas
 
-# Función para enviar datos RGB
-def send_color_data(r1, g1, b1, r2, g2, b2):
-    R1.value(r1)
-    G1.value(g1)
-    B1.value(b1)
-    R2.value(r2)
-    G2.value(g2)
-    B2.value(b2)
-    CLK.value(1)
-    CLK.value(0)
+# Doble buffer: el núcleo de dibujo prepara en `back` el siguiente frame
+# completo (sus parejas de filas ya preparadas) y el de refresco solo lo
+# intercambia por el que muestra entre dos frames, así que nunca hay tearing
+# ni un frame más largo que otro.
+back = None
+swap_lock = _thread.allocate_lock()
 
-# Dibujar una fila completa (superior e inferior)
-def draw_pattern_row(row_pattern_upper, row_pattern_lower):
-    for col in range(64):  # 64 columnas
-        bit_upper = (row_pattern_upper >> (63 - col)) & 1
-        bit_lower = (row_pattern_lower >> (63 - col)) & 1
-        send_color_data(bit_upper, 0, 0, bit_lower, 0, 0)
+# Un frame del núcleo de refresco: pasar al buffer publicado, si lo hay, y refrescar
+def refresh_frame():
+    global back
+    if back is not None:
+        with swap_lock:
+            engine.swap(back)
+            back = None
+    engine.refresh()
 
-# Refrescar la matriz usando el bitmap
+# Refrescar la matriz; las parejas de filas apagadas no se desplazan
 def refresh_display():
     while True:
-        for row in range(16):  # Multiplexado 1/16
-            OE.value(1)  # Apagar salida mientras configuramos
-            select_row(row)  # Seleccionar fila activa
-            draw_pattern_row(bitmap[row], bitmap[row + 16])  # Enviar datos
-            LAT.value(1)  # Actualizar latch
-            LAT.value(0)
-            OE.value(0)  # Encender salida
-            time.sleep_us(800)  # Incrementar tiempo activo para reducir parpadeo
+        refresh_frame()
+
+# Preparar `frame` en el buffer trasero y esperar a que el refresco lo muestre
+def publish(frame):
+    global back
+    buffer = engine.prepare_frame(frame, hub75.RED)
+    with swap_lock:
+        back = buffer
+    while back is not None:
+        time.sleep_us(50)  # Tras el cambio, `frame` se puede volver a dibujar
 
-# Iniciar el refresco en un hilo
-_thread.start_new_thread(refresh_display, ())
+# Dibujar en `frame` el bitmap desplazado `step` columnas (rotación circular)
+def render(frame, step):
+    for row in range(32):
+        word = bitmap[row]
+        if step:
+            word = ((word >> step) | (word << (64 - step))) & MASK_64
+        frame[row] = word
 
-# Función principal
+# Función principal: el primer núcleo dibuja el siguiente frame
 def main():
+    frame = array("Q", bitmap)
+    step = 0
     while True:
-        time.sleep(1)  # Mantener el patrón estático
+        render(frame, step)
+        publish(frame)
+        step = (step + 1) % 64
+        time.sleep_ms(50)  # Velocidad de la animación
+
+# El hardware solo se configura al ejecutar el script, no al importarlo
+if __name__ == "__main__":
+    # Overclocking opcional para mejorar el rendimiento
+    freq(250_000_000)
+
+    pins = {name: Pin(gpio, Pin.OUT) for name, gpio in hub75.WIRING_GBR.items()}
+
+    # Selección de fila con tabla precalculada para multiplexado 1/16
+    row_address = hub75.RowAddress([pins[name] for name in hub75.ADDRESS_PINS], scan_rows=SCAN_ROWS,
+                                   gpios=[hub75.WIRING_GBR[name] for name in hub75.ADDRESS_PINS])
+    # 80 fps con la salida encendida el 80 % del periodo (antes, 800 µs fijos por fila)
+    engine = hub75.ScanEngine(backend=hub75.PinBackend(pins, row_address), skip_rows=True,
+                              timer=hub75.RefreshTimer(fps=80, brightness=0.8))
+    engine.load(array("Q", bitmap), hub75.RED)
+
+    # Iniciar el refresco en un hilo (segundo núcleo)
+    _thread.start_new_thread(refresh_display, ())
 
-# Ejecutar función principal
-main()
+    # Ejecutar función principal
+    main()
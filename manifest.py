@@ -0,0 +1,17 @@
+# Manifiesto para congelar los drivers en el firmware de MicroPython: el
+# bytecode y las constantes de bytes (fuente 8x8, tablas de color, frames) se
+# quedan en la flash, así que ni se compilan al arrancar ni ocupan heap.
+#
+# Desde el directorio del port de MicroPython:
+#   make BOARD=ESP32_GENERIC_S3 FROZEN_MANIFEST=/ruta/al/repo/manifest.py
+#   make BOARD=RPI_PICO FROZEN_MANIFEST=/ruta/al/repo/manifest.py
+
+include("$(PORT_DIR)/boards/manifest.py")
+
+package("displays")
+module("bmp2raw.py")
+
+# Los datos de las demos también se pueden congelar; se ejecutan entonces con
+# import enfin; enfin.main()
+#module("enfin.py")
+#module("matrix64x64micropython.py")
@@ -0,0 +1,144 @@
+import os
+import struct
+import sys
+import types
+
+import pytest
+
+# Los drivers y las herramientas se importan desde la raíz del repositorio
+TESTS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(TESTS)
+sys.path.insert(0, ROOT)
+
+import emulator  # noqa: E402
+
+
+@pytest.fixture
+def emu():
+    """machine/utime emulados con reloj virtual; se deshace al terminar la prueba."""
+    bus = emulator.install()
+    yield bus
+    bus.reset()
+    emulator.uninstall()
+
+
+@pytest.fixture
+def driver(emu):
+    """Devuelve load(), que crea un ST7789 iniciado sobre el emulador."""
+    from displays.st7789 import ST7789
+
+    def load():
+        lcd = ST7789()
+        lcd.init()
+        return lcd
+
+    return load
+
+
+@pytest.fixture
+def baseline(emu):
+    """Devuelve load(), que carga el script original del ST7789 (baseline_geek.py) en el emulador."""
+    path = os.path.join(TESTS, "baseline_geek.py")
+
+    def load():
+        # Un módulo nuevo cada vez: el script guarda su estado en variables globales
+        with open(path, encoding="utf-8") as source:
+            code = source.read()
+        module = types.ModuleType("baseline_geek")
+        module.__file__ = path
+        exec(compile(code, path, "exec"), module.__dict__)
+        module.init_display()
+        return module
+
+    return load
+
+
+def _rgb565(r, g, b):
+    return (((r * 31 + 127) // 255) << 11) | (((g * 63 + 127) // 255) << 5) | ((b * 31 + 127) // 255)
+
+
+@pytest.fixture
+def bmp_file(tmp_path):
+    """
+    Devuelve make(filas, bits=24, top_down=False), que escribe un BMP sin
+    comprimir de 16 (RGB565), 24 o 32 bits con las filas dadas (tuplas RGB) y
+    devuelve su ruta.
+    """
+    def make(rows, bits=24, top_down=False, name="test.bmp"):
+        width, height = len(rows[0]), len(rows)
+        bytes_per_pixel = bits // 8
+        row_size = (width * bytes_per_pixel + 3) & ~3
+        data = bytearray()
+        for row in (rows if top_down else rows[::-1]):  # Por defecto, de abajo arriba
+            line = bytearray()
+            for r, g, b in row:
+                if bits == 16:
+                    line += struct.pack("<H", _rgb565(r, g, b))
+                else:
+                    line += bytes((b, g, r)) + bytes(bytes_per_pixel - 3)
+            data += line + bytes(row_size - len(line))
+        masks = struct.pack("<III", 0xF800, 0x07E0, 0x001F) if bits == 16 else b""
+        offset = 54 + len(masks)
+        path = str(tmp_path / name)
+        with open(path, "wb") as bmp:
+            bmp.write(b"BM" + struct.pack("<IHHI", offset + len(data), 0, 0, offset))
+            bmp.write(struct.pack("<IiiHHIIiiII", 40, width, -height if top_down else height, 1, bits,
+                                  3 if bits == 16 else 0, len(data), 2835, 2835, 0, 0))
+            bmp.write(masks + data)
+        return path
+
+    return make
+
+
+# Fuente BDF de 8 píxeles de alto (6 de ascenso): "A" con la caja de 5x6
+# desplazada a la derecha, "." de 1x1 sobre la línea base y "g", que baja por
+# debajo de ella
+TEST_BDF = """STARTFONT 2.1
+FONT test
+SIZE 8 75 75
+FONTBOUNDINGBOX 6 8 0 -2
+STARTPROPERTIES 2
+FONT_ASCENT 6
+FONT_DESCENT 2
+ENDPROPERTIES
+CHARS 3
+STARTCHAR A
+ENCODING 65
+DWIDTH 7 0
+BBX 5 6 1 0
+BITMAP
+20
+50
+88
+F8
+88
+88
+ENDCHAR
+STARTCHAR period
+ENCODING 46
+DWIDTH 2 0
+BBX 1 1 0 0
+BITMAP
+80
+ENDCHAR
+STARTCHAR g
+ENCODING 103
+DWIDTH 5 0
+BBX 4 5 0 -2
+BITMAP
+70
+90
+70
+10
+E0
+ENDCHAR
+ENDFONT
+"""
+
+
+@pytest.fixture
+def bdf_font(tmp_path):
+    """Ruta de la fuente BDF de prueba (TEST_BDF)."""
+    path = tmp_path / "test.bdf"
+    path.write_text(TEST_BDF, encoding="latin-1")
+    return str(path)
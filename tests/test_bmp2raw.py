@@ -0,0 +1,63 @@
+import struct
+
+import pytest
+
+import bmp2raw
+
+# Colores con conversión exacta a RGB565
+PALETTE = {
+    (255, 0, 0): 0xF800, (0, 255, 0): 0x07E0, (0, 0, 255): 0x001F,
+    (255, 255, 255): 0xFFFF, (0, 0, 0): 0x0000, (255, 255, 0): 0xFFE0,
+}
+COLORS = list(PALETTE)
+
+
+def _expected(rows):
+    return [PALETTE[pixel] for row in rows for pixel in row]
+
+
+@pytest.mark.parametrize("bits", (16, 24, 32))
+@pytest.mark.parametrize("top_down", (False, True))
+def test_read_bmp_formats(bmp_file, bits, top_down):
+    rows = [[COLORS[(x // 3 + y) % len(COLORS)] for x in range(13)] for y in range(7)]  # Filas con relleno
+    path = bmp_file(rows, bits, top_down)
+    assert bmp2raw.read_bmp(path) == (13, 7, _expected(rows))
+    assert bmp2raw.read_bmp(path, mirror=True)[2] == _expected([row[::-1] for row in rows])
+
+
+def test_read_bmp_rounds_to_rgb565(bmp_file):
+    path = bmp_file([[(128, 128, 128), (8, 4, 8)]])
+    assert bmp2raw.read_bmp(path)[2] == [0x8410, 0x0821]
+
+
+def _decode_rle(body):
+    pixels = []
+    i = 0
+    while i < len(body):
+        n = body[i]
+        if n < 128:
+            pixels.extend(struct.unpack_from(">%dH" % (n + 1), body, i + 1))
+            i += 1 + 2 * (n + 1)
+        else:
+            pixels.extend(struct.unpack_from(">H", body, i + 1) * (n - 126))
+            i += 3
+    return pixels
+
+
+@pytest.mark.parametrize("rle", (False, True))
+def test_convert_round_trip(bmp_file, tmp_path, rle):
+    # Franjas lisas (paquetes de repetición) y una zona sin repeticiones
+    # (literales), las dos más largas que un paquete
+    rows = [[(255, 0, 0)] * 150 + [COLORS[x % 6] for x in range(140)]] * 3
+    raw = str(tmp_path / "test.raw")
+    size = bmp2raw.convert(bmp_file(rows), raw, rle=rle)
+    with open(raw, "rb") as raw_file:
+        data = raw_file.read()
+    assert len(data) == size
+    assert struct.unpack_from("<2sHHBB", data) == (bmp2raw.RAW_MAGIC, 290, 3, 0, 1 if rle else 0)
+    body = data[8:]
+    if rle:
+        assert len(body) < 2 * 290 * 3
+        assert _decode_rle(body) == _expected(rows)
+    else:
+        assert list(struct.unpack(">%dH" % (290 * 3), body)) == _expected(rows)
@@ -0,0 +1,67 @@
+import os
+import sys
+
+import pytest
+
+import build
+
+ROOT = os.path.dirname(os.path.abspath(build.__file__))
+
+# mpy-cross falso: copia el fuente a la salida y anota los argumentos
+FAKE_MPY_CROSS = """#!%s
+import shutil
+import sys
+
+args = sys.argv[1:]
+with open(%r, "a") as log:
+    log.write(" ".join(args) + "\\n")
+shutil.copy(args[-1], args[args.index("-o") + 1])
+"""
+
+
+def _frozen():
+    """Paquetes y módulos que congela manifest.py."""
+    frozen = []
+    commands = {
+        "include": lambda path: None,
+        "package": lambda name: frozen.append(name),
+        "module": lambda name: frozen.append(name),
+    }
+    with open(os.path.join(ROOT, "manifest.py"), encoding="utf-8") as manifest:
+        exec(manifest.read(), commands)
+    return frozen
+
+
+def test_every_library_module_is_built_and_frozen():
+    package = sorted("displays/" + name for name in os.listdir(os.path.join(ROOT, "displays"))
+                     if name.endswith(".py"))
+    assert sorted(module for module in build.MODULES if module.startswith("displays/")) == package
+    assert all(os.path.exists(os.path.join(ROOT, module)) for module in build.MODULES)
+    frozen = _frozen()
+    assert "displays" in frozen
+    assert all(name in build.MODULES for name in frozen if name.endswith(".py"))
+
+
+@pytest.mark.parametrize("target", sorted(build.TARGETS))
+def test_build_runs_mpy_cross_for_each_module(tmp_path, target):
+    log = tmp_path / "mpy-cross.log"
+    mpy_cross = tmp_path / "mpy-cross"
+    mpy_cross.write_text(FAKE_MPY_CROSS % (sys.executable, str(log)))
+    mpy_cross.chmod(0o755)
+    out = tmp_path / "build"
+
+    sizes = build.build(target, str(out), str(mpy_cross), opt=2)
+    assert [module for module, _, _ in sizes] == list(build.MODULES)
+    for module, py_size, mpy_size in sizes:
+        assert (out / target / (module[:-3] + ".mpy")).stat().st_size == mpy_size == py_size
+    calls = log.read_text().splitlines()
+    assert len(calls) == len(build.MODULES)
+    assert all(("-march=" + build.TARGETS[target]) in call and "-O2" in call for call in calls)
+
+
+def test_build_rejects_unknown_boards_and_missing_mpy_cross(monkeypatch):
+    with pytest.raises(ValueError):
+        build.build("esp8266")
+    monkeypatch.setenv("PATH", "")
+    with pytest.raises(SystemExit):
+        build.find_mpy_cross()
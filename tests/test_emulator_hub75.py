@@ -0,0 +1,33 @@
+import emulator
+from displays import hub75
+
+
+def _single_pair_frame():
+    frame = [0] * hub75.ROWS
+    frame[5] = 1 << 63
+    return frame
+
+
+def test_frames_counted_with_a_single_lit_pair(emu):
+    model = emulator.HUB75Model("rgb")
+    panel = hub75.HUB75(hub75.WIRING_RGB, skip_rows=True)
+    panel.init()
+    panel.load(_single_pair_frame())
+    for _ in range(5):
+        panel.refresh()
+    assert panel.engine.reused == 1  # La fila no se vuelve a latchear
+    assert model.frames == 4
+    assert model.lit()[5][0] == (True, False, False)
+
+
+def test_bcm_planes_of_one_row_are_one_frame(emu):
+    model = emulator.HUB75Model("rgb")
+    panel = hub75.HUB75(hub75.WIRING_RGB, on_time_us=10, skip_rows=True)
+    panel.init()
+    pixels = bytearray(hub75.ROWS * hub75.COLS * 3)
+    pixels[(5 * hub75.COLS + 2) * 3] = 0xF0  # Rojo con los cuatro planos encendidos
+    panel.load_rgb(pixels, depth=4)
+    for _ in range(3):
+        panel.refresh()
+    assert model.frames == 2
+    assert model.image()[5][2] == (10 + 20 + 40 + 80, 0, 0)
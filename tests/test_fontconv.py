@@ -0,0 +1,37 @@
+import struct
+
+import fontconv
+
+
+def _read_fnt(path):
+    """Devuelve (alto, primero, número, {código: (ancho, filas)}) de un archivo .fnt."""
+    with open(path, "rb") as fnt:
+        data = fnt.read()
+    magic, version, height, first, count = struct.unpack_from("<2sBBHH", data)
+    assert (magic, version) == (fontconv.FONT_MAGIC, fontconv.FONT_VERSION)
+    bitmaps = 8 + 4 * count
+    glyphs = {}
+    for i in range(count):
+        offset, width = struct.unpack_from("<HBx", data, 8 + 4 * i)
+        if width:
+            row_bytes = (width + 7) // 8
+            start = bitmaps + offset
+            glyphs[first + i] = (width, [int.from_bytes(data[start + row_bytes * y:start + row_bytes * (y + 1)], "big")
+                                         for y in range(height)])
+    return height, first, count, glyphs
+
+
+def _rows(*lines):
+    return [int(line.replace(".", "0").replace("#", "1").ljust(8, "0"), 2) for line in lines]
+
+
+def test_convert_round_trip(bdf_font, tmp_path):
+    fnt = str(tmp_path / "test.fnt")
+    assert fontconv.convert(bdf_font, fnt, first=32, last=126) == 3
+
+    height, first, count, glyphs = _read_fnt(fnt)
+    assert (height, first, count) == (8, 32, 95)
+    assert sorted(glyphs) == [46, 65, 103]  # El resto del índice queda a cero
+    assert glyphs[65] == (7, _rows("...#...", "..#.#..", ".#...#.", ".#####.", ".#...#.", ".#...#.", "", ""))
+    assert glyphs[46] == (2, _rows("", "", "", "", "", "#", "", ""))
+    assert glyphs[103] == (5, _rows("", "", "", ".###", "#..#", ".###", "...#", "###."))
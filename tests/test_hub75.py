@@ -0,0 +1,339 @@
+import random
+import sys
+
+import pytest
+
+import emulator
+from displays import hub75
+
+
+def _random_frame(seed, density=0.3):
+    rng = random.Random(seed)
+    return [sum(1 << (63 - col) for col in range(64) if rng.random() < density) for _ in range(64)]
+
+
+def _bits(frame):
+    return [[(frame[row] >> (63 - col)) & 1 for col in range(64)] for row in range(64)]
+
+
+def _gradient():
+    pixels = bytearray(64 * 64 * 3)
+    for y in range(64):
+        for x in range(64):
+            i = (y * 64 + x) * 3
+            pixels[i] = x * 4
+            pixels[i + 1] = y * 4
+            pixels[i + 2] = (x ^ y) * 4
+    return pixels
+
+
+def _pins(wiring="rgb"):
+    """Pines emulados de un conexionado de emulator.WIRINGS."""
+    from machine import Pin
+    return {name: Pin(gpio, Pin.OUT) for name, gpio in emulator.WIRINGS[wiring].items()}
+
+
+def test_pack_formats_agree():
+    frame = _random_frame(1)
+    bits = [bit for row in _bits(frame) for bit in row]
+    assert list(hub75.pack_binary(bits)) == frame
+    assert list(hub75.pack_hex(["0x%016x" % word for word in frame])) == frame
+    assert list(hub75.pack_bytes(hub75.frame_bytes(frame))) == frame
+    assert list(hub75.pack_hex([frame[0]])) == [frame[0]] + [0] * 63
+
+
+def test_row_pair_states_bit_order():
+    upper = 1 << 63 | 1  # Columnas 0 y 63
+    lower = 1 << 62  # Columna 1
+    states = hub75.row_pair_states(upper, lower, hub75.RED | hub75.BLUE)
+    assert len(states) == 64
+    assert states[0] == 0b000101  # R1 y B1
+    assert states[1] == 0b101000  # R2 y B2
+    assert states[63] == 0b000101
+    assert not any(states[2:63])
+
+
+@pytest.mark.parametrize("skip_rows", (False, True))
+def test_pins_show_the_loaded_frame(emu, skip_rows):
+    model = emulator.HUB75Model("rgb")
+    panel = hub75.HUB75(hub75.WIRING_RGB, skip_rows=skip_rows)
+    panel.init()
+    frame = _random_frame(2)
+    frame[10:20] = frame[42:52] = [0] * 10  # Parejas apagadas que se saltan
+    panel.load(frame, hub75.GREEN)
+    panel.run(3)
+    assert model.frames == 2
+    assert [[led == (False, bool(bit), False) for led, bit in zip(leds, bits)]
+            for leds, bits in zip(model.lit(), _bits(frame))] == [[True] * 64] * 64
+
+
+@pytest.mark.parametrize("skip_rows", (False, True))
+def test_bcm_on_time_is_the_channel_level(emu, skip_rows):
+    model = emulator.HUB75Model("rgb")
+    panel = hub75.HUB75(hub75.WIRING_RGB, on_time_us=10, skip_rows=skip_rows)
+    panel.init()
+    pixels = _gradient()
+    pixels[:8 * 64 * 3] = bytes(8 * 64 * 3)  # Filas negras: planos apagados
+    panel.load_rgb(pixels, depth=4)
+    panel.run(3)
+    image = model.image()
+    for y in range(64):
+        for x in range(64):
+            i = (y * 64 + x) * 3
+            assert image[y][x] == tuple((pixels[i + c] >> 4) * 10 for c in range(3)), (x, y)
+
+
+def test_sim_backend_image_matches_bitplanes():
+    sim = hub75.SimBackend()
+    engine = hub75.ScanEngine(backend=sim, on_time_us=1, skip_rows=False)
+    pixels = _gradient()
+    engine.load_rgb(pixels, depth=3)
+    engine.refresh()
+    image = sim.image()
+    for y in range(64):
+        for x in range(64):
+            i = (y * 64 + x) * 3
+            assert image[y][x] == tuple(pixels[i + c] >> 5 for c in range(3)), (x, y)
+
+
+def test_sim_backend_records_one_handoff_per_row_and_plane():
+    sim = hub75.SimBackend()
+    engine = hub75.ScanEngine(backend=sim, on_time_us=5, skip_rows=False)
+    engine.load_rgb(_gradient(), depth=2)
+    sim.reset()
+    engine.refresh()
+    assert sim.handoffs == 32 * 2
+    assert sim.on_time_us == 32 * (5 + 10)
+    planes = engine.planes
+    assert sim.events[:10] == [
+        ("oe", 1), ("row", 0), ("shift", planes[0][0]), ("lat",), ("oe", 0, 5),
+        ("oe", 1), ("shift", planes[1][0]), ("lat",), ("oe", 0, 10),  # El segundo plano no cambia de fila
+        ("oe", 1),
+    ]
+
+
+def test_prepare_frame_builds_a_back_buffer_that_swap_shows():
+    sim = hub75.SimBackend()
+    engine = hub75.ScanEngine(backend=sim, on_time_us=5)
+    first = [0] * 64
+    first[3] = 1 << 63
+    engine.load(first)
+    front = engine.planes
+    second = [0] * 64
+    second[40] = 1  # Columna 63 de la fila 40 (pareja 8, abajo)
+    buffer = engine.prepare_frame(second)
+    assert engine.planes is front  # Preparar no cambia lo que se ve
+    sim.reset()
+    engine.refresh()
+    assert sim.image()[3][0] == (5, 0, 0)
+
+    prepared = sim.prepare
+    sim.prepare = None  # swap() y refresh() no preparan nada
+    engine.swap(buffer)
+    assert engine.planes is buffer[0]
+    sim.reset()
+    engine.refresh()
+    sim.prepare = prepared
+    image = sim.image()
+    assert image[40][63] == (5, 0, 0)
+    assert sum(any(led) for row in image for led in row) == 1
+    assert engine.skipped == 31  # Las filas apagadas del buffer nuevo se saltan
+
+
+@pytest.mark.parametrize("wiring", ("WIRING_RGB", "WIRING_GBR"))
+def test_pio_backend_needs_consecutive_colour_gpios(emu, wiring):
+    with pytest.raises(ValueError):
+        hub75.HUB75(getattr(hub75, wiring), backend="pio").init()
+    # WIRING_PIO pasa la comprobación y llega a importar rp2, que el emulador no tiene
+    with pytest.raises(ImportError):
+        hub75.HUB75(hub75.WIRING_PIO, backend="pio").init()
+
+
+def test_skip_rows_shifts_only_rows_that_change():
+    sim = hub75.SimBackend()
+    engine = hub75.ScanEngine(backend=sim, on_time_us=5)
+    frame = [0] * 64
+    frame[3] = frame[4] = frame[40] = 1 << 63  # Parejas 3, 4 y 8; 3 y 4 iguales
+    engine.load(frame)
+    engine.refresh()
+    assert (engine.shifted, engine.reused, engine.skipped) == (2, 1, 29)
+    assert sim.handoffs == 2
+    assert sim.on_time_us == 3 * 5  # Las parejas apagadas no se muestran
+    sim.reset()
+    engine.refresh()
+    # La pareja 8 sigue en los registros, pero al volver a la 3 cambia el contenido
+    assert (engine.shifted, engine.reused, engine.skipped) == (2, 1, 29)
+
+    engine.update_rows([(4, hub75.row_pair_states(0, 1, hub75.RED)), (8, bytes(64))])
+    sim.reset()
+    engine.refresh()
+    assert (engine.shifted, engine.reused, engine.skipped) == (2, 0, 30)
+    image = sim.image()
+    lit = [(x, y) for y, row in enumerate(image) for x, led in enumerate(row) if any(led)]
+    assert lit == [(0, 3), (63, 36)]
+
+
+def _timed_panel(emu, monkeypatch, pin_write_us, brightness):
+    """Panel a 100 fps sobre el emulador, con un coste por escritura de pin."""
+    monkeypatch.setattr(emu, "pin_write_us", pin_write_us)
+    model = emulator.HUB75Model("rgb")
+    panel = hub75.HUB75(hub75.WIRING_RGB, skip_rows=False, fps=100, brightness=brightness)
+    panel.init()
+    panel.load([(1 << 64) - 1] * 64)
+    panel.run(20)  # Hasta que la media del tiempo de desplazamiento se estabiliza
+    panel.engine.timer.reset_stats()
+    panel.run(20)
+    return model, panel
+
+
+@pytest.mark.parametrize("brightness", (0.2, 0.6))
+def test_refresh_timer_holds_fps_and_brightness(emu, monkeypatch, brightness):
+    model, panel = _timed_panel(emu, monkeypatch, 0.05, brightness)
+    report = panel.report()
+    assert not report["limited"]
+    assert report["fps"] == pytest.approx(100, rel=0.01)
+    assert report["jitter_us"] < 50
+    # Cada fila está encendida on_unit_us por frame de 10 ms
+    on_us = model.image()[0][0][0]
+    assert on_us == pytest.approx(report["on_unit_us"], abs=0.1)  # Más la escritura de OE
+    assert on_us * 32 / 10_000 == pytest.approx(brightness, abs=0.005)
+
+
+def test_refresh_timer_stretches_the_period_when_the_shift_is_too_slow(emu, monkeypatch):
+    model, panel = _timed_panel(emu, monkeypatch, 0.5, 0.6)
+    report = panel.report()
+    assert report["limited"]
+    assert report["fps"] < 100
+    # El periodo se alarga, pero el ciclo de OE sigue siendo el pedido
+    assert model.image()[0][0][0] * 32 * report["fps"] / 1_000_000 == pytest.approx(0.6, abs=0.02)
+
+
+# (mosaico, píxel del lienzo, columna y fila donde se enciende en la cadena).
+# El primer dato desplazado acaba en el último panel, así que la columna 0 de
+# la cadena es la columna 0 del último panel.
+@pytest.mark.parametrize("layout, canvas, chain", [
+    (dict(panels_x=2), (70, 3), (6, 3)),  # Panel 1, el último de la cadena
+    (dict(panels_x=2), (5, 40), (64 + 5, 40)),  # Panel 0, el conectado a la placa
+    (dict(panels_x=2, panels_y=2, serpentine=True), (100, 70), (64 + 27, 57)),  # Panel 2, girado 180°
+    (dict(panels_x=2, panels_y=2, serpentine=True), (10, 127), (63 - 10, 0)),  # Panel 3, girado 180°
+    (dict(rotation=90), (10, 0), (0, 53)),
+    (dict(rotation=270), (10, 0), (63, 10)),
+])
+def test_panel_layout_mapping(emu, layout, canvas, chain):
+    layout = hub75.PanelLayout(**layout)
+    model = emulator.HUB75Model("rgb", cols=layout.shift_cols)
+    panel = hub75.HUB75(hub75.WIRING_RGB, layout=layout)
+    panel.init()
+    x, y = canvas
+    red = [0] * layout.height
+    red[y] = 1 << (layout.width - 1 - x)
+    panel.load_canvas(red)
+    panel.run(2)
+    lit = [(col, row) for row, leds in enumerate(model.lit()) for col, led in enumerate(leds) if any(led)]
+    assert lit == [chain]
+
+
+def _baseline_pixels(baseline, draw):
+    """Píxeles encendidos al dibujar con el script original del ST7789 (rotación 0)."""
+    emulator.bus.reset()
+    model = emulator.ST7789Model()
+    lcd = baseline()
+    lcd.fill_screen(0x0000)
+    draw(lcd)
+    screen = model.screen()
+    return [[screen[y][x] for x in range(64)] for y in range(64)]
+
+
+@pytest.mark.parametrize("draw", [
+    lambda d: (d.draw_line(0, 0, 63, 20, 0xFFFF), d.draw_line(60, 2, 3, 61, 0xFFFF), d.draw_line(5, 50, 5, 10, 0xFFFF)),
+    lambda d: (d.draw_rectangle(3, 4, 40, 30, 0xFFFF), d.draw_rectangle(50, 60, 45, 35, 0xFFFF, filled=True)),
+    lambda d: d.text(4, 8, "ABBA", 0xFFFF, 0x0000),
+])
+def test_framebuffer_matches_st7789_baseline(baseline, draw):
+    fb = hub75.FrameBuffer(depth=1)
+    draw(fb)
+    lit = [[fb.get_pixel(x, y) != 0 for x in range(64)] for y in range(64)]
+    assert lit == [[pixel != 0 for pixel in row] for row in _baseline_pixels(baseline, draw)]
+
+
+def test_framebuffer_loads_onto_the_panel(emu):
+    model = emulator.HUB75Model("rgb")
+    panel = hub75.HUB75(hub75.WIRING_RGB, on_time_us=10)
+    panel.init()
+    fb = panel.framebuffer(depth=2)
+    fb.fill_rect(0, 0, 64, 8, 0x001F)  # Azul al máximo
+    fb.draw_line(0, 20, 63, 20, 0x8000)  # Rojo a media intensidad (bit alto)
+    panel.load_framebuffer(fb)
+    panel.run(2)
+    image = model.image()
+    assert image[0][0] == (0, 0, 30)
+    assert image[20][5] == (20, 0, 0)
+    assert image[40][5] == (0, 0, 0)
+
+
+@pytest.mark.parametrize("skip_rows", (False, True))
+def test_refresh_timer_on_time_does_not_depend_on_lit_rows(skip_rows):
+    on_us = []
+    for pairs in (1, 8, 32):
+        sim = hub75.SimBackend()
+        panel = hub75.HUB75(backend=sim, skip_rows=skip_rows, fps=100, brightness=0.5)
+        panel.init()
+        frame = [0] * 64
+        frame[:pairs] = [1 << 63] * pairs  # Columna 0 de las primeras `pairs` parejas
+        panel.load(frame)
+        panel.run(5)
+        # El SimBackend no tarda en desplazar: los fps salen de su reloj simulado
+        assert panel.report()["fps"] == pytest.approx(100, rel=0.01)
+        image = sim.image()
+        assert [image[y][0][0] for y in range(pairs)] == [image[0][0][0]] * pairs
+        on_us.append(image[0][0][0] / 5)
+    assert on_us[0] == on_us[1] == on_us[2]
+    assert on_us[0] * 32 / 10_000 == pytest.approx(0.5, abs=0.005)
+
+
+def _address_levels(emu, wiring):
+    return sum(emu.pins.get(wiring[name], 0) << bit for bit, name in enumerate(hub75.ADDRESS_PINS))
+
+
+def test_row_address_writes_only_the_lines_that_change(emu):
+    wiring = emulator.WIRINGS["rgb"]
+    pins = _pins()
+    address = hub75.RowAddress([pins[name] for name in hub75.ADDRESS_PINS], 32)
+    address.select(7)  # Fuera de orden: se escriben las cinco líneas
+    for row in list(range(8, 32)) + list(range(0, 8)):
+        emu.total.reset()
+        address.select(row)
+        assert _address_levels(emu, wiring) == row
+        assert emu.total.pin_writes == bin(row ^ ((row - 1) % 32)).count("1")
+    emu.total.reset()
+    address.select(20)
+    assert emu.total.pin_writes == 5
+
+
+def test_row_address_writes_the_port_on_rp2(emu, monkeypatch):
+    wiring = emulator.WIRINGS["rgb"]
+    pins = _pins()
+    with monkeypatch.context() as patch:
+        patch.setattr(sys, "platform", "rp2")
+        address = hub75.RowAddress([pins[name] for name in hub75.ADDRESS_PINS], 32,
+                                   gpios=[wiring[name] for name in hub75.ADDRESS_PINS])
+    previous = 0
+    for row in (5, 6, 31, 0, 17, 17):
+        emu.total.reset()
+        address.select(row)
+        assert _address_levels(emu, wiring) == row
+        # Los registros SET/CLR solo cambian las líneas necesarias
+        assert emu.total.pin_writes == bin(row ^ previous).count("1")
+        previous = row
+
+
+def test_row_address_for_half_scan_panels(emu):
+    wiring = emulator.WIRINGS["rgb"]
+    pins = _pins()
+    lines = [pins[name] for name in hub75.ADDRESS_PINS[:4]]
+    with pytest.raises(ValueError):
+        hub75.RowAddress(lines, 32)  # Cuatro líneas solo llegan a 16 filas
+    address = hub75.RowAddress(lines, 16)
+    for row in list(range(16)) + [0, 1]:
+        address.select(row)
+        assert _address_levels(emu, wiring) == row
@@ -0,0 +1,78 @@
+import animconv
+from displays import hub75
+
+
+def _frame(*rows):
+    frame = [0] * hub75.ROWS
+    for row, word in rows:
+        frame[row] = word
+    return frame
+
+
+def _expected(frame, color):
+    return [hub75.row_pair_states(frame[pair], frame[pair + hub75.SCAN_ROWS], color)
+            for pair in range(hub75.SCAN_ROWS)]
+
+
+def test_animation_next_marks_rows_lit_in_last_frame_on_wrap(tmp_path):
+    first = _frame((3, 0xF0 << 56))
+    second = _frame((3, 0xF0 << 56), (40, 0xFF))
+    path = tmp_path / "anim.anm"
+    path.write_bytes(animconv.encode([first, second], [10, 10]))
+
+    animation = hub75.Animation(str(path))
+    animation.next()
+    animation.next()
+    _, changed = animation.next()  # Vuelve al primer frame
+    assert list(animation.frame) == first
+    assert changed & (1 << (63 - 40))
+    animation.close()
+
+
+def test_player_loops_without_stale_rows(tmp_path):
+    color = 0b001
+    first = _frame((3, 0xF0 << 56))
+    second = _frame((3, 0xF0 << 56), (40, 0xFF), (50, 1))
+    path = tmp_path / "anim.anm"
+    path.write_bytes(animconv.encode([first, second], [5, 5], color))
+
+    sim = hub75.SimBackend(record=False)
+    engine = hub75.ScanEngine(backend=sim, on_time_us=100)
+    shown = []
+    update_rows = engine.update_rows
+
+    def record(changed):
+        update_rows(changed)
+        shown.append([bytes(states) for states in engine.planes[0]])
+
+    engine.update_rows = record
+    animation = hub75.Animation(str(path))
+    # El tiempo encendido del SimBackend hace de reloj virtual
+    player = hub75.AnimationPlayer(engine, animation, ticks_ms=lambda: sim.on_time_us // 1000)
+    player.play(loops=3)
+    animation.close()
+
+    assert player.frames == 6
+    expected = [_expected(second, color), _expected(first, color)] * 3
+    assert shown == [[bytes(states) for states in frame] for frame in expected[:5]]
+
+
+def test_encode_and_replay_round_trip(tmp_path):
+    frames = [_frame(*[(row, (0x1234567 * (row + 1) * (n + 1)) & ((1 << 64) - 1)) for row in range(0, 64, 3 + n)])
+              for n in range(4)]
+    frames.insert(2, list(frames[1]))  # Frame repetido: solo el registro de 10 bytes
+    durations = [10, 20, 30, 40, 50]
+    data = animconv.encode(frames, durations, 0b110)
+    path = tmp_path / "anim.anm"
+    path.write_bytes(data)
+
+    animation = hub75.Animation(str(path))
+    assert (animation.count, animation.color) == (5, 0b110)
+    for frame, duration in zip(frames, durations):
+        assert animation.next()[0] == duration
+        assert list(animation.frame) == frame
+    animation.close()
+    # Cabecera de 8 bytes, 10 por registro y 8 por fila cambiada
+    changed = sum(1 for before, after in zip([[0] * 64] + frames, frames)
+                  for a, b in zip(before, after) if a != b)
+    assert len(data) == 8 + 10 * len(frames) + 8 * changed
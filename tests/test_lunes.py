@@ -0,0 +1,41 @@
+import importlib
+import types
+from array import array
+
+from displays import hub75
+
+
+def test_refresh_core_only_swaps_the_prepared_back_buffer(emu, monkeypatch):
+    lunes = importlib.import_module("lunes")
+    sim = hub75.SimBackend()
+    engine = hub75.ScanEngine(backend=sim, on_time_us=10)
+    engine.load(array("Q", lunes.bitmap), hub75.RED)
+    monkeypatch.setattr(lunes, "engine", engine, raising=False)  # Lo crea el script al ejecutarse
+
+    prepares = []
+    prepare = sim.prepare
+    sim.prepare = lambda states: prepares.append(states) or prepare(states)
+    swaps = []
+
+    def refresh_core(us):
+        # Mientras el núcleo de dibujo espera, el de refresco muestra un frame
+        before = len(prepares)
+        lunes.refresh_frame()
+        swaps.append(len(prepares) - before)
+
+    monkeypatch.setattr(lunes, "time", types.SimpleNamespace(sleep_us=refresh_core))
+    front = engine.planes
+    frame = array("Q", lunes.bitmap)
+    lunes.render(frame, 5)
+    lunes.publish(frame)
+    # El buffer trasero llega preparado: el refresco solo cambia la referencia
+    assert prepares and swaps == [0]
+    assert engine.planes is not front and lunes.back is None
+
+    sim.reset()
+    engine.refresh()
+    image = sim.image()
+    # Panel 1/16: la pareja p muestra las filas p y p + 16 del frame (p y p + 32 en la imagen)
+    for row in range(32):
+        shown = image[row if row < 16 else row + 16]
+        assert [led[0] != 0 for led in shown] == [bool(frame[row] >> (63 - col) & 1) for col in range(64)]
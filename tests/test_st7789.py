@@ -0,0 +1,383 @@
+import struct
+
+import pytest
+
+import bmp2raw
+import emulator
+import fontconv
+from displays import st7789
+from displays.st7789 import Font
+
+RED, GREEN, BLUE, WHITE = 0xF800, 0x07E0, 0x001F, 0xFFFF
+STAR = ((10, 0), (13, 6), (20, 6), (15, 13), (16, 20), (10, 16), (3, 20), (5, 13), (0, 6), (6, 6))
+RAMWR = 0x2C
+
+
+def _lcd(driver, background=0x0000):
+    model = emulator.ST7789Model()
+    lcd = driver()
+    lcd.fill_screen(background)
+    return lcd, model
+
+
+def _render(load, draw, rotation=0):
+    """Dibuja con el driver (o con el script original) en un bus limpio y devuelve lo que se ve."""
+    emulator.bus.reset()
+    model = emulator.ST7789Model()
+    lcd = load()
+    lcd.set_rotation(rotation)
+    lcd.fill_screen(0x0000)
+    draw(lcd)
+    return model.screen()
+
+
+def _cell(model, x, y):
+    return [row[x:x + 8] for row in model.screen()[y:y + 8]]
+
+
+def _gradient(width, height):
+    """Franjas lisas arriba y un degradado abajo (tuplas RGB)."""
+    rows = []
+    for y in range(height):
+        if y < height // 2:
+            rows.append([(0, 0, 255) if (x // 8) % 2 else (255, 255, 0) for x in range(width)])
+        else:
+            rows.append([(x * 4 % 256, y * 4 % 256, (x + y) * 2 % 256) for x in range(width)])
+    return rows
+
+
+# Las rotaciones 0 y 3 son las que el script original calculaba bien (las
+# otras dos tenían los offsets cambiados)
+@pytest.mark.parametrize("rotation", (0, 3))
+@pytest.mark.parametrize("name, draw", [
+    ("fill_screen", lambda lcd: lcd.fill_screen(BLUE)),
+    ("draw_pixel", lambda lcd: (lcd.draw_pixel(5, 7, RED), lcd.draw_pixel(120, 100, GREEN))),
+    ("draw_line", lambda lcd: (lcd.draw_line(0, 0, 100, 37, GREEN), lcd.draw_line(120, 5, 3, 130, RED),
+                               lcd.draw_line(50, 130, 50, 10, BLUE), lcd.draw_line(5, 60, 90, 60, WHITE))),
+    ("draw_rectangle", lambda lcd: (lcd.draw_rectangle(5, 5, 60, 40, RED),
+                                    lcd.draw_rectangle(70, 90, 10, 50, BLUE, filled=True))),
+    ("draw_circle", lambda lcd: (lcd.draw_circle(60, 60, 30, RED),
+                                 lcd.draw_circle(60, 100, 25, GREEN, filled=True))),
+    ("draw_polygon", lambda lcd: (lcd.draw_polygon(BLUE, False, *STAR),
+                                  lcd.draw_polygon(RED, True, *[(x + 30, y + 50) for x, y in STAR]))),
+    ("text", lambda lcd: lcd.text(10, 20, "ABBA", RED, 0x03FF)),
+])
+def test_primitives_match_baseline(driver, baseline, rotation, name, draw):
+    assert _render(driver, draw, rotation) == _render(baseline, draw, rotation)
+
+
+def test_send_is_one_cs_transaction(driver, emu):
+    lcd, model = _lcd(driver)
+    emu.total.reset()
+    lcd.set_active_window(0, 0, 9, 9)
+    assert (emu.total.cs_toggles, emu.total.spi_writes) == (4, 4)  # CASET y RASET con sus parámetros
+    assert model.columns == (52, 61) and model.rows == (40, 49)
+
+
+def test_framebuffer_flush_matches_direct_drawing(driver):
+    def draw(lcd):
+        lcd.draw_line(0, 0, 100, 37, GREEN)
+        lcd.draw_rectangle(70, 90, 10, 50, BLUE, filled=True)
+        lcd.draw_circle(60, 60, 30, RED)
+        lcd.draw_polygon(RED, True, *STAR)
+        lcd.text(10, 20, "AB", RED, 0x03FF)
+
+    def buffered(lcd):
+        lcd.enable_framebuffer()
+        draw(lcd)
+        lcd.flush()
+
+    assert _render(driver, buffered) == _render(driver, draw)
+
+
+def test_flush_sends_only_the_dirty_rectangles(driver):
+    lcd, model = _lcd(driver, BLUE)
+    lcd.enable_framebuffer()
+    lcd.draw_pixel(5, 5, RED)
+    lcd.draw_rectangle(50, 50, 59, 59, GREEN, filled=True)
+    assert model.screen()[5][5] == BLUE  # Nada llega al display antes de flush()
+    written = model.pixels_written
+    lcd.flush()
+    assert model.pixels_written - written == 1 + 100
+    assert model.screen()[5][5] == RED and model.screen()[55][55] == GREEN
+    lcd.flush()  # Sin cambios no se envía nada
+    assert model.pixels_written - written == 1 + 100
+
+    # Más rectángulos que MAX_DIRTY_RECTS: se envía su envolvente
+    for i in range(st7789.MAX_DIRTY_RECTS + 1):
+        lcd.draw_pixel(10 + 10 * i, 100 + i, WHITE)
+    written = model.pixels_written
+    lcd.flush()
+    assert model.pixels_written - written == (10 * st7789.MAX_DIRTY_RECTS + 1) * (st7789.MAX_DIRTY_RECTS + 1)
+
+
+def test_outlines_use_one_window_per_span(driver):
+    lcd, model = _lcd(driver)
+    for draw, windows in (
+        (lambda: lcd.draw_rectangle(5, 5, 60, 40, RED), 4),
+        (lambda: lcd.draw_line(5, 60, 90, 60, WHITE), 1),
+        (lambda: lcd.draw_line(50, 130, 50, 10, BLUE), 1),
+        (lambda: lcd.draw_line(0, 0, 100, 37, GREEN), 38),  # Un tramo horizontal por fila
+    ):
+        before = model.commands[RAMWR]
+        draw()
+        assert model.commands[RAMWR] - before == windows
+    before = model.commands[RAMWR]
+    lcd.draw_circle(60, 120, 40, RED)
+    assert model.commands[RAMWR] - before < 2 * 40 * 4  # Menos ventanas que píxeles del contorno
+
+
+def test_antialiased_rectangle_is_exact(driver):
+    lcd, model = _lcd(driver)
+    lcd.draw_polygon(RED, True, (10, 20), (40, 20), (40, 50), (10, 50), antialias=True)
+    screen = model.screen()
+    for y in range(10, 60):
+        for x in range(0, 50):
+            inside = 10 <= x < 40 and 20 <= y < 50
+            assert screen[y][x] == (RED if inside else 0), (x, y)
+
+
+def test_antialiased_triangle_blends_only_edge_pixels(driver):
+    lcd, model = _lcd(driver)
+    # Triángulo rectángulo: la hipotenusa va de (10, 10) a (50, 90)
+    lcd.draw_polygon(WHITE, True, (10, 10), (50, 90), (10, 90), antialias=True)
+    screen = model.screen()
+    for y in range(5, 95):
+        for x in range(5, 60):
+            # Borde derecho del triángulo en la fila: x = 10 + (y - 10) / 2
+            left = 10 + (y - 10) / 2
+            right = 10 + (y + 1 - 10) / 2
+            pixel = screen[y][x]
+            if not 10 <= y < 90 or x < 10 or x >= right:
+                assert pixel == 0, (x, y)
+            elif x + 1 <= left:
+                assert pixel == WHITE, (x, y)
+            else:
+                assert pixel not in (0, WHITE), (x, y)
+
+
+def test_antialiased_span_never_starts_left_of_the_polygon(driver):
+    lcd, model = _lcd(driver)
+    # Arista casi vertical que termina en el vértice de más a la izquierda: el
+    # redondeo del paso deja x por debajo de min_x en las últimas sub-líneas
+    lcd.draw_polygon(WHITE, True, (21, 10), (30, 10), (30, 62), (20, 62), antialias=True)
+    screen = model.screen()
+    for y in range(10, 62):
+        assert screen[y][19] == 0
+        assert screen[y][30] == 0
+        assert screen[y][29] == WHITE
+        assert screen[y][20] != 0 or y == 10  # En la primera fila el borde apenas entra
+    assert screen[62][20:31] == [0] * 11
+
+
+def test_text_is_one_window_and_glyphs_are_cached(driver):
+    lcd, model = _lcd(driver)
+    before = model.commands[RAMWR]
+    lcd.text(10, 20, "ABBAAB", RED, BLUE)
+    assert model.commands[RAMWR] - before == 1
+    assert sorted(lcd._glyph_cache) == [("A", RED, BLUE), ("B", RED, BLUE)]
+    assert _cell(model, 10, 20) == _cell(model, 10 + 8 * 3, 20)
+
+
+def test_glyph_cache_evicts_the_least_recently_used(driver):
+    lcd, model = _lcd(driver)
+    size = st7789.GLYPH_CACHE_SIZE
+    for color in range(1, size + 1):
+        lcd.draw_char(0, 0, "A", color, 0)
+    lcd.draw_char(0, 0, "A", 1, 0)  # El primero vuelve a ser el más reciente
+    lcd.draw_char(8, 0, "B", RED, 0)  # Expulsa el menos usado, ("A", 2, 0)
+    assert len(lcd._glyph_cache) == size
+    assert ("A", 1, 0) in lcd._glyph_cache
+    assert ("A", 2, 0) not in lcd._glyph_cache
+    assert ("B", RED, 0) in lcd._glyph_cache
+    lcd.draw_char(0, 0, "A", 2, 0)  # Se vuelve a rasterizar igual
+    assert {pixel for row in _cell(model, 0, 0) for pixel in row} == {0, 2}
+
+
+def test_missing_glyph_is_a_background_cell_in_draw_char_and_text(driver):
+    lcd, model = _lcd(driver, WHITE)
+    lcd.draw_char(0, 0, "?", RED, BLUE)
+    lcd.text(0, 16, "A?", RED, BLUE)
+    blank = [[BLUE] * 8 for _ in range(8)]
+    assert _cell(model, 0, 0) == blank
+    assert _cell(model, 8, 16) == blank
+    assert _cell(model, 0, 16) != blank
+
+
+def _font_pattern():
+    """Píxeles de "A." en la fuente de prueba (ancho 7 + 2, alto 8)."""
+    a = ("...#...", "..#.#..", ".#...#.", ".#####.", ".#...#.", ".#...#.", ".......", ".......")
+    dot = ("..", "..", "..", "..", "..", "#.", "..", "..")
+    return [a_row + dot_row for a_row, dot_row in zip(a, dot)]
+
+
+@pytest.mark.parametrize("preload", (False, True))
+@pytest.mark.parametrize("bg_color", (None, GREEN))
+def test_draw_text_scales_the_packed_font(driver, bdf_font, tmp_path, preload, bg_color):
+    fnt = str(tmp_path / "test.fnt")
+    fontconv.convert(bdf_font, fnt)
+    lcd, model = _lcd(driver, BLUE)
+    font = Font(fnt, preload=preload)
+    assert font.text_width("A.g", 2) == (7 + 2 + 5) * 2
+    before = model.commands[RAMWR]
+    # "Z" no está en la fuente (ni "?"): no se dibuja ni avanza
+    assert lcd.draw_text(3, 5, "AZ.", RED, font, scale=2, bg_color=bg_color) == 3 + 9 * 2
+    font.close()
+
+    pattern = _font_pattern()
+    screen = model.screen()
+    for y in range(0, 25):
+        for x in range(0, 25):
+            gx, gy = (x - 3) // 2, (y - 5) // 2
+            inside = 0 <= gx < 9 and 0 <= gy < 8
+            if inside and pattern[gy][gx] == "#":
+                assert screen[y][x] == RED, (x, y)
+            elif inside and bg_color is not None:
+                assert screen[y][x] == bg_color, (x, y)
+            else:
+                assert screen[y][x] == BLUE, (x, y)
+    # Un rectángulo por tramo, con las filas iguales agrupadas: 8 de "A" y 1 de "."
+    if bg_color is None:
+        assert model.commands[RAMWR] - before == 9
+
+
+def test_span_pool_reuses_colour_lines(driver):
+    lcd, model = _lcd(driver)
+    for _ in range(2):
+        for color in (RED, GREEN, BLUE, WHITE, 0x1234):
+            lcd.draw_circle(60, 60, 30, color, filled=True)
+    # Cinco colores con un pool de cuatro líneas: se reutiliza la menos usada
+    assert lcd.span_buffer_allocs == st7789.SPAN_POOL_SIZE
+    view = lcd._color_span(RED, 10)
+    assert bytes(view) == b"\xf8\x00" * 10
+    assert any(view.obj is entry[1] for entry in lcd._span_pool)
+    assert model.screen()[60][60] == 0x1234
+
+
+def test_span_views_are_not_evicted_by_many_widths(driver):
+    lcd, model = _lcd(driver)
+    circle = (67, 120, 66, RED)  # Un círculo relleno de r=66 tiene 67 anchos de tramo distintos
+    lcd.draw_circle(*circle, filled=True)
+    views = [list(entry[2]) for entry in lcd._span_pool]
+    assert sum(view is not None for line in views for view in line) > 16
+    # Volver a dibujar usa las mismas vistas: no se crea ninguna
+    assert st7789.gc_pressure(lcd.draw_circle, *circle, filled=True) in (None, 0)
+    assert all(a is b for line, entry in zip(views, lcd._span_pool) for a, b in zip(line, entry[2]))
+    assert model.screen()[120][67] == RED
+
+
+@pytest.mark.parametrize("rotation, origin, corner", [
+    (0, (0, 0), (134, 239)),
+    (1, (134, 0), (0, 239)),
+    (2, (134, 239), (0, 0)),
+    (3, (0, 239), (134, 0)),
+])
+def test_geometry_follows_the_rotation(driver, rotation, origin, corner):
+    lcd, model = _lcd(driver)
+    lcd.set_rotation(rotation)
+    assert (lcd.display.width, lcd.display.height) == ((135, 240) if rotation % 2 == 0 else (240, 135))
+    lcd.fill_screen(BLUE)
+    lcd.draw_pixel(0, 0, RED)
+    lcd.draw_pixel(lcd.display.width - 1, lcd.display.height - 1, GREEN)
+    lcd.draw_pixel(lcd.display.width, 0, WHITE)  # Fuera: no se dibuja
+    screen = model.screen()
+    assert screen[origin[1]][origin[0]] == RED
+    assert screen[corner[1]][corner[0]] == GREEN
+    assert sum(pixel != BLUE for row in screen for pixel in row) == 2
+
+
+def _stripes(lcd):
+    """Una franja de color distinto (1, 2, ...) por línea a lo largo del eje de scroll."""
+    if lcd.display.rotation % 2:
+        for x in range(lcd.display.width):
+            lcd.draw_line(x, 0, x, lcd.display.height - 1, x + 1)
+    else:
+        for y in range(lcd.display.height):
+            lcd.draw_line(0, y, lcd.display.width - 1, y, y + 1)
+
+
+@pytest.mark.parametrize("rotation", range(4))
+def test_hardware_scroll_moves_the_scroll_area(driver, rotation):
+    lcd, model = _lcd(driver)
+    lcd.set_rotation(rotation)
+    _stripes(lcd)
+    start, size = 30, 100
+    lcd.set_scroll_area(start, size)
+    still = model.screen()
+    lcd.scroll(7)
+    lcd.scroll(5)
+    screen = model.screen()
+    # En cada posición de la zona se ve la línea que indica scroll_line()
+    for y, row in enumerate(still):
+        for x, stripe in enumerate(row):
+            line = stripe - 1
+            if start <= line < start + size:
+                assert screen[y][x] == lcd.scroll_line(line - start) + 1, (x, y)
+            else:
+                assert screen[y][x] == stripe, (x, y)
+    assert lcd.scroll_line(0) == start + 12
+    lcd.reset_scroll()
+    assert model.screen() == still
+
+
+@pytest.mark.parametrize("rotation", range(4))
+def test_partial_mode_shows_only_the_partial_area(driver, rotation):
+    lcd, model = _lcd(driver)
+    lcd.set_rotation(rotation)
+    _stripes(lcd)
+    full = model.screen()
+    lcd.set_partial_area(20, 50)
+    screen = model.screen()
+    for y, row in enumerate(full):
+        for x, stripe in enumerate(row):
+            shown = 20 <= stripe - 1 < 70
+            assert screen[y][x] == (stripe if shown else None), (x, y)
+    lcd.normal_mode()
+    assert model.screen() == full
+
+
+@pytest.mark.parametrize("bits, top_down", [(16, False), (24, False), (24, True), (32, True)])
+@pytest.mark.parametrize("mirror", (False, True))
+def test_show_bmp_matches_converter(driver, bmp_file, bits, top_down, mirror):
+    path = bmp_file(_gradient(40, 30), bits, top_down)
+    width, height, pixels = bmp2raw.read_bmp(path, mirror=mirror)
+    lcd, model = _lcd(driver)
+    lcd.show_bmp(path, 5, 7, mirror=mirror)
+    screen = model.screen()
+    assert [row[5:5 + width] for row in screen[7:7 + height]] == \
+        [pixels[y * width:(y + 1) * width] for y in range(height)]
+
+
+def test_show_bmp_clips_at_the_edges(driver, bmp_file):
+    path = bmp_file(_gradient(40, 30))
+    width, height, pixels = bmp2raw.read_bmp(path)
+    lcd, model = _lcd(driver)
+    lcd.show_bmp(path, 120, 225)
+    screen = model.screen()
+    assert [row[120:135] for row in screen[225:240]] == \
+        [pixels[y * width:y * width + 15] for y in range(15)]
+
+
+@pytest.mark.parametrize("rle", (False, True))
+def test_blit_raw_matches_converter_and_clips(driver, bmp_file, tmp_path, rle):
+    bmp = bmp_file(_gradient(40, 30))
+    raw = str(tmp_path / "test.raw")
+    bmp2raw.convert(bmp, raw, rle=rle)
+    width, height, pixels = bmp2raw.read_bmp(bmp)
+    lcd, model = _lcd(driver)
+    lcd.blit_raw(raw, 3, 4)
+    # Parcialmente fuera por la izquierda y por abajo
+    lcd.blit_raw(raw, -10, 230)
+    screen = model.screen()
+    assert [row[3:3 + width] for row in screen[4:4 + height]] == \
+        [pixels[y * width:(y + 1) * width] for y in range(height)]
+    assert [row[0:width - 10] for row in screen[230:240]] == \
+        [pixels[y * width + 10:(y + 1) * width] for y in range(10)]
+
+
+def test_blit_raw_rejects_other_files(driver, tmp_path):
+    path = tmp_path / "test.raw"
+    path.write_bytes(struct.pack("<2sHHBB", b"XX", 1, 1, 0, 0) + b"\x00\x00")
+    lcd, _ = _lcd(driver)
+    with pytest.raises(ValueError):
+        lcd.blit_raw(str(path))